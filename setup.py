@@ -43,6 +43,18 @@ setup(
             "flake8>=6.0.0",
             "mypy>=1.5.0",
         ],
+        "async": [
+            "psycopg[binary]>=3.1",
+        ],
+        "analysis": [
+            "sqlglot>=20.0",
+        ],
+        "speedups": [
+            "orjson>=3.9",
+            "msgpack>=1.0",
+            "pyahocorasick>=2.0",
+            "zstandard>=0.21",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -29,6 +29,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Query execution limit; also the readonly connection's statement_timeout so
+# the engine does not send a SET before every query
+QUERY_TIMEOUT_SECONDS = 5
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Text2SQL Analytics API",
@@ -214,7 +218,8 @@ async def startup_event():
                 readonly_user=os.getenv("DB_READONLY_USER", "text2sql_readonly"),
                 readonly_password=os.getenv("DB_READONLY_PASSWORD", "readonly_pass"),
                 admin_user=os.getenv("DB_ADMIN_USER", "postgres"),
-                admin_password=os.getenv("DB_ADMIN_PASSWORD", "postgres")
+                admin_password=os.getenv("DB_ADMIN_PASSWORD", "postgres"),
+                statement_timeout_ms=QUERY_TIMEOUT_SECONDS * 1000
             )
             
             db_layer = DatabaseLayer(config)
@@ -251,7 +256,9 @@ async def startup_event():
         else:
             schema = {}
         
-        text2sql_engine = Text2SQLEngine(api_key=api_key, database_schema=schema)
+        text2sql_engine = Text2SQLEngine(
+            api_key=api_key, database_schema=schema, timeout_seconds=QUERY_TIMEOUT_SECONDS
+        )
         
         query_cache = QueryCache()
         query_history = QueryHistory()
@@ -391,12 +398,15 @@ async def execute_query(request: QueryRequest):
             quality_score=quality_score
         )
         
+        # Row dictionaries are built once, for both the cache and the response
+        results = list(result.results) if result.results is not None else None
+        
         # Cache successful results
         if result.execution_success and request.use_cache:
             query_cache.put(
                 request.question,
                 result.generated_sql,
-                result.results or [],
+                results or [],
                 result.execution_time
             )
         
@@ -412,7 +422,7 @@ async def execute_query(request: QueryRequest):
             question=request.question,
             sql=result.generated_sql,
             success=result.execution_success,
-            results=result.results,
+            results=results,
             row_count=result.row_count,
             execution_time=result.execution_time,
             error=result.error_message,
@@ -484,7 +494,8 @@ async def optimize_query(sql: str):
                 detail="Database not connected. Please set up PostgreSQL for query optimization."
             )
         
-        analysis = query_optimizer.analyze_query(sql)
+        # The endpoint reports measured timings, so the plan is executed
+        analysis = query_optimizer.analyze_query(sql, actual=True)
         
         return OptimizationResponse(
             execution_time_ms=analysis.get('execution_time_ms', 0),
@@ -9,20 +9,497 @@ Implements PostgreSQL schema management with:
 - Read-only database user for query execution
 """
 
+import asyncio
 import psycopg2
 from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2.pool import ThreadedConnectionPool
 import logging
-from typing import Optional, Dict, List, Tuple
+import re
+import threading
+from contextlib import contextmanager
+from typing import Final, Iterator, Optional, Dict, List, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 import json
+import sqlparse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Schema DDL with all requirements
+_SCHEMA_SQL: Final[str] = """
+-- =====================================================
+-- DOMAIN TYPES
+-- =====================================================
+
+-- Email address: the format check lives on the type and is shared by every column using it
+DO $$
+BEGIN
+    CREATE DOMAIN email_addr AS VARCHAR(100)
+        CONSTRAINT email_addr_format CHECK (VALUE IS NULL OR VALUE ~* '^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}$');
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END
+$$;
+
+-- =====================================================
+-- CORE TABLES WITH FULL CONSTRAINTS
+-- =====================================================
+
+-- Categories Table
+CREATE TABLE IF NOT EXISTS categories (
+    category_id SERIAL PRIMARY KEY,
+    category_name VARCHAR(100) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Constraints
+    CONSTRAINT category_name_not_empty CHECK (category_name <> ''),
+    CONSTRAINT category_name_unique UNIQUE (category_name)
+);
+
+-- Suppliers Table
+CREATE TABLE IF NOT EXISTS suppliers (
+    supplier_id SERIAL PRIMARY KEY,
+    company_name VARCHAR(200) NOT NULL,
+    contact_name VARCHAR(100),
+    contact_title VARCHAR(100),
+    address VARCHAR(200),
+    city VARCHAR(100),
+    region VARCHAR(100),
+    postal_code VARCHAR(20),
+    country VARCHAR(100),
+    phone VARCHAR(50),
+    fax VARCHAR(50),
+    email email_addr,
+    website VARCHAR(200),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Constraints
+    CONSTRAINT company_name_not_empty CHECK (company_name <> ''),
+    CONSTRAINT company_name_unique UNIQUE (company_name),
+    CONSTRAINT phone_not_empty CHECK (phone IS NULL OR phone <> '')
+);
+
+-- Products Table
+CREATE TABLE IF NOT EXISTS products (
+    product_id SERIAL PRIMARY KEY,
+    product_name VARCHAR(200) NOT NULL,
+    supplier_id INTEGER,
+    category_id INTEGER,
+    quantity_per_unit VARCHAR(100),
+    unit_price NUMERIC(10, 2) NOT NULL DEFAULT 0.00,
+    units_in_stock INTEGER NOT NULL DEFAULT 0,
+    units_on_order INTEGER NOT NULL DEFAULT 0,
+    reorder_level INTEGER NOT NULL DEFAULT 0,
+    discontinued BOOLEAN NOT NULL DEFAULT FALSE,
+    product_name_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', product_name)) STORED,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Foreign Key Constraints with CASCADE rules
+    CONSTRAINT fk_product_supplier 
+        FOREIGN KEY (supplier_id) 
+        REFERENCES suppliers(supplier_id) 
+        ON DELETE SET NULL,
+    
+    CONSTRAINT fk_product_category 
+        FOREIGN KEY (category_id) 
+        REFERENCES categories(category_id) 
+        ON DELETE SET NULL,
+    
+    -- Data Validation Constraints
+    CONSTRAINT product_name_not_empty CHECK (product_name <> ''),
+    CONSTRAINT unit_price_positive CHECK (unit_price >= 0),
+    CONSTRAINT units_in_stock_non_negative CHECK (units_in_stock >= 0),
+    CONSTRAINT units_on_order_non_negative CHECK (units_on_order >= 0),
+    CONSTRAINT reorder_level_non_negative CHECK (reorder_level >= 0),
+    CONSTRAINT product_name_unique UNIQUE (product_name)
+);
+
+-- Customers Table
+CREATE TABLE IF NOT EXISTS customers (
+    customer_id SERIAL PRIMARY KEY,
+    customer_code VARCHAR(10) NOT NULL,
+    company_name VARCHAR(200) NOT NULL,
+    contact_name VARCHAR(100),
+    contact_title VARCHAR(100),
+    address VARCHAR(200),
+    city VARCHAR(100),
+    region VARCHAR(100),
+    postal_code VARCHAR(20),
+    country VARCHAR(100),
+    phone VARCHAR(50),
+    fax VARCHAR(50),
+    email email_addr,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Constraints
+    CONSTRAINT customer_code_unique UNIQUE (customer_code),
+    CONSTRAINT customer_code_format CHECK (char_length(customer_code) BETWEEN 3 AND 10 AND customer_code ~ '^[A-Z0-9]{3,10}$'),
+    CONSTRAINT company_name_not_empty_customers CHECK (company_name <> '')
+);
+
+-- Employees Table
+CREATE TABLE IF NOT EXISTS employees (
+    employee_id SERIAL PRIMARY KEY,
+    first_name VARCHAR(100) NOT NULL,
+    last_name VARCHAR(100) NOT NULL,
+    title VARCHAR(100),
+    title_of_courtesy VARCHAR(50),
+    birth_date DATE,
+    hire_date DATE,
+    address VARCHAR(200),
+    city VARCHAR(100),
+    region VARCHAR(100),
+    postal_code VARCHAR(20),
+    country VARCHAR(100),
+    home_phone VARCHAR(50),
+    extension VARCHAR(10),
+    photo BYTEA,
+    notes TEXT,
+    reports_to INTEGER,
+    photo_path VARCHAR(300),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Self-referencing Foreign Key (Manager relationship)
+    CONSTRAINT fk_employee_reports_to 
+        FOREIGN KEY (reports_to) 
+        REFERENCES employees(employee_id) 
+        ON DELETE SET NULL,
+    
+    -- Constraints
+    CONSTRAINT first_name_not_empty CHECK (first_name <> ''),
+    CONSTRAINT last_name_not_empty CHECK (last_name <> ''),
+    CONSTRAINT hire_date_after_birth CHECK (birth_date IS NULL OR hire_date IS NULL OR hire_date > birth_date),
+    CONSTRAINT birth_date_reasonable CHECK (birth_date IS NULL OR birth_date > '1900-01-01'),
+    CONSTRAINT hire_date_not_future CHECK (hire_date IS NULL OR hire_date <= CURRENT_DATE)
+);
+
+-- Shippers Table
+CREATE TABLE IF NOT EXISTS shippers (
+    shipper_id SERIAL PRIMARY KEY,
+    company_name VARCHAR(200) NOT NULL,
+    phone VARCHAR(50),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Constraints
+    CONSTRAINT shipper_company_name_unique UNIQUE (company_name),
+    CONSTRAINT shipper_company_name_not_empty CHECK (company_name <> '')
+);
+
+-- Orders Table
+CREATE TABLE IF NOT EXISTS orders (
+    order_id SERIAL PRIMARY KEY,
+    customer_id INTEGER NOT NULL,
+    employee_id INTEGER,
+    order_date DATE NOT NULL DEFAULT CURRENT_DATE,
+    required_date DATE,
+    shipped_date DATE,
+    ship_via INTEGER,
+    freight NUMERIC(10, 2) DEFAULT 0.00,
+    ship_name VARCHAR(200),
+    ship_address VARCHAR(200),
+    ship_city VARCHAR(100),
+    ship_region VARCHAR(100),
+    ship_postal_code VARCHAR(20),
+    ship_country VARCHAR(100),
+    order_status VARCHAR(50) NOT NULL DEFAULT 'pending',
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Foreign Key Constraints with CASCADE rules
+    CONSTRAINT fk_order_customer 
+        FOREIGN KEY (customer_id) 
+        REFERENCES customers(customer_id) 
+        ON DELETE RESTRICT,
+    
+    CONSTRAINT fk_order_employee 
+        FOREIGN KEY (employee_id) 
+        REFERENCES employees(employee_id) 
+        ON DELETE SET NULL,
+    
+    CONSTRAINT fk_order_shipper 
+        FOREIGN KEY (ship_via) 
+        REFERENCES shippers(shipper_id) 
+        ON DELETE SET NULL,
+    
+    -- Data Validation Constraints
+    CONSTRAINT freight_non_negative CHECK (freight >= 0),
+    CONSTRAINT shipped_date_after_order CHECK (shipped_date IS NULL OR shipped_date >= order_date),
+    CONSTRAINT required_date_after_order CHECK (required_date IS NULL OR required_date >= order_date),
+    CONSTRAINT order_status_valid CHECK (order_status IN ('pending', 'processing', 'shipped', 'delivered', 'cancelled'))
+);
+
+-- Order Details Table (Junction table with composite key)
+CREATE TABLE IF NOT EXISTS order_details (
+    order_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    unit_price NUMERIC(10, 2) NOT NULL,
+    quantity INTEGER NOT NULL,
+    discount NUMERIC(4, 2) NOT NULL DEFAULT 0.00,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Composite Primary Key
+    PRIMARY KEY (order_id, product_id),
+    
+    -- Foreign Key Constraints with CASCADE rules
+    CONSTRAINT fk_order_detail_order 
+        FOREIGN KEY (order_id) 
+        REFERENCES orders(order_id) 
+        ON DELETE CASCADE,
+    
+    CONSTRAINT fk_order_detail_product 
+        FOREIGN KEY (product_id) 
+        REFERENCES products(product_id) 
+        ON DELETE RESTRICT,
+    
+    -- Data Validation Constraints
+    CONSTRAINT unit_price_positive_detail CHECK (unit_price >= 0),
+    CONSTRAINT quantity_positive CHECK (quantity > 0),
+    CONSTRAINT discount_valid CHECK (discount >= 0 AND discount <= 1)
+);
+
+-- Regions Table
+CREATE TABLE IF NOT EXISTS regions (
+    region_id SERIAL PRIMARY KEY,
+    region_description VARCHAR(100) NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Constraints
+    CONSTRAINT region_description_not_empty CHECK (region_description <> ''),
+    CONSTRAINT region_description_unique UNIQUE (region_description)
+);
+
+-- Territories Table
+CREATE TABLE IF NOT EXISTS territories (
+    territory_id SERIAL PRIMARY KEY,
+    territory_description VARCHAR(100) NOT NULL,
+    region_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Foreign Key Constraint
+    CONSTRAINT fk_territory_region 
+        FOREIGN KEY (region_id) 
+        REFERENCES regions(region_id) 
+        ON DELETE CASCADE,
+    
+    -- Constraints
+    CONSTRAINT territory_description_not_empty CHECK (territory_description <> ''),
+    CONSTRAINT territory_description_unique UNIQUE (territory_description)
+);
+
+-- Employee Territories (Many-to-Many Junction Table)
+CREATE TABLE IF NOT EXISTS employee_territories (
+    employee_id INTEGER NOT NULL,
+    territory_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Composite Primary Key
+    PRIMARY KEY (employee_id, territory_id),
+    
+    -- Foreign Key Constraints
+    CONSTRAINT fk_emp_territory_employee 
+        FOREIGN KEY (employee_id) 
+        REFERENCES employees(employee_id) 
+        ON DELETE CASCADE,
+    
+    CONSTRAINT fk_emp_territory_territory 
+        FOREIGN KEY (territory_id) 
+        REFERENCES territories(territory_id) 
+        ON DELETE CASCADE
+);
+
+-- =====================================================
+-- AUDIT LOG TABLE
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS audit_log (
+    audit_id BIGSERIAL PRIMARY KEY,
+    table_name VARCHAR(100) NOT NULL,
+    operation VARCHAR(20) NOT NULL,
+    record_id INTEGER,
+    old_data JSONB,
+    new_data JSONB,
+    changed_by VARCHAR(100),
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Constraints
+    CONSTRAINT operation_valid CHECK (operation IN ('INSERT', 'UPDATE', 'DELETE'))
+);
+
+-- =====================================================
+-- QUERY EXECUTION LOG TABLE
+-- =====================================================
+
+-- Telemetry only: UNLOGGED skips WAL writes (contents are truncated after a crash)
+CREATE UNLOGGED TABLE IF NOT EXISTS query_execution_log (
+    log_id BIGSERIAL PRIMARY KEY,
+    natural_language_query TEXT NOT NULL,
+    generated_sql TEXT NOT NULL,
+    execution_status VARCHAR(20) NOT NULL,
+    execution_time_ms INTEGER,
+    result_rows INTEGER,
+    error_message TEXT,
+    executed_by VARCHAR(100),
+    executed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    -- Constraints
+    CONSTRAINT execution_status_valid CHECK (execution_status IN ('success', 'error', 'timeout'))
+);
+"""
+
+# Heap pages summarised by each BRIN index entry
+_BRIN_PAGES_PER_RANGE: Final[int] = 32
+
+# Tunes maintenance memory for the transaction, then runs each (index_name, ddl)
+# row in its own exception block so one failed index build is reported as a
+# warning instead of aborting the rest
+_CREATE_INDEXES_DO: Final[str] = """
+DO $indexes$
+DECLARE
+    r RECORD;
+BEGIN
+    BEGIN
+        PERFORM set_config('maintenance_work_mem', {maintenance_work_mem}, true);
+        PERFORM set_config('max_parallel_maintenance_workers', {max_parallel_workers}, true);
+    EXCEPTION WHEN others THEN
+        RAISE WARNING 'Could not tune maintenance memory for index builds: %', SQLERRM;
+    END;
+    
+    FOR r IN SELECT * FROM (VALUES {rows}) AS t(index_name, ddl) LOOP
+        BEGIN
+            EXECUTE r.ddl;
+        EXCEPTION WHEN others THEN
+            RAISE WARNING 'Could not create index "%": %', r.index_name, SQLERRM;
+        END;
+    END LOOP;
+END
+$indexes$
+"""
+
+# Individual CREATE TABLE statements, split once at import time
+_SCHEMA_STATEMENTS: Final[Tuple[str, ...]] = tuple(
+    statement for statement in sqlparse.split(_SCHEMA_SQL) if statement.strip()
+)
+
+# Trigger function and per-table triggers for automatic updated_at timestamps
+_TRIGGER_SQL: Final[str] = """
+-- Create trigger function for updating timestamp
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Apply trigger to all tables with updated_at column
+DO $$
+DECLARE
+    t RECORD;
+BEGIN
+    FOR t IN 
+        SELECT table_name 
+        FROM information_schema.columns 
+        WHERE column_name = 'updated_at' 
+        AND table_schema = 'public'
+    LOOP
+        EXECUTE format('
+            DROP TRIGGER IF EXISTS update_%I_timestamp ON %I;
+            CREATE TRIGGER update_%I_timestamp
+            BEFORE UPDATE ON %I
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at_column();
+        ', t.table_name, t.table_name, t.table_name, t.table_name);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Trigger DDL split per statement for pipelined (extended-protocol) execution
+_TRIGGER_STATEMENTS: Final[Tuple[str, ...]] = tuple(
+    statement for statement in sqlparse.split(_TRIGGER_SQL) if statement.strip()
+)
+
+# Materialized employee hierarchy; needs the ltree extension, so it is only
+# applied when that is installed (see DatabaseLayer.create_employee_path)
+_EMPLOYEE_PATH_SQL: Final[str] = """
+-- Materialized reports_to chain, e.g. '2.5.9'; also added to existing databases
+ALTER TABLE employees ADD COLUMN IF NOT EXISTS path LTREE NOT NULL DEFAULT '';
+
+-- Backfill rows that predate the column (before the triggers below exist)
+WITH RECURSIVE chain AS (
+    SELECT employee_id, employee_id::text::ltree AS path
+    FROM employees
+    WHERE reports_to IS NULL
+    UNION ALL
+    SELECT e.employee_id, c.path || e.employee_id::text
+    FROM employees e
+    JOIN chain c ON e.reports_to = c.employee_id
+)
+UPDATE employees e
+SET path = chain.path
+FROM chain
+WHERE e.employee_id = chain.employee_id
+    AND e.path = '';
+
+-- Maintain employees.path from reports_to so hierarchy queries are a single
+-- GiST lookup (path <@ manager_path) instead of a recursive CTE
+CREATE OR REPLACE FUNCTION update_employee_path()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.path = COALESCE(
+        (SELECT path FROM employees WHERE employee_id = NEW.reports_to),
+        ''::ltree
+    ) || NEW.employee_id::text;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Re-root the subtree when an employee's own path changes
+CREATE OR REPLACE FUNCTION cascade_employee_path()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE employees
+    SET path = NEW.path || subpath(path, nlevel(OLD.path))
+    WHERE path <@ OLD.path
+        AND employee_id <> NEW.employee_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS employees_path_set ON employees;
+CREATE TRIGGER employees_path_set
+BEFORE INSERT OR UPDATE OF reports_to ON employees
+FOR EACH ROW
+EXECUTE FUNCTION update_employee_path();
+
+DROP TRIGGER IF EXISTS employees_path_cascade ON employees;
+CREATE TRIGGER employees_path_cascade
+AFTER UPDATE ON employees
+FOR EACH ROW
+WHEN (OLD.path IS DISTINCT FROM NEW.path)
+EXECUTE FUNCTION cascade_employee_path();
+"""
+
+_EMPLOYEE_PATH_STATEMENTS: Final[Tuple[str, ...]] = tuple(
+    statement for statement in sqlparse.split(_EMPLOYEE_PATH_SQL) if statement.strip()
+)
+
+
 @dataclass
 class DatabaseConfig:
     """Database configuration parameters"""
@@ -35,6 +512,10 @@ class DatabaseConfig:
     readonly_password: str = "readonly_password"
     readwrite_user: str = "text2sql_readwrite"
     readwrite_password: str = "readwrite_password"
+    maintenance_work_mem: str = "1GB"
+    max_parallel_maintenance_workers: int = 4
+    pool_size: int = 5  # Max pooled connections for concurrent introspection
+    statement_timeout_ms: int = 0  # Readonly session statement_timeout set at connect; 0 keeps the server default
 
 
 @dataclass
@@ -42,10 +523,12 @@ class IndexConfig:
     """Index configuration with performance justification"""
     name: str
     table: str
-    columns: List[str]
-    index_type: str  # 'btree', 'gin', 'gist', 'hash'
+    columns: Tuple[str, ...]
+    index_type: str  # 'btree', 'gin', 'gist', 'hash', 'brin'
     unique: bool = False
     justification: str = ""
+    opclass: str = ""  # e.g. 'gin_trgm_ops'; one index per column when set
+    include: Tuple[str, ...] = ()  # B-tree INCLUDE payload columns
 
 
 class DatabaseLayer:
@@ -61,6 +544,15 @@ class DatabaseLayer:
         self.config = config
         self.conn = None
         self.cursor = None
+        # Connection parameters of self.conn (see _conninfo_candidates)
+        self._conninfo: Optional[Dict[str, object]] = None
+        self.pool: Optional[ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # One permit per pooled connection: callers wait for a free connection
+        # instead of getting PoolError from an exhausted pool
+        self._pool_slots = threading.BoundedSemaphore(config.pool_size)
+        # Rendered CREATE INDEX DDL per index definition, for the current connection
+        self._index_ddl_cache: Dict[tuple, Tuple[Tuple[str, str], ...]] = {}
         
     def connect(self, as_admin: bool = True, database: str = None) -> None:
         """
@@ -73,50 +565,58 @@ class DatabaseLayer:
         try:
             db_name = database or self.config.database
             
-            if as_admin:
+            candidates = self._conninfo_candidates(as_admin, db_name)
+            for attempt, conninfo in enumerate(candidates, start=1):
                 try:
-                    # Prefer TCP when a password is provided
-                    if self.config.admin_password:
-                        self.conn = psycopg2.connect(
-                            host=self.config.host,
-                            port=self.config.port,
-                            database=db_name,
-                            user=self.config.admin_user,
-                            password=self.config.admin_password
-                        )
-                    else:
-                        # Fallback to local peer auth via Unix socket by omitting host/port
-                        self.conn = psycopg2.connect(
-                            database=db_name,
-                            user=self.config.admin_user
-                        )
-                except psycopg2.OperationalError as e:
-                    # If peer auth fallback fails and a password exists, rethrow; otherwise try last-resort TCP without password
-                    if not self.config.admin_password and self.config.host:
-                        self.conn = psycopg2.connect(
-                            host=self.config.host,
-                            port=self.config.port,
-                            database=db_name,
-                            user=self.config.admin_user
-                        )
-                    else:
+                    self.conn = psycopg2.connect(**conninfo)
+                    break
+                except psycopg2.OperationalError:
+                    if attempt == len(candidates):
                         raise
-            else:
-                self.conn = psycopg2.connect(
-                    host=self.config.host,
-                    port=self.config.port,
-                    database=db_name,
-                    user=self.config.readonly_user,
-                    password=self.config.readonly_password
-                )
+            # Parameters that worked, reused by other connections to the same database
+            self._conninfo = conninfo
             
             self.cursor = self.conn.cursor()
+            # DDL is quoted against the connection, so render it again for a new one
+            self._index_ddl_cache.clear()
             logger.info(f"Connected to database: {db_name}")
             
         except psycopg2.Error as e:
             logger.error(f"Database connection error: {e}")
             raise
     
+    def _conninfo_candidates(self, as_admin: bool, db_name: str) -> List[Dict[str, object]]:
+        """
+        Connection parameters to try in order (keyword names accepted by psycopg2 and psycopg)
+        
+        Args:
+            as_admin: Admin user (default) or readonly user
+            db_name: Database name to connect to
+            
+        Returns:
+            Admin: TCP when a password is provided; otherwise local peer auth via
+            the Unix socket (host/port omitted), then last-resort TCP without a
+            password. Readonly: TCP with its password, opened with
+            config.statement_timeout_ms as the session default when set
+        """
+        tcp = {'host': self.config.host, 'port': self.config.port, 'dbname': db_name}
+        if not as_admin:
+            readonly = dict(
+                tcp, user=self.config.readonly_user, password=self.config.readonly_password
+            )
+            # A startup option is the session's reset value: no per-query SET, and
+            # a rollback cannot undo it the way it undoes a SET in a transaction
+            if self.config.statement_timeout_ms:
+                readonly['options'] = f"-c statement_timeout={int(self.config.statement_timeout_ms)}"
+            return [readonly]
+        if self.config.admin_password:
+            return [dict(tcp, user=self.config.admin_user, password=self.config.admin_password)]
+        
+        candidates = [{'dbname': db_name, 'user': self.config.admin_user}]
+        if self.config.host:
+            candidates.append(dict(tcp, user=self.config.admin_user))
+        return candidates
+    
     def disconnect(self) -> None:
         """Close database connection"""
         if self.cursor:
@@ -124,6 +624,43 @@ class DatabaseLayer:
         if self.conn:
             self.conn.close()
             logger.info("Database connection closed")
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+            logger.info("Connection pool closed")
+    
+    @contextmanager
+    def pooled_cursor(self) -> Iterator[psycopg2.extensions.cursor]:
+        """
+        Borrow a connection from the pool and yield a cursor on it
+        
+        Commits on success, rolls back on error, and always returns the
+        connection to the pool, so callers can run concurrently. Pooled
+        connections use the same parameters (user, auth fallback) as
+        connect(); when all are checked out, callers block until one is free.
+        """
+        with self._pool_lock:
+            if self.pool is None:
+                if self._conninfo is None:
+                    raise RuntimeError("Not connected to database")
+                self.pool = ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=self.config.pool_size,
+                    **self._conninfo
+                )
+            pool = self.pool
+        
+        with self._pool_slots:
+            conn = pool.getconn()
+            try:
+                with conn.cursor() as cursor:
+                    yield cursor
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                pool.putconn(conn)
     
     def create_database(self) -> None:
         """Create the main database if it doesn't exist"""
@@ -132,20 +669,15 @@ class DatabaseLayer:
             self.connect(as_admin=True, database='postgres')
             self.conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
             
-            # Check if database exists
-            self.cursor.execute(
-                "SELECT 1 FROM pg_database WHERE datname = %s",
-                (self.config.database,)
-            )
-            
-            if not self.cursor.fetchone():
+            # Attempt creation directly; an existing database is reported by the server
+            try:
                 self.cursor.execute(
                     sql.SQL("CREATE DATABASE {}").format(
                         sql.Identifier(self.config.database)
                     )
                 )
                 logger.info(f"Database '{self.config.database}' created successfully")
-            else:
+            except psycopg2.errors.DuplicateDatabase:
                 logger.info(f"Database '{self.config.database}' already exists")
             
             self.disconnect()
@@ -160,21 +692,52 @@ class DatabaseLayer:
             ('uuid-ossp', 'UUID generation'),
             ('pg_trgm', 'Trigram matching for text search'),
             ('btree_gin', 'GIN indexes for B-tree types'),
+            ('ltree', 'Materialized paths for the employee hierarchy'),
         ]
         
+        # One savepoint per extension, so a missing one does not abort the
+        # transaction (and with it every extension after it)
         for ext_name, description in extensions:
+            self.cursor.execute("SAVEPOINT create_extension")
             try:
                 self.cursor.execute(
                     sql.SQL("CREATE EXTENSION IF NOT EXISTS {} CASCADE").format(
-                        sql.Identifier(ext_name.replace('-', '_'))
+                        sql.Identifier(ext_name)
                     )
                 )
+                self.cursor.execute("RELEASE SAVEPOINT create_extension")
                 logger.info(f"Extension '{ext_name}' created ({description})")
             except psycopg2.Error as e:
+                self.cursor.execute("ROLLBACK TO SAVEPOINT create_extension")
                 logger.warning(f"Could not create extension '{ext_name}': {e}")
         
         self.conn.commit()
     
+    def has_extension(self, ext_name: str) -> bool:
+        """Check whether an extension is installed in the connected database"""
+        self.cursor.execute("SELECT 1 FROM pg_extension WHERE extname = %s", (ext_name,))
+        return self.cursor.fetchone() is not None
+    
+    def create_employee_path(self) -> None:
+        """
+        Add and maintain the employees.path ltree hierarchy column
+        Skipped (with a warning) when the ltree extension is unavailable;
+        reports_to alone still answers direct-report lookups
+        """
+        if not self.has_extension('ltree'):
+            logger.warning("ltree extension unavailable, skipping employees.path")
+            return
+        
+        try:
+            for statement in _EMPLOYEE_PATH_STATEMENTS:
+                self.cursor.execute(statement)
+            self.conn.commit()
+            logger.info("Employee hierarchy path created successfully")
+        except psycopg2.Error as e:
+            self.conn.rollback()
+            logger.error(f"Error creating employee hierarchy path: {e}")
+            raise
+    
     def create_schema(self) -> None:
         """
         Create complete database schema with all constraints
@@ -188,385 +751,25 @@ class DatabaseLayer:
         # Enable extensions first
         self.create_extensions()
         
-        # Schema DDL with all requirements
-        schema_sql = """
-        -- =====================================================
-        -- CORE TABLES WITH FULL CONSTRAINTS
-        -- =====================================================
-        
-        -- Categories Table
-        CREATE TABLE IF NOT EXISTS categories (
-            category_id SERIAL PRIMARY KEY,
-            category_name VARCHAR(100) NOT NULL,
-            description TEXT,
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Constraints
-            CONSTRAINT category_name_not_empty CHECK (category_name <> ''),
-            CONSTRAINT category_name_unique UNIQUE (category_name)
-        );
-        
-        -- Suppliers Table
-        CREATE TABLE IF NOT EXISTS suppliers (
-            supplier_id SERIAL PRIMARY KEY,
-            company_name VARCHAR(200) NOT NULL,
-            contact_name VARCHAR(100),
-            contact_title VARCHAR(100),
-            address VARCHAR(200),
-            city VARCHAR(100),
-            region VARCHAR(100),
-            postal_code VARCHAR(20),
-            country VARCHAR(100),
-            phone VARCHAR(50),
-            fax VARCHAR(50),
-            email VARCHAR(100),
-            website VARCHAR(200),
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Constraints
-            CONSTRAINT company_name_not_empty CHECK (company_name <> ''),
-            CONSTRAINT company_name_unique UNIQUE (company_name),
-            CONSTRAINT email_format CHECK (email ~* '^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}$' OR email IS NULL),
-            CONSTRAINT phone_not_empty CHECK (phone IS NULL OR phone <> '')
-        );
-        
-        -- Products Table
-        CREATE TABLE IF NOT EXISTS products (
-            product_id SERIAL PRIMARY KEY,
-            product_name VARCHAR(200) NOT NULL,
-            supplier_id INTEGER,
-            category_id INTEGER,
-            quantity_per_unit VARCHAR(100),
-            unit_price NUMERIC(10, 2) NOT NULL DEFAULT 0.00,
-            units_in_stock INTEGER NOT NULL DEFAULT 0,
-            units_on_order INTEGER NOT NULL DEFAULT 0,
-            reorder_level INTEGER NOT NULL DEFAULT 0,
-            discontinued BOOLEAN NOT NULL DEFAULT FALSE,
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Foreign Key Constraints with CASCADE rules
-            CONSTRAINT fk_product_supplier 
-                FOREIGN KEY (supplier_id) 
-                REFERENCES suppliers(supplier_id) 
-                ON DELETE SET NULL 
-                ON UPDATE CASCADE,
-            
-            CONSTRAINT fk_product_category 
-                FOREIGN KEY (category_id) 
-                REFERENCES categories(category_id) 
-                ON DELETE SET NULL 
-                ON UPDATE CASCADE,
-            
-            -- Data Validation Constraints
-            CONSTRAINT product_name_not_empty CHECK (product_name <> ''),
-            CONSTRAINT unit_price_positive CHECK (unit_price >= 0),
-            CONSTRAINT units_in_stock_non_negative CHECK (units_in_stock >= 0),
-            CONSTRAINT units_on_order_non_negative CHECK (units_on_order >= 0),
-            CONSTRAINT reorder_level_non_negative CHECK (reorder_level >= 0),
-            CONSTRAINT product_name_unique UNIQUE (product_name)
-        );
-        
-        -- Customers Table
-        CREATE TABLE IF NOT EXISTS customers (
-            customer_id SERIAL PRIMARY KEY,
-            customer_code VARCHAR(10) NOT NULL,
-            company_name VARCHAR(200) NOT NULL,
-            contact_name VARCHAR(100),
-            contact_title VARCHAR(100),
-            address VARCHAR(200),
-            city VARCHAR(100),
-            region VARCHAR(100),
-            postal_code VARCHAR(20),
-            country VARCHAR(100),
-            phone VARCHAR(50),
-            fax VARCHAR(50),
-            email VARCHAR(100),
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Constraints
-            CONSTRAINT customer_code_unique UNIQUE (customer_code),
-            CONSTRAINT customer_code_format CHECK (customer_code ~ '^[A-Z0-9]{3,10}$'),
-            CONSTRAINT company_name_not_empty_customers CHECK (company_name <> ''),
-            CONSTRAINT email_format_customers CHECK (email ~* '^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}$' OR email IS NULL)
-        );
-        
-        -- Employees Table
-        CREATE TABLE IF NOT EXISTS employees (
-            employee_id SERIAL PRIMARY KEY,
-            first_name VARCHAR(100) NOT NULL,
-            last_name VARCHAR(100) NOT NULL,
-            title VARCHAR(100),
-            title_of_courtesy VARCHAR(50),
-            birth_date DATE,
-            hire_date DATE,
-            address VARCHAR(200),
-            city VARCHAR(100),
-            region VARCHAR(100),
-            postal_code VARCHAR(20),
-            country VARCHAR(100),
-            home_phone VARCHAR(50),
-            extension VARCHAR(10),
-            photo BYTEA,
-            notes TEXT,
-            reports_to INTEGER,
-            photo_path VARCHAR(300),
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Self-referencing Foreign Key (Manager relationship)
-            CONSTRAINT fk_employee_reports_to 
-                FOREIGN KEY (reports_to) 
-                REFERENCES employees(employee_id) 
-                ON DELETE SET NULL 
-                ON UPDATE CASCADE,
-            
-            -- Constraints
-            CONSTRAINT first_name_not_empty CHECK (first_name <> ''),
-            CONSTRAINT last_name_not_empty CHECK (last_name <> ''),
-            CONSTRAINT hire_date_after_birth CHECK (birth_date IS NULL OR hire_date IS NULL OR hire_date > birth_date),
-            CONSTRAINT birth_date_reasonable CHECK (birth_date IS NULL OR birth_date > '1900-01-01'),
-            CONSTRAINT hire_date_not_future CHECK (hire_date IS NULL OR hire_date <= CURRENT_DATE)
-        );
-        
-        -- Shippers Table
-        CREATE TABLE IF NOT EXISTS shippers (
-            shipper_id SERIAL PRIMARY KEY,
-            company_name VARCHAR(200) NOT NULL,
-            phone VARCHAR(50),
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Constraints
-            CONSTRAINT shipper_company_name_unique UNIQUE (company_name),
-            CONSTRAINT shipper_company_name_not_empty CHECK (company_name <> '')
-        );
-        
-        -- Orders Table
-        CREATE TABLE IF NOT EXISTS orders (
-            order_id SERIAL PRIMARY KEY,
-            customer_id INTEGER NOT NULL,
-            employee_id INTEGER,
-            order_date DATE NOT NULL DEFAULT CURRENT_DATE,
-            required_date DATE,
-            shipped_date DATE,
-            ship_via INTEGER,
-            freight NUMERIC(10, 2) DEFAULT 0.00,
-            ship_name VARCHAR(200),
-            ship_address VARCHAR(200),
-            ship_city VARCHAR(100),
-            ship_region VARCHAR(100),
-            ship_postal_code VARCHAR(20),
-            ship_country VARCHAR(100),
-            order_status VARCHAR(50) NOT NULL DEFAULT 'pending',
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Foreign Key Constraints with CASCADE rules
-            CONSTRAINT fk_order_customer 
-                FOREIGN KEY (customer_id) 
-                REFERENCES customers(customer_id) 
-                ON DELETE RESTRICT 
-                ON UPDATE CASCADE,
-            
-            CONSTRAINT fk_order_employee 
-                FOREIGN KEY (employee_id) 
-                REFERENCES employees(employee_id) 
-                ON DELETE SET NULL 
-                ON UPDATE CASCADE,
-            
-            CONSTRAINT fk_order_shipper 
-                FOREIGN KEY (ship_via) 
-                REFERENCES shippers(shipper_id) 
-                ON DELETE SET NULL 
-                ON UPDATE CASCADE,
-            
-            -- Data Validation Constraints
-            CONSTRAINT freight_non_negative CHECK (freight >= 0),
-            CONSTRAINT shipped_date_after_order CHECK (shipped_date IS NULL OR shipped_date >= order_date),
-            CONSTRAINT required_date_after_order CHECK (required_date IS NULL OR required_date >= order_date),
-            CONSTRAINT order_status_valid CHECK (order_status IN ('pending', 'processing', 'shipped', 'delivered', 'cancelled'))
-        );
-        
-        -- Order Details Table (Junction table with composite key)
-        CREATE TABLE IF NOT EXISTS order_details (
-            order_id INTEGER NOT NULL,
-            product_id INTEGER NOT NULL,
-            unit_price NUMERIC(10, 2) NOT NULL,
-            quantity INTEGER NOT NULL,
-            discount NUMERIC(4, 2) NOT NULL DEFAULT 0.00,
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Composite Primary Key
-            PRIMARY KEY (order_id, product_id),
-            
-            -- Foreign Key Constraints with CASCADE rules
-            CONSTRAINT fk_order_detail_order 
-                FOREIGN KEY (order_id) 
-                REFERENCES orders(order_id) 
-                ON DELETE CASCADE 
-                ON UPDATE CASCADE,
-            
-            CONSTRAINT fk_order_detail_product 
-                FOREIGN KEY (product_id) 
-                REFERENCES products(product_id) 
-                ON DELETE RESTRICT 
-                ON UPDATE CASCADE,
-            
-            -- Data Validation Constraints
-            CONSTRAINT unit_price_positive_detail CHECK (unit_price >= 0),
-            CONSTRAINT quantity_positive CHECK (quantity > 0),
-            CONSTRAINT discount_valid CHECK (discount >= 0 AND discount <= 1)
-        );
-        
-        -- Regions Table
-        CREATE TABLE IF NOT EXISTS regions (
-            region_id SERIAL PRIMARY KEY,
-            region_description VARCHAR(100) NOT NULL,
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Constraints
-            CONSTRAINT region_description_not_empty CHECK (region_description <> ''),
-            CONSTRAINT region_description_unique UNIQUE (region_description)
-        );
-        
-        -- Territories Table
-        CREATE TABLE IF NOT EXISTS territories (
-            territory_id SERIAL PRIMARY KEY,
-            territory_description VARCHAR(100) NOT NULL,
-            region_id INTEGER NOT NULL,
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Foreign Key Constraint
-            CONSTRAINT fk_territory_region 
-                FOREIGN KEY (region_id) 
-                REFERENCES regions(region_id) 
-                ON DELETE CASCADE 
-                ON UPDATE CASCADE,
-            
-            -- Constraints
-            CONSTRAINT territory_description_not_empty CHECK (territory_description <> ''),
-            CONSTRAINT territory_description_unique UNIQUE (territory_description)
-        );
-        
-        -- Employee Territories (Many-to-Many Junction Table)
-        CREATE TABLE IF NOT EXISTS employee_territories (
-            employee_id INTEGER NOT NULL,
-            territory_id INTEGER NOT NULL,
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Composite Primary Key
-            PRIMARY KEY (employee_id, territory_id),
-            
-            -- Foreign Key Constraints
-            CONSTRAINT fk_emp_territory_employee 
-                FOREIGN KEY (employee_id) 
-                REFERENCES employees(employee_id) 
-                ON DELETE CASCADE 
-                ON UPDATE CASCADE,
-            
-            CONSTRAINT fk_emp_territory_territory 
-                FOREIGN KEY (territory_id) 
-                REFERENCES territories(territory_id) 
-                ON DELETE CASCADE 
-                ON UPDATE CASCADE
-        );
-        
-        -- =====================================================
-        -- AUDIT LOG TABLE
-        -- =====================================================
-        
-        CREATE TABLE IF NOT EXISTS audit_log (
-            audit_id BIGSERIAL PRIMARY KEY,
-            table_name VARCHAR(100) NOT NULL,
-            operation VARCHAR(20) NOT NULL,
-            record_id INTEGER,
-            old_data JSONB,
-            new_data JSONB,
-            changed_by VARCHAR(100),
-            changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Constraints
-            CONSTRAINT operation_valid CHECK (operation IN ('INSERT', 'UPDATE', 'DELETE'))
-        );
-        
-        -- =====================================================
-        -- QUERY EXECUTION LOG TABLE
-        -- =====================================================
-        
-        CREATE TABLE IF NOT EXISTS query_execution_log (
-            log_id BIGSERIAL PRIMARY KEY,
-            natural_language_query TEXT NOT NULL,
-            generated_sql TEXT NOT NULL,
-            execution_status VARCHAR(20) NOT NULL,
-            execution_time_ms INTEGER,
-            result_rows INTEGER,
-            error_message TEXT,
-            executed_by VARCHAR(100),
-            executed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            
-            -- Constraints
-            CONSTRAINT execution_status_valid CHECK (execution_status IN ('success', 'error', 'timeout'))
-        );
-        """
-        
         try:
-            self.cursor.execute(schema_sql)
+            for statement in _SCHEMA_STATEMENTS:
+                self.cursor.execute(statement)
             self.conn.commit()
             logger.info("Database schema created successfully")
         except psycopg2.Error as e:
             self.conn.rollback()
             logger.error(f"Error creating schema: {e}")
             raise
+        
+        self.create_employee_path()
     
     def create_update_timestamp_trigger(self) -> None:
         """
         Create trigger function and triggers for automatic updated_at timestamp
         This ensures audit timestamps are automatically maintained
         """
-        
-        trigger_sql = """
-        -- Create trigger function for updating timestamp
-        CREATE OR REPLACE FUNCTION update_updated_at_column()
-        RETURNS TRIGGER AS $$
-        BEGIN
-            NEW.updated_at = CURRENT_TIMESTAMP;
-            RETURN NEW;
-        END;
-        $$ LANGUAGE plpgsql;
-        
-        -- Apply trigger to all tables with updated_at column
-        DO $$
-        DECLARE
-            t RECORD;
-        BEGIN
-            FOR t IN 
-                SELECT table_name 
-                FROM information_schema.columns 
-                WHERE column_name = 'updated_at' 
-                AND table_schema = 'public'
-            LOOP
-                EXECUTE format('
-                    DROP TRIGGER IF EXISTS update_%I_timestamp ON %I;
-                    CREATE TRIGGER update_%I_timestamp
-                    BEFORE UPDATE ON %I
-                    FOR EACH ROW
-                    EXECUTE FUNCTION update_updated_at_column();
-                ', t.table_name, t.table_name, t.table_name, t.table_name);
-            END LOOP;
-        END;
-        $$ LANGUAGE plpgsql;
-        """
-        
         try:
-            self.cursor.execute(trigger_sql)
+            self.cursor.execute(_TRIGGER_SQL)
             self.conn.commit()
             logger.info("Update timestamp triggers created successfully")
         except psycopg2.Error as e:
@@ -574,6 +777,52 @@ class DatabaseLayer:
             logger.error(f"Error creating triggers: {e}")
             raise
     
+    def bootstrap_schema(self) -> None:
+        """
+        Create extensions, tables and update timestamp triggers
+        Uses a psycopg (v3) pipeline when installed so the DDL is sent without
+        waiting for a round-trip per statement; otherwise, or when called from
+        a running event loop (asyncio.run() cannot nest there, e.g. in FastAPI),
+        falls back to create_schema() and create_update_timestamp_trigger()
+        """
+        try:
+            import psycopg
+        except ImportError:
+            psycopg = None
+        try:
+            asyncio.get_running_loop()
+            in_event_loop = True
+        except RuntimeError:
+            in_event_loop = False
+        
+        if psycopg is None or in_event_loop:
+            self.create_schema()
+            self.create_update_timestamp_trigger()
+            return
+        
+        self.create_extensions()
+        
+        try:
+            asyncio.run(self._bootstrap_schema_async())
+            logger.info("Database schema and update timestamp triggers created (pipelined)")
+        except Exception as e:
+            logger.error(f"Error bootstrapping schema: {e}")
+            raise
+        
+        self.create_employee_path()
+    
+    async def _bootstrap_schema_async(self) -> None:
+        """Send all schema and trigger DDL through a single async pipeline"""
+        import psycopg
+        
+        # Same parameters (and auth fallback outcome) as the connection that
+        # create_extensions() just used
+        conn = await psycopg.AsyncConnection.connect(**self._conninfo)
+        async with conn:
+            async with conn.pipeline():
+                for statement in _SCHEMA_STATEMENTS + _TRIGGER_STATEMENTS:
+                    await conn.execute(statement)
+    
     def create_indexes(self) -> None:
         """
         Create performance-optimized indexes with justifications
@@ -585,70 +834,77 @@ class DatabaseLayer:
             IndexConfig(
                 name="idx_products_supplier",
                 table="products",
-                columns=["supplier_id"],
+                columns=("supplier_id",),
                 index_type="btree",
                 justification="Frequent joins between products and suppliers. B-tree optimal for foreign key lookups."
             ),
             IndexConfig(
                 name="idx_products_category",
                 table="products",
-                columns=["category_id"],
+                columns=("category_id",),
                 index_type="btree",
                 justification="Category-based product filtering is common. B-tree for efficient FK lookups."
             ),
             IndexConfig(
                 name="idx_products_price",
                 table="products",
-                columns=["unit_price"],
+                columns=("unit_price",),
                 index_type="btree",
                 justification="Price range queries (e.g., products under $50). B-tree excellent for range scans."
             ),
             IndexConfig(
                 name="idx_orders_customer",
                 table="orders",
-                columns=["customer_id"],
+                columns=("customer_id",),
                 index_type="btree",
                 justification="Customer order history lookups. B-tree for FK joins."
             ),
             IndexConfig(
                 name="idx_orders_employee",
                 table="orders",
-                columns=["employee_id"],
+                columns=("employee_id",),
                 index_type="btree",
                 justification="Employee performance queries (orders per employee). B-tree for FK joins."
             ),
             IndexConfig(
                 name="idx_orders_date",
                 table="orders",
-                columns=["order_date"],
-                index_type="btree",
-                justification="Date range queries (orders in date range). B-tree optimal for temporal queries."
+                columns=("order_date",),
+                index_type="brin",
+                justification="Date range queries (orders in date range). Orders are appended in date order, so BRIN min/max ranges stay tight at a fraction of B-tree size."
             ),
             IndexConfig(
                 name="idx_orders_status",
                 table="orders",
-                columns=["order_status"],
+                columns=("order_status",),
                 index_type="btree",
                 justification="Filter orders by status (pending, shipped, etc.). B-tree for equality searches."
             ),
             IndexConfig(
                 name="idx_order_details_product",
                 table="order_details",
-                columns=["product_id"],
+                columns=("product_id",),
                 index_type="btree",
                 justification="Product sales analysis. B-tree for FK lookups and aggregations."
             ),
             IndexConfig(
                 name="idx_employees_reports_to",
                 table="employees",
-                columns=["reports_to"],
+                columns=("reports_to",),
                 index_type="btree",
-                justification="Organizational hierarchy queries. B-tree for self-referencing FK."
+                justification="Direct-report lookups. B-tree for self-referencing FK."
+            ),
+            IndexConfig(
+                name="idx_employees_path",
+                table="employees",
+                columns=("path",),
+                index_type="gist",
+                justification="Org-chart ancestor/descendant queries (path <@ / @>). GiST over ltree replaces recursive CTEs."
             ),
             IndexConfig(
                 name="idx_customers_code",
                 table="customers",
-                columns=["customer_code"],
+                columns=("customer_code",),
                 index_type="btree",
                 unique=True,
                 justification="Customer code lookups (unique identifier). B-tree with uniqueness constraint."
@@ -658,38 +914,42 @@ class DatabaseLayer:
             IndexConfig(
                 name="idx_orders_customer_date",
                 table="orders",
-                columns=["customer_id", "order_date"],
+                columns=("customer_id", "order_date"),
                 index_type="btree",
-                justification="Customer order history by date. Composite B-tree for multi-column filtering."
+                include=("freight", "order_status"),
+                justification="Customer order history by date. Composite B-tree covering freight/status for index-only scans."
             ),
             IndexConfig(
                 name="idx_products_category_price",
                 table="products",
-                columns=["category_id", "unit_price"],
+                columns=("category_id", "unit_price"),
                 index_type="btree",
-                justification="Category-based price sorting. Composite for category filter + price sort."
+                include=("product_name",),
+                justification="Category-based price sorting. Composite for category filter + price sort, covering product_name."
             ),
             
             # GIN INDEXES (Generalized Inverted Index, best for full-text search and array operations)
             IndexConfig(
-                name="idx_products_name_gin",
+                name="idx_products_name_tsv",
                 table="products",
-                columns=["product_name"],
+                columns=("product_name_tsv",),
                 index_type="gin",
-                justification="Full-text search on product names using pg_trgm. GIN optimal for LIKE/ILIKE queries."
+                justification="Word search on product names via the generated tsvector column (@@). Smaller than trigram GIN, no recheck."
             ),
             IndexConfig(
                 name="idx_customers_company_gin",
                 table="customers",
-                columns=["company_name"],
+                columns=("company_name",),
                 index_type="gin",
-                justification="Full-text search on company names. GIN with trigram for fuzzy matching."
+                opclass="gin_trgm_ops",
+                justification="Substring search on company names. GIN with trigram for ILIKE '%...%' and fuzzy matching."
             ),
             IndexConfig(
                 name="idx_employees_name_gin",
                 table="employees",
-                columns=["first_name", "last_name"],
+                columns=("first_name", "last_name"),
                 index_type="gin",
+                opclass="gin_trgm_ops",
                 justification="Employee name search with fuzzy matching. GIN for multi-column text search."
             ),
             
@@ -697,69 +957,162 @@ class DatabaseLayer:
             IndexConfig(
                 name="idx_audit_log_table_time",
                 table="audit_log",
-                columns=["table_name", "changed_at"],
+                columns=("table_name", "changed_at"),
                 index_type="btree",
-                justification="Audit trail queries by table and time range. B-tree for temporal filtering."
+                justification="Audit trail queries by table and time range. B-tree kept for the equality match on table_name."
             ),
             IndexConfig(
                 name="idx_query_log_executed_at",
                 table="query_execution_log",
-                columns=["executed_at"],
-                index_type="btree",
-                justification="Query performance analysis over time. B-tree for date range queries."
+                columns=("executed_at",),
+                index_type="brin",
+                justification="Query performance analysis over time. Append-only log, so BRIN serves range scans with a KB-sized index."
             ),
             IndexConfig(
                 name="idx_query_log_status",
                 table="query_execution_log",
-                columns=["execution_status"],
+                columns=("execution_status",),
                 index_type="btree",
                 justification="Filter queries by success/error status. B-tree for categorical filtering."
             ),
         ]
         
-        for idx in indexes:
-            try:
-                # Create GIN indexes with pg_trgm operator class for text search
-                if idx.index_type == 'gin':
-                    # Create trigram index for text columns
-                    for col in idx.columns:
-                        self.cursor.execute(
-                            sql.SQL("""
-                                CREATE INDEX IF NOT EXISTS {index_name} 
-                                ON {table} 
-                                USING gin ({column} gin_trgm_ops)
-                            """).format(
-                                index_name=sql.Identifier(f"{idx.name}_{col}"),
-                                table=sql.Identifier(idx.table),
-                                column=sql.Identifier(col)
-                            )
-                        )
-                else:
-                    # Create B-tree or other index types
-                    columns_sql = sql.SQL(', ').join([sql.Identifier(col) for col in idx.columns])
-                    unique_sql = sql.SQL('UNIQUE') if idx.unique else sql.SQL('')
-                    
-                    self.cursor.execute(
-                        sql.SQL("""
-                            CREATE {unique} INDEX IF NOT EXISTS {index_name} 
-                            ON {table} 
-                            USING {index_type} ({columns})
-                        """).format(
-                            unique=unique_sql,
-                            index_name=sql.Identifier(idx.name),
-                            table=sql.Identifier(idx.table),
-                            index_type=sql.Identifier(idx.index_type),
-                            columns=columns_sql
-                        )
-                    )
-                
+        # Skip indexes that already exist so repeat initializations send no DDL
+        self.cursor.execute("""
+            SELECT c.relname
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind IN ('i', 'I')
+            AND n.nspname = 'public'
+        """)
+        existing = {row[0] for row in self.cursor.fetchall()}
+        pending = [
+            idx for idx in indexes
+            if not all(index_name in existing for index_name, _ in self._index_ddl(idx))
+        ]
+        
+        if not pending:
+            self.conn.commit()
+            logger.info("All indexes already exist")
+            return
+        
+        # All CREATE INDEX statements run server-side in a single DO block
+        statements = [
+            statement
+            for idx in pending
+            for statement in self._index_ddl(idx)
+            if statement[0] not in existing
+        ]
+        rows_sql = sql.SQL(', ').join(
+            sql.SQL('({}, {})').format(sql.Literal(index_name), sql.Literal(ddl))
+            for index_name, ddl in statements
+        )
+        
+        # Larger sort memory and parallel workers keep index builds out of pgsql_tmp;
+        # set_config(..., true) scopes them to this transaction, so no RESET is needed
+        do_sql = sql.SQL(_CREATE_INDEXES_DO).format(
+            maintenance_work_mem=sql.Literal(self.config.maintenance_work_mem),
+            max_parallel_workers=sql.Literal(str(self.config.max_parallel_maintenance_workers)),
+            rows=rows_sql
+        )
+        
+        del self.conn.notices[:]
+        try:
+            self.cursor.execute(do_sql)
+            self.conn.commit()
+        except psycopg2.Error as e:
+            self.conn.rollback()
+            logger.error(f"Error creating indexes: {e}")
+            raise
+        
+        # Tuning and per-index failures come back as server warnings
+        failed = set()
+        for notice in self.conn.notices:
+            failed.update(re.findall(r'Could not create index "([^"]+)"', notice))
+            logger.warning(notice.strip())
+        
+        for idx in pending:
+            if not any(index_name in failed for index_name, _ in self._index_ddl(idx)):
                 logger.info(f"Created index: {idx.name} ({idx.index_type}) - {idx.justification}")
-                
-            except psycopg2.Error as e:
-                logger.warning(f"Could not create index {idx.name}: {e}")
         
-        self.conn.commit()
-        logger.info("All indexes created successfully")
+        logger.info(f"All indexes created successfully ({len(indexes) - len(pending)} already existed)")
+    
+    def _index_ddl(self, idx: IndexConfig) -> Tuple[Tuple[str, str], ...]:
+        """Build the CREATE INDEX statement(s) for an IndexConfig as (index_name, ddl) pairs"""
+        key = (
+            idx.name, idx.table, idx.index_type, tuple(idx.columns),
+            idx.unique, idx.opclass, tuple(idx.include)
+        )
+        ddl = self._index_ddl_cache.get(key)
+        if ddl is None:
+            ddl = self._index_ddl_cache[key] = self._render_index_ddl(*key)
+        return ddl
+    
+    def _render_index_ddl(
+        self,
+        name: str,
+        table: str,
+        index_type: str,
+        columns: Tuple[str, ...],
+        unique: bool,
+        opclass: str,
+        include: Tuple[str, ...]
+    ) -> Tuple[Tuple[str, str], ...]:
+        """
+        Compose and quote CREATE INDEX DDL once per distinct index definition
+        
+        Returns:
+            Tuple of (index_name, ddl) pairs rendered against this connection
+        """
+        # Operator-class indexes (e.g. pg_trgm) get one index per column
+        if opclass:
+            return tuple(
+                (
+                    f"{name}_{col}",
+                    sql.SQL("""
+                        CREATE INDEX IF NOT EXISTS {index_name} 
+                        ON {table} 
+                        USING {index_type} ({column} {opclass})
+                    """).format(
+                        index_name=sql.Identifier(f"{name}_{col}"),
+                        table=sql.Identifier(table),
+                        index_type=sql.Identifier(index_type),
+                        column=sql.Identifier(col),
+                        opclass=sql.Identifier(opclass)
+                    ).as_string(self.conn)
+                )
+                for col in columns
+            )
+        
+        # B-tree, tsvector GIN or other index types
+        columns_sql = sql.SQL(', ').join([sql.Identifier(col) for col in columns])
+        unique_sql = sql.SQL('UNIQUE') if unique else sql.SQL('')
+        include_sql = sql.SQL('INCLUDE ({})').format(
+            sql.SQL(', ').join([sql.Identifier(col) for col in include])
+        ) if include else sql.SQL('')
+        # BRIN: one min/max summary per block range of append-only data
+        storage_sql = sql.SQL('WITH (pages_per_range = {})').format(
+            sql.Literal(_BRIN_PAGES_PER_RANGE)
+        ) if index_type == 'brin' else sql.SQL('')
+        
+        return ((
+            name,
+            sql.SQL("""
+                CREATE {unique} INDEX IF NOT EXISTS {index_name} 
+                ON {table} 
+                USING {index_type} ({columns})
+                {include}
+                {storage}
+            """).format(
+                unique=unique_sql,
+                index_name=sql.Identifier(name),
+                table=sql.Identifier(table),
+                index_type=sql.Identifier(index_type),
+                columns=columns_sql,
+                include=include_sql,
+                storage=storage_sql
+            ).as_string(self.conn)
+        ),)
     
     def create_users(self) -> None:
         """
@@ -842,22 +1195,15 @@ class DatabaseLayer:
         """
         
         try:
-            # Grant read-only permissions
+            # Both grant blocks go to the server in a single execute
             self.cursor.execute(
-                sql.SQL(readonly_grants).format(
-                    database=sql.Identifier(self.config.database),
-                    readonly_user=sql.Identifier(self.config.readonly_user)
-                )
-            )
-            logger.info(f"Granted read-only permissions to {self.config.readonly_user}")
-            
-            # Grant read-write permissions
-            self.cursor.execute(
-                sql.SQL(readwrite_grants).format(
+                sql.SQL(readonly_grants + "\n" + readwrite_grants).format(
                     database=sql.Identifier(self.config.database),
+                    readonly_user=sql.Identifier(self.config.readonly_user),
                     readwrite_user=sql.Identifier(self.config.readwrite_user)
                 )
             )
+            logger.info(f"Granted read-only permissions to {self.config.readonly_user}")
             logger.info(f"Granted read-write permissions to {self.config.readwrite_user}")
             
             self.conn.commit()
@@ -880,11 +1226,8 @@ class DatabaseLayer:
         # Step 2: Connect to new database
         self.connect(as_admin=True)
         
-        # Step 3: Create schema with all constraints
-        self.create_schema()
-        
-        # Step 4: Create update timestamp triggers
-        self.create_update_timestamp_trigger()
+        # Steps 3-4: Create schema with all constraints and update timestamp triggers
+        self.bootstrap_schema()
         
         # Step 5: Create performance indexes
         self.create_indexes()
@@ -909,61 +1252,78 @@ class DatabaseLayer:
             'constraints': []
         }
         
-        # Get table information
-        self.cursor.execute("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_type = 'BASE TABLE'
-            ORDER BY table_name
-        """)
-        
-        for (table_name,) in self.cursor.fetchall():
-            # Get column information
-            self.cursor.execute("""
+        with self.pooled_cursor() as cursor:
+            # Get table and column information in one pass straight from pg_catalog;
+            # the LEFT JOIN keeps tables that have no columns. Types and nullability
+            # are rendered as information_schema.columns does (data_type: domains
+            # as their base type, 'ARRAY', 'USER-DEFINED'), and relkind 'r'/'p' is
+            # its 'BASE TABLE', so the output matches the information_schema queries
+            cursor.execute("""
                 SELECT 
-                    column_name,
-                    data_type,
-                    is_nullable,
-                    column_default
-                FROM information_schema.columns
-                WHERE table_schema = 'public'
-                AND table_name = %s
-                ORDER BY ordinal_position
-            """, (table_name,))
+                    c.relname,
+                    a.attname,
+                    CASE
+                        WHEN COALESCE(bt.typelem, t.typelem) <> 0
+                            AND COALESCE(bt.typlen, t.typlen) = -1 THEN 'ARRAY'
+                        WHEN COALESCE(nbt.nspname, nt.nspname) = 'pg_catalog'
+                            THEN format_type(COALESCE(bt.oid, t.oid), NULL)
+                        ELSE 'USER-DEFINED'
+                    END,
+                    NOT (a.attnotnull OR (t.typtype = 'd' AND t.typnotnull)),
+                    pg_get_expr(d.adbin, d.adrelid)
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                LEFT JOIN pg_attribute a
+                    ON a.attrelid = c.oid
+                    AND a.attnum > 0
+                    AND NOT a.attisdropped
+                LEFT JOIN pg_type t ON t.oid = a.atttypid
+                LEFT JOIN pg_namespace nt ON nt.oid = t.typnamespace
+                LEFT JOIN pg_type bt
+                    ON t.typtype = 'd'
+                    AND bt.oid = t.typbasetype
+                LEFT JOIN pg_namespace nbt ON nbt.oid = bt.typnamespace
+                LEFT JOIN pg_attrdef d
+                    ON d.adrelid = c.oid
+                    AND d.adnum = a.attnum
+                    AND a.attgenerated = ''
+                WHERE n.nspname = 'public'
+                AND c.relkind IN ('r', 'p')
+                ORDER BY c.relname, a.attnum
+            """)
             
-            info['tables'][table_name] = {
-                'columns': [
-                    {
-                        'name': col[0],
-                        'type': col[1],
-                        'nullable': col[2] == 'YES',
-                        'default': col[3]
-                    }
-                    for col in self.cursor.fetchall()
-                ]
-            }
-        
-        # Get index information
-        self.cursor.execute("""
-            SELECT
-                schemaname,
-                tablename,
-                indexname,
-                indexdef
-            FROM pg_indexes
-            WHERE schemaname = 'public'
-            ORDER BY tablename, indexname
-        """)
-        
-        info['indexes'] = [
-            {
-                'table': row[1],
-                'name': row[2],
-                'definition': row[3]
-            }
-            for row in self.cursor.fetchall()
-        ]
+            for table_name, column_name, data_type, nullable, column_default in cursor.fetchall():
+                columns = info['tables'].setdefault(table_name, {'columns': []})['columns']
+                if column_name is not None:
+                    columns.append({
+                        'name': column_name,
+                        'type': data_type,
+                        'nullable': nullable,
+                        'default': column_default
+                    })
+            
+            # Get index information
+            cursor.execute("""
+                SELECT
+                    t.relname,
+                    i.relname,
+                    pg_get_indexdef(i.oid)
+                FROM pg_index x
+                JOIN pg_class i ON i.oid = x.indexrelid
+                JOIN pg_class t ON t.oid = x.indrelid
+                JOIN pg_namespace n ON n.oid = t.relnamespace
+                WHERE n.nspname = 'public'
+                ORDER BY t.relname, i.relname
+            """)
+            
+            info['indexes'] = [
+                {
+                    'table': row[0],
+                    'name': row[1],
+                    'definition': row[2]
+                }
+                for row in cursor.fetchall()
+            ]
         
         return info
     
@@ -974,62 +1334,73 @@ class DatabaseLayer:
         """
         issues = []
         
-        # Check 1: All tables have primary keys
-        self.cursor.execute("""
-            SELECT t.table_name
-            FROM information_schema.tables t
-            LEFT JOIN information_schema.table_constraints tc
-                ON t.table_name = tc.table_name
-                AND tc.constraint_type = 'PRIMARY KEY'
-            WHERE t.table_schema = 'public'
-                AND t.table_type = 'BASE TABLE'
-                AND tc.constraint_name IS NULL
-        """)
+        with self.pooled_cursor() as cursor:
+            # All four checks run as one catalog query: one round-trip, and the
+            # public tables are resolved once for both table-level checks
+            cursor.execute("""
+                WITH public_tables AS (
+                    SELECT c.oid, c.relname
+                    FROM pg_class c
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE c.relkind = 'r'
+                        AND n.nspname = 'public'
+                ),
+                missing_pk AS (
+                    SELECT t.relname
+                    FROM public_tables t
+                    LEFT JOIN pg_index i
+                        ON i.indrelid = t.oid
+                        AND i.indisprimary
+                    WHERE i.indrelid IS NULL
+                ),
+                missing_timestamps AS (
+                    SELECT t.relname
+                    FROM public_tables t
+                    WHERE (
+                        SELECT COUNT(*)
+                        FROM pg_attribute a
+                        WHERE a.attrelid = t.oid
+                            AND a.attname IN ('created_at', 'updated_at')
+                            AND NOT a.attisdropped
+                    ) < 2
+                ),
+                foreign_keys AS (
+                    SELECT COUNT(*) AS fk_count
+                    FROM pg_constraint con
+                    JOIN pg_namespace n ON n.oid = con.connamespace
+                    WHERE con.contype = 'f'
+                        AND n.nspname = 'public'
+                ),
+                secondary_indexes AS (
+                    SELECT COUNT(*) AS index_count
+                    FROM pg_index x
+                    JOIN pg_class t ON t.oid = x.indrelid
+                    JOIN pg_namespace n ON n.oid = t.relnamespace
+                    WHERE n.nspname = 'public'
+                        AND NOT x.indisprimary
+                )
+                SELECT
+                    (SELECT array_agg(relname::text ORDER BY relname) FROM missing_pk),
+                    (SELECT array_agg(relname::text ORDER BY relname) FROM missing_timestamps),
+                    (SELECT fk_count FROM foreign_keys),
+                    (SELECT index_count FROM secondary_indexes)
+            """)
+            
+            tables_without_pk, tables_without_timestamps, fk_count, index_count = cursor.fetchone()
         
-        tables_without_pk = [row[0] for row in self.cursor.fetchall()]
+        # Check 1: All tables have primary keys
         if tables_without_pk:
             issues.append(f"Tables without primary keys: {', '.join(tables_without_pk)}")
         
         # Check 2: Audit timestamps exist
-        self.cursor.execute("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-                AND table_type = 'BASE TABLE'
-                AND table_name NOT IN (
-                    SELECT table_name
-                    FROM information_schema.columns
-                    WHERE column_name IN ('created_at', 'updated_at')
-                    GROUP BY table_name
-                    HAVING COUNT(*) = 2
-                )
-        """)
-        
-        tables_without_timestamps = [row[0] for row in self.cursor.fetchall()]
         if tables_without_timestamps:
             issues.append(f"Tables without audit timestamps: {', '.join(tables_without_timestamps)}")
         
         # Check 3: Foreign keys exist
-        self.cursor.execute("""
-            SELECT COUNT(*)
-            FROM information_schema.table_constraints
-            WHERE constraint_type = 'FOREIGN KEY'
-                AND table_schema = 'public'
-        """)
-        
-        fk_count = self.cursor.fetchone()[0]
         if fk_count == 0:
             issues.append("No foreign key constraints found")
         
         # Check 4: Indexes exist
-        self.cursor.execute("""
-            SELECT COUNT(*)
-            FROM pg_indexes
-            WHERE schemaname = 'public'
-                AND indexname NOT LIKE '%_pkey'
-        """)
-        
-        index_count = self.cursor.fetchone()[0]
         if index_count == 0:
             issues.append("No performance indexes found (excluding primary keys)")
         
@@ -5,10 +5,49 @@ Performance Monitor - Tracks and analyzes system performance
 import time
 import sqlite3
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import atexit
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+import numpy as np
+
+# orjson is a faster drop-in for metadata (de)serialization when installed
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# msgpack stores metadata as a compact BLOB when installed; JSON text otherwise
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def _pack_metadata(metadata: Dict[str, Any]) -> Any:
+    """Serialize metadata for the metadata column"""
+    if msgpack is not None:
+        return msgpack.packb(metadata, use_bin_type=True)
+    return _json_dumps(metadata)
+
+
+def _unpack_metadata(value: Any) -> Dict[str, Any]:
+    """Deserialize a metadata column value (msgpack BLOB or legacy JSON text)"""
+    if isinstance(value, bytes):
+        return msgpack.unpackb(value, raw=False, strict_map_key=False)
+    return _json_loads(value)
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,26 +65,66 @@ class PerformanceMonitor:
     Monitors and tracks system performance metrics
     """
     
-    def __init__(self, db_path: str = "data/performance_monitor.db"):
+    # Shared statement text so sqlite3's statement cache reuses one compiled INSERT
+    _INSERT_METRIC_SQL = """
+        INSERT INTO performance_metrics
+        (timestamp, metric_name, metric_value, metadata)
+        VALUES (?, ?, ?, ?)
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "data/performance_monitor.db",
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+        dashboard_ttl: float = 5.0
+    ):
         """
         Initialize performance monitor
         
         Args:
             db_path: Path to SQLite database for metrics storage
+            flush_size: Buffered metrics that trigger an immediate batch insert
+            flush_interval: Seconds between background flushes of the buffer
+            dashboard_ttl: Seconds a computed dashboard snapshot is reused
         """
         self.db_path = db_path
         self.logger = logging.getLogger(f"{__name__}.PerformanceMonitor")
         self.active_timers: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._buffer: List[Tuple] = []
+        self._flush_size = flush_size
+        self._dashboard_ttl = dashboard_ttl
+        self._dash_cache: Optional[Tuple[float, Dict[str, Any]]] = None
         
         # Initialize database
         self._init_db()
         
+        # Background flusher so buffered metrics reach disk within flush_interval
+        self._stop_flush = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_periodically, args=(flush_interval,), daemon=True
+        )
+        self._flush_thread.start()
+        atexit.register(self.close)
+        
         self.logger.info("Performance monitor initialized")
     
     def _init_db(self):
         """Initialize SQLite database for metrics storage"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # One long-lived autocommit connection; WAL lets dashboard reads
+        # run alongside metric writes without a per-call open/fsync
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=1024
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        cursor = self._conn.cursor()
         
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS performance_metrics (
@@ -53,7 +132,7 @@ class PerformanceMonitor:
                 timestamp REAL NOT NULL,
                 metric_name TEXT NOT NULL,
                 metric_value REAL NOT NULL,
-                metadata TEXT
+                metadata BLOB
             )
         """)
         
@@ -62,17 +141,51 @@ class PerformanceMonitor:
             ON performance_metrics(timestamp DESC)
         """)
         
+        # Matches the metric_name = ? AND timestamp > ? access pattern; carrying
+        # metric_value lets the statistics queries stay inside the index
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_metrics_name 
-            ON performance_metrics(metric_name)
+            CREATE INDEX IF NOT EXISTS idx_metrics_name_ts 
+            ON performance_metrics(metric_name, timestamp DESC, metric_value)
         """)
         
-        conn.commit()
-        conn.close()
+        # Superseded by idx_metrics_name_ts
+        cursor.execute("DROP INDEX IF EXISTS idx_metrics_name")
+    
+    def close(self):
+        """Flush buffered metrics and close the metrics database connection"""
+        # The exit hook holds a strong reference; drop it once closed explicitly
+        atexit.unregister(self.close)
+        self._stop_flush.set()
+        self._flush()
+        with self._lock:
+            self._conn.close()
+    
+    def _flush(self):
+        """Write buffered metrics to the database in a single transaction"""
+        with self._lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(self._INSERT_METRIC_SQL, batch)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def _flush_periodically(self, interval: float):
+        """Background loop flushing the metric buffer every interval seconds"""
+        while not self._stop_flush.wait(interval):
+            try:
+                self._flush()
+            except Exception as e:
+                self.logger.error(f"Error flushing metrics: {e}")
     
     def start_timer(self, operation_name: str):
         """Start timing an operation"""
-        self.active_timers[operation_name] = time.time()
+        self.active_timers[operation_name] = time.perf_counter()
     
     def end_timer(self, operation_name: str, metadata: Optional[Dict] = None) -> float:
         """
@@ -90,7 +203,7 @@ class PerformanceMonitor:
             return 0.0
         
         start_time = self.active_timers.pop(operation_name)
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         
         self.record_metric(f"{operation_name}_time", elapsed, metadata)
         
@@ -111,22 +224,17 @@ class PerformanceMonitor:
             metadata: Additional metadata
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            import json
-            metadata_json = json.dumps(metadata) if metadata else None
+            metadata_blob = _pack_metadata(metadata) if metadata else None
             
-            cursor.execute("""
-                INSERT INTO performance_metrics
-                (timestamp, metric_name, metric_value, metadata)
-                VALUES (?, ?, ?, ?)
-            """, (time.time(), metric_name, metric_value, metadata_json))
+            with self._lock:
+                self._buffer.append((time.time(), metric_name, metric_value, metadata_blob))
+                flush_due = len(self._buffer) >= self._flush_size
             
-            conn.commit()
-            conn.close()
+            if flush_due:
+                self._flush()
             
-            self.logger.debug(f"Recorded metric: {metric_name} = {metric_value}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Recorded metric: %s = %s", metric_name, metric_value)
             
         except Exception as e:
             self.logger.error(f"Error recording metric: {e}")
@@ -147,30 +255,28 @@ class PerformanceMonitor:
             List of PerformanceMetric objects
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             cutoff_time = time.time() - (hours * 3600)
             
-            if metric_name:
-                cursor.execute("""
-                    SELECT timestamp, metric_name, metric_value, metadata
-                    FROM performance_metrics
-                    WHERE metric_name = ? AND timestamp > ?
-                    ORDER BY timestamp DESC
-                """, (metric_name, cutoff_time))
-            else:
-                cursor.execute("""
-                    SELECT timestamp, metric_name, metric_value, metadata
-                    FROM performance_metrics
-                    WHERE timestamp > ?
-                    ORDER BY timestamp DESC
-                """, (cutoff_time,))
+            self._flush()
+            with self._lock:
+                if metric_name:
+                    rows = self._conn.execute("""
+                        SELECT timestamp, metric_name, metric_value, metadata
+                        FROM performance_metrics
+                        WHERE metric_name = ? AND timestamp > ?
+                        ORDER BY timestamp DESC
+                    """, (metric_name, cutoff_time)).fetchall()
+                else:
+                    rows = self._conn.execute("""
+                        SELECT timestamp, metric_name, metric_value, metadata
+                        FROM performance_metrics
+                        WHERE timestamp > ?
+                        ORDER BY timestamp DESC
+                    """, (cutoff_time,)).fetchall()
             
-            import json
             metrics = []
-            for row in cursor.fetchall():
-                metadata = json.loads(row[3]) if row[3] else None
+            for row in rows:
+                metadata = _unpack_metadata(row[3]) if row[3] else None
                 metrics.append(PerformanceMetric(
                     timestamp=row[0],
                     metric_name=row[1],
@@ -178,13 +284,40 @@ class PerformanceMonitor:
                     metadata=metadata
                 ))
             
-            conn.close()
             return metrics
             
         except Exception as e:
             self.logger.error(f"Error retrieving metrics: {e}")
             return []
     
+    def get_values_ndarray(self, metric_name: str, hours: int = 24) -> np.ndarray:
+        """
+        Get raw metric values as a float64 array for vectorized analysis
+        
+        Args:
+            metric_name: Name of the metric
+            hours: Number of hours to look back
+            
+        Returns:
+            1-D NumPy array of metric values (empty on error)
+        """
+        try:
+            cutoff_time = time.time() - (hours * 3600)
+            
+            self._flush()
+            with self._lock:
+                cursor = self._conn.execute("""
+                    SELECT metric_value
+                    FROM performance_metrics
+                    WHERE metric_name = ? AND timestamp > ?
+                """, (metric_name, cutoff_time))
+                
+                return np.fromiter((row[0] for row in cursor), dtype=np.float64)
+            
+        except Exception as e:
+            self.logger.error(f"Error retrieving metric values: {e}")
+            return np.empty(0, dtype=np.float64)
+    
     def get_statistics(self, metric_name: str, hours: int = 24) -> Dict[str, float]:
         """
         Get statistical summary of a metric
@@ -197,46 +330,54 @@ class PerformanceMonitor:
             Dictionary with statistical measures
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             cutoff_time = time.time() - (hours * 3600)
             
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as count,
-                    AVG(metric_value) as avg,
-                    MIN(metric_value) as min,
-                    MAX(metric_value) as max
-                FROM performance_metrics
-                WHERE metric_name = ? AND timestamp > ?
-            """, (metric_name, cutoff_time))
-            
-            row = cursor.fetchone()
-            
-            # Calculate percentiles
-            cursor.execute("""
-                SELECT metric_value
-                FROM performance_metrics
-                WHERE metric_name = ? AND timestamp > ?
-                ORDER BY metric_value
-            """, (metric_name, cutoff_time))
-            
-            values = [r[0] for r in cursor.fetchall()]
-            
-            conn.close()
+            self._flush()
+            with self._lock:
+                row = self._conn.execute("""
+                    SELECT 
+                        COUNT(*) as count,
+                        AVG(metric_value) as avg,
+                        MIN(metric_value) as min,
+                        MAX(metric_value) as max
+                    FROM performance_metrics
+                    WHERE metric_name = ? AND timestamp > ?
+                """, (metric_name, cutoff_time)).fetchone()
+                
+                count = row[0]
+                
+                # Calculate percentiles in SQLite: one indexed row per OFFSET
+                # instead of pulling every value across into Python
+                percentiles = None
+                if count:
+                    percentiles = self._conn.execute("""
+                        SELECT
+                            (SELECT metric_value FROM performance_metrics
+                             WHERE metric_name = :name AND timestamp > :cutoff
+                             ORDER BY metric_value LIMIT 1 OFFSET :p50),
+                            (SELECT metric_value FROM performance_metrics
+                             WHERE metric_name = :name AND timestamp > :cutoff
+                             ORDER BY metric_value LIMIT 1 OFFSET :p95),
+                            (SELECT metric_value FROM performance_metrics
+                             WHERE metric_name = :name AND timestamp > :cutoff
+                             ORDER BY metric_value LIMIT 1 OFFSET :p99)
+                    """, {
+                        'name': metric_name,
+                        'cutoff': cutoff_time,
+                        'p50': count // 2,
+                        'p95': int(count * 0.95),
+                        'p99': int(count * 0.99)
+                    }).fetchone()
             
             stats = {
-                'count': row[0],
+                'count': count,
                 'average': row[1] or 0,
                 'minimum': row[2] or 0,
                 'maximum': row[3] or 0
             }
             
-            if values:
-                stats['median'] = values[len(values) // 2]
-                stats['p95'] = values[int(len(values) * 0.95)] if len(values) > 1 else values[0]
-                stats['p99'] = values[int(len(values) * 0.99)] if len(values) > 1 else values[0]
+            if percentiles:
+                stats['median'], stats['p95'], stats['p99'] = percentiles
             
             return stats
             
@@ -246,61 +387,62 @@ class PerformanceMonitor:
     
     def get_dashboard_data(self) -> Dict[str, Any]:
         """Get comprehensive dashboard data"""
+        # Dashboards poll far more often than the 24h aggregates change
+        cached = self._dash_cache
+        if cached and time.monotonic() - cached[0] < self._dashboard_ttl:
+            return dict(cached[1])
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Get recent query metrics
             query_stats = self.get_statistics('query_execution_time', hours=24)
             
-            # Get cache hit rate
-            cursor.execute("""
-                SELECT metric_value
-                FROM performance_metrics
-                WHERE metric_name = 'cache_hit_rate'
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """)
-            cache_hit_rate = cursor.fetchone()
-            cache_hit_rate = cache_hit_rate[0] if cache_hit_rate else 0
-            
-            # Get error rate
-            cutoff_time = time.time() - (24 * 3600)
-            cursor.execute("""
-                SELECT COUNT(*)
-                FROM performance_metrics
-                WHERE metric_name = 'query_error' AND timestamp > ?
-            """, (cutoff_time,))
-            error_count = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                SELECT COUNT(*)
-                FROM performance_metrics
-                WHERE metric_name = 'query_success' AND timestamp > ?
-            """, (cutoff_time,))
-            success_count = cursor.fetchone()[0]
+            self._flush()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                # Get cache hit rate
+                cursor.execute("""
+                    SELECT metric_value
+                    FROM performance_metrics
+                    WHERE metric_name = 'cache_hit_rate'
+                    ORDER BY timestamp DESC
+                    LIMIT 1
+                """)
+                cache_hit_rate = cursor.fetchone()
+                cache_hit_rate = cache_hit_rate[0] if cache_hit_rate else 0
+                
+                # Get error rate: both outcome counts from one scan of the window
+                cutoff_time = time.time() - (24 * 3600)
+                cursor.execute("""
+                    SELECT metric_name, COUNT(*)
+                    FROM performance_metrics
+                    WHERE metric_name IN ('query_error', 'query_success')
+                        AND timestamp > ?
+                    GROUP BY metric_name
+                """, (cutoff_time,))
+                outcome_counts = dict(cursor.fetchall())
+                error_count = outcome_counts.get('query_error', 0)
+                success_count = outcome_counts.get('query_success', 0)
+                
+                # Get most common metrics
+                cursor.execute("""
+                    SELECT metric_name, COUNT(*) as frequency
+                    FROM performance_metrics
+                    WHERE timestamp > ?
+                    GROUP BY metric_name
+                    ORDER BY frequency DESC
+                    LIMIT 10
+                """, (cutoff_time,))
+                
+                metric_frequencies = [
+                    {'metric': row[0], 'count': row[1]}
+                    for row in cursor.fetchall()
+                ]
             
             total_queries = error_count + success_count
             error_rate = (error_count / total_queries * 100) if total_queries > 0 else 0
             
-            # Get most common metrics
-            cursor.execute("""
-                SELECT metric_name, COUNT(*) as frequency
-                FROM performance_metrics
-                WHERE timestamp > ?
-                GROUP BY metric_name
-                ORDER BY frequency DESC
-                LIMIT 10
-            """, (cutoff_time,))
-            
-            metric_frequencies = [
-                {'metric': row[0], 'count': row[1]}
-                for row in cursor.fetchall()
-            ]
-            
-            conn.close()
-            
-            return {
+            data = {
                 'query_statistics': query_stats,
                 'cache_hit_rate': cache_hit_rate,
                 'error_rate': error_rate,
@@ -308,28 +450,42 @@ class PerformanceMonitor:
                 'metric_frequencies': metric_frequencies,
                 'timestamp': time.time()
             }
+            self._dash_cache = (time.monotonic(), data)
+            
+            return dict(data)
             
         except Exception as e:
             self.logger.error(f"Error getting dashboard data: {e}")
             return {}
     
-    def cleanup_old_metrics(self, days: int = 30):
-        """Remove metrics older than specified days"""
+    def cleanup_old_metrics(self, days: int = 30, batch_size: int = 10000):
+        """
+        Remove metrics older than specified days
+        
+        Rows are deleted in batches of batch_size, each its own transaction,
+        so metric writers and WAL checkpoints can interleave with the cleanup.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             cutoff_time = time.time() - (days * 24 * 3600)
             
-            cursor.execute("""
-                DELETE FROM performance_metrics
-                WHERE timestamp < ?
-            """, (cutoff_time,))
-            
-            deleted = cursor.rowcount
-            
-            conn.commit()
-            conn.close()
+            self._flush()
+            deleted = 0
+            while True:
+                with self._lock:
+                    cursor = self._conn.execute("""
+                        DELETE FROM performance_metrics
+                        WHERE id IN (
+                            SELECT id FROM performance_metrics
+                            WHERE timestamp < ?
+                            LIMIT ?
+                        )
+                    """, (cutoff_time, batch_size))
+                    deleted += cursor.rowcount
+                
+                if cursor.rowcount < batch_size:
+                    break
+                # Yield between batches so waiting writers get the lock
+                time.sleep(0)
             
             self.logger.info(f"Cleaned up {deleted} old metric entries")
             
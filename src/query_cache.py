@@ -4,23 +4,110 @@ Caches query results to improve performance and reduce API calls
 """
 
 import hashlib
+import heapq
+import atexit
+import itertools
 import json
 import time
 import sqlite3
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import logging
 
+
+def _json_default(obj: Any) -> Any:
+    """Serialize row sequences other than lists (e.g. the engine's ResultView)"""
+    if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes, bytearray)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# orjson is a faster drop-in for result (de)serialization when installed
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = partial(json.dumps, default=_json_default)
+    _json_loads = json.loads
+
+# zstandard compresses stored result sets (JSON shrinks several-fold) when installed
+try:
+    import zstandard
+    
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+    _ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+except ImportError:
+    zstandard = None
+
+# Every zstd frame starts with this magic number; JSON never does
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Raw results column values (BLOB or JSON text) as opposed to decoded rows
+_RAW_RESULT_TYPES = (bytes, bytearray, memoryview, str)
+
+
+def _pack_results(results: List[Dict[str, Any]]) -> Any:
+    """Serialize results for the results column"""
+    data = _json_dumps(results)
+    if zstandard is not None:
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return _ZSTD_COMPRESSOR.compress(data)
+    return data
+
+
+def _unpack_results(value: Any) -> List[Dict[str, Any]]:
+    """Deserialize a results column value (zstd BLOB or plain JSON)"""
+    if isinstance(value, (bytearray, memoryview)):
+        value = bytes(value)
+    if isinstance(value, bytes) and value.startswith(_ZSTD_MAGIC):
+        value = _ZSTD_DECOMPRESSOR.decompress(value)
+    return _json_loads(value)
+
+
 logger = logging.getLogger(__name__)
 
 
+class _LazyResults:
+    """
+    Descriptor for CacheEntry.results that accepts either decoded rows or the
+    raw results column value, decoding the latter only on first access (which
+    raises if the stored value is corrupt; see QueryCache._results_readable)
+    """
+    
+    def __set_name__(self, owner, name):
+        self._slot = f"_{name}"
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            # No dataclass default: the field stays a required argument
+            raise AttributeError(self._slot[1:])
+        value = obj.__dict__[self._slot]
+        if isinstance(value, _RAW_RESULT_TYPES):
+            value = _unpack_results(value)
+            obj.__dict__[self._slot] = value
+        return value
+    
+    def __set__(self, obj, value):
+        obj.__dict__[self._slot] = value
+
+
 @dataclass
 class CacheEntry:
     """Represents a cached query result"""
     query_hash: str
     natural_language: str
     generated_sql: str
-    results: List[Dict[str, Any]]
+    # Entries read from the database hold the stored bytes until first access
+    results: List[Dict[str, Any]] = _LazyResults()
     row_count: int
     execution_time: float
     timestamp: float
@@ -32,18 +119,33 @@ class QueryCache:
     In-memory and persistent cache for query results
     """
     
-    def __init__(self, db_path: str = "data/query_cache.db", ttl_seconds: int = 3600):
+    def __init__(
+        self,
+        db_path: str = "data/query_cache.db",
+        ttl_seconds: int = 3600,
+        max_memory_entries: int = 1000,
+        flush_interval: float = 5.0
+    ):
         """
         Initialize query cache
         
         Args:
             db_path: Path to SQLite database for persistent cache
             ttl_seconds: Time-to-live for cache entries (default 1 hour)
+            max_memory_entries: Memory cache size; least recently used entries are evicted
+            flush_interval: Seconds between background flushes of hit counts
         """
         self.db_path = db_path
         self.ttl_seconds = ttl_seconds
-        self.memory_cache: Dict[str, CacheEntry] = {}
+        self.max_memory_entries = max_memory_entries
+        # Ordered oldest -> most recently used for O(1) LRU eviction
+        self.memory_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        # (entry timestamp, query_hash) min-heap so expiry sweeps touch only expired entries
+        self._expiry_heap: List[Tuple[float, str]] = []
         self.logger = logging.getLogger(f"{__name__}.QueryCache")
+        self._lock = threading.RLock()
+        # Hit counts not yet written; hits never touch the database directly
+        self._pending_hits: Dict[str, int] = {}
         
         # Initialize database
         self._init_db()
@@ -51,19 +153,43 @@ class QueryCache:
         # Load recent entries into memory
         self._load_memory_cache()
         
+        # Hit counts are written behind the read path by a background flusher
+        self._stop_flush = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_periodically, args=(flush_interval,), daemon=True
+        )
+        self._flush_thread.start()
+        atexit.register(self.close)
+        
         self.logger.info(f"Query cache initialized (TTL: {ttl_seconds}s)")
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection performance pragmas applied"""
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        # WAL only needs an fsync at checkpoints with synchronous=NORMAL
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-20000")
+        return conn
+    
     def _init_db(self):
         """Initialize SQLite database for persistent cache"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # One long-lived autocommit connection shared by every cache operation
+        self._conn = self._connect()
+        cursor = self._conn.cursor()
+        
+        # WAL persists in the database file; readers no longer block writers
+        cursor.execute("PRAGMA journal_mode=WAL")
         
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS query_cache (
                 query_hash TEXT PRIMARY KEY,
                 natural_language TEXT NOT NULL,
                 generated_sql TEXT NOT NULL,
-                results TEXT NOT NULL,
+                results BLOB NOT NULL,
                 row_count INTEGER NOT NULL,
                 execution_time REAL NOT NULL,
                 timestamp REAL NOT NULL,
@@ -77,50 +203,103 @@ class QueryCache:
             ON query_cache(timestamp)
         """)
         
-        conn.commit()
-        conn.close()
+        # Lets the startup warm-up read entries already in ranking order
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cache_hits_ts
+            ON query_cache(hit_count DESC, timestamp DESC)
+        """)
+    
+    def close(self):
+        """Flush pending hit counts and close the cache database connection"""
+        # The exit hook holds a strong reference; drop it once closed explicitly
+        atexit.unregister(self.close)
+        self._stop_flush.set()
+        self._flush_hits()
+        with self._lock:
+            self._conn.close()
+    
+    def _flush_periodically(self, interval: float):
+        """Background loop flushing pending hit counts every interval seconds"""
+        while not self._stop_flush.wait(interval):
+            self._flush_hits()
     
     def _load_memory_cache(self, limit: int = 100):
         """Load recent cache entries into memory"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cutoff_time = time.time() - self.ttl_seconds
-            
-            cursor.execute("""
-                SELECT query_hash, natural_language, generated_sql, results,
-                       row_count, execution_time, timestamp, hit_count
-                FROM query_cache
-                WHERE timestamp > ?
-                ORDER BY hit_count DESC, timestamp DESC
-                LIMIT ?
-            """, (cutoff_time, limit))
-            
-            for row in cursor.fetchall():
-                entry = CacheEntry(
-                    query_hash=row[0],
-                    natural_language=row[1],
-                    generated_sql=row[2],
-                    results=json.loads(row[3]),
-                    row_count=row[4],
-                    execution_time=row[5],
-                    timestamp=row[6],
-                    hit_count=row[7]
-                )
-                self.memory_cache[entry.query_hash] = entry
-            
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cutoff_time = time.time() - self.ttl_seconds
+                
+                cursor.execute("""
+                    SELECT query_hash, natural_language, generated_sql, results,
+                           row_count, execution_time, timestamp, hit_count
+                    FROM query_cache
+                    WHERE timestamp > ?
+                    ORDER BY hit_count DESC, timestamp DESC
+                    LIMIT ?
+                """, (cutoff_time, limit))
+                
+                # Least valuable first so the most-hit entries end up most recently used
+                for row in reversed(cursor.fetchall()):
+                    entry = CacheEntry(
+                        query_hash=row[0],
+                        natural_language=row[1],
+                        generated_sql=row[2],
+                        results=row[3],
+                        row_count=row[4],
+                        execution_time=row[5],
+                        timestamp=row[6],
+                        hit_count=row[7]
+                    )
+                    self._remember(entry)
+                
             self.logger.info(f"Loaded {len(self.memory_cache)} entries into memory cache")
             
         except Exception as e:
             self.logger.error(f"Error loading memory cache: {e}")
     
+    def _remember(self, entry: CacheEntry):
+        """
+        Insert an entry into the memory cache as most recently used, evicting
+        LRU entries (caller holds self._lock)
+        """
+        previous = self.memory_cache.get(entry.query_hash)
+        self.memory_cache[entry.query_hash] = entry
+        self.memory_cache.move_to_end(entry.query_hash)
+        if previous is None or previous.timestamp != entry.timestamp:
+            heapq.heappush(self._expiry_heap, (entry.timestamp, entry.query_hash))
+        
+        while len(self.memory_cache) > self.max_memory_entries:
+            self._evict_one()
+        
+        # Evicted and re-put entries leave stale heap items behind; rebuild
+        # the heap from the live entries once they make up most of it
+        if len(self._expiry_heap) > 2 * max(len(self.memory_cache), 64):
+            self._expiry_heap = [
+                (cached.timestamp, query_hash)
+                for query_hash, cached in self.memory_cache.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+    
+    def _evict_one(self):
+        """
+        Evict one memory entry (v-LRU): among the least recently used 10%,
+        drop the one with the fewest hits so frequently repeated queries stay resident
+        """
+        sample_size = max(1, len(self.memory_cache) // 10)
+        candidates = itertools.islice(self.memory_cache.values(), sample_size)
+        # min() keeps the first (least recent) entry among equal hit counts
+        victim = min(candidates, key=lambda entry: entry.hit_count)
+        del self.memory_cache[victim.query_hash]
+    
     def _generate_hash(self, natural_language: str) -> str:
         """Generate hash for a natural language query"""
-        # Normalize query (lowercase, strip whitespace)
-        normalized = ' '.join(natural_language.lower().strip().split())
-        return hashlib.md5(normalized.encode()).hexdigest()
+        # Normalize query (lowercase, collapse whitespace); split() already
+        # drops leading/trailing whitespace, so no separate strip() pass
+        normalized = ' '.join(natural_language.lower().split())
+        # A cache key needs speed, not collision resistance against attackers
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
     
     def get(self, natural_language: str) -> Optional[CacheEntry]:
         """
@@ -133,44 +312,60 @@ class QueryCache:
             CacheEntry if found and not expired, None otherwise
         """
         query_hash = self._generate_hash(natural_language)
+        # Read the clock once; both lookup paths compare against the same cutoff
+        cutoff_time = time.time() - self.ttl_seconds
         
-        # Check memory cache first
-        if query_hash in self.memory_cache:
-            entry = self.memory_cache[query_hash]
-            
-            # Check if expired
-            if time.time() - entry.timestamp > self.ttl_seconds:
-                self.logger.info(f"Cache entry expired: {query_hash}")
-                del self.memory_cache[query_hash]
-                self._delete_from_db(query_hash)
-                return None
-            
-            # Increment hit count
-            entry.hit_count += 1
-            self._update_hit_count(query_hash, entry.hit_count)
-            
-            self.logger.info(f"Cache hit: {query_hash} (hits: {entry.hit_count})")
-            return entry
-        
-        # Check database
-        entry = self._get_from_db(query_hash)
-        if entry:
-            # Check if expired
-            if time.time() - entry.timestamp > self.ttl_seconds:
-                self.logger.info(f"Cache entry expired: {query_hash}")
-                self._delete_from_db(query_hash)
-                return None
-            
-            # Add to memory cache
-            entry.hit_count += 1
-            self.memory_cache[query_hash] = entry
-            self._update_hit_count(query_hash, entry.hit_count)
-            
-            self.logger.info(f"Cache hit (from DB): {query_hash} (hits: {entry.hit_count})")
-            return entry
-        
-        self.logger.info(f"Cache miss: {query_hash}")
-        return None
+        # Memory cache and expiry heap are shared with the flush thread and
+        # concurrent callers
+        with self._lock:
+            # Check memory cache first
+            if query_hash in self.memory_cache:
+                entry = self.memory_cache[query_hash]
+                
+                # Check if expired (or, for entries warmed from the database,
+                # stored results that no longer decode)
+                if entry.timestamp < cutoff_time or not self._results_readable(entry):
+                    self.logger.info(f"Cache entry expired: {query_hash}")
+                    del self.memory_cache[query_hash]
+                    self._delete_from_db(query_hash)
+                    return None
+                
+                # Increment hit count
+                entry.hit_count += 1
+                self.memory_cache.move_to_end(query_hash)
+                self._update_hit_count(query_hash, entry.hit_count)
+                
+                self.logger.info(f"Cache hit: {query_hash} (hits: {entry.hit_count})")
+                return entry
+            
+            # Check database
+            entry = self._get_from_db(query_hash)
+            if entry:
+                # Check if expired
+                if entry.timestamp < cutoff_time:
+                    self.logger.info(f"Cache entry expired: {query_hash}")
+                    self._delete_from_db(query_hash)
+                    return None
+                
+                # Add to memory cache
+                entry.hit_count += 1
+                self._remember(entry)
+                self._update_hit_count(query_hash, entry.hit_count)
+                
+                self.logger.info(f"Cache hit (from DB): {query_hash} (hits: {entry.hit_count})")
+                return entry
+            
+            self.logger.info(f"Cache miss: {query_hash}")
+            return None
+    
+    def _results_readable(self, entry: CacheEntry) -> bool:
+        """Decode an entry's lazily stored results now; False when they are corrupt"""
+        try:
+            entry.results
+            return True
+        except Exception as e:
+            self.logger.error(f"Error decoding cached results for {entry.query_hash}: {e}")
+            return False
     
     def put(
         self,
@@ -202,7 +397,8 @@ class QueryCache:
         )
         
         # Store in memory
-        self.memory_cache[query_hash] = entry
+        with self._lock:
+            self._remember(entry)
         
         # Store in database
         self._put_to_db(entry)
@@ -212,25 +408,25 @@ class QueryCache:
     def _get_from_db(self, query_hash: str) -> Optional[CacheEntry]:
         """Retrieve entry from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT query_hash, natural_language, generated_sql, results,
-                       row_count, execution_time, timestamp, hit_count
-                FROM query_cache
-                WHERE query_hash = ?
-            """, (query_hash,))
-            
-            row = cursor.fetchone()
-            conn.close()
-            
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("""
+                    SELECT query_hash, natural_language, generated_sql, results,
+                           row_count, execution_time, timestamp, hit_count
+                    FROM query_cache
+                    WHERE query_hash = ?
+                """, (query_hash,))
+                
+                row = cursor.fetchone()
+            
+            # Decoded here, so an undecodable row is a miss like any read error
             if row:
                 return CacheEntry(
                     query_hash=row[0],
                     natural_language=row[1],
                     generated_sql=row[2],
-                    results=json.loads(row[3]),
+                    results=_unpack_results(row[3]),
                     row_count=row[4],
                     execution_time=row[5],
                     timestamp=row[6],
@@ -246,45 +442,64 @@ class QueryCache:
     def _put_to_db(self, entry: CacheEntry):
         """Store entry in database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO query_cache
-                (query_hash, natural_language, generated_sql, results,
-                 row_count, execution_time, timestamp, hit_count)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                entry.query_hash,
-                entry.natural_language,
-                entry.generated_sql,
-                json.dumps(entry.results),
-                entry.row_count,
-                entry.execution_time,
-                entry.timestamp,
-                entry.hit_count
-            ))
-            
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self._pending_hits.pop(entry.query_hash, None)
+                cursor = self._conn.cursor()
+                
+                # UPSERT updates the existing row in place instead of the
+                # DELETE + INSERT (and index churn) of INSERT OR REPLACE
+                cursor.execute("""
+                    INSERT INTO query_cache
+                    (query_hash, natural_language, generated_sql, results,
+                     row_count, execution_time, timestamp, hit_count)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(query_hash) DO UPDATE SET
+                        natural_language = excluded.natural_language,
+                        generated_sql = excluded.generated_sql,
+                        results = excluded.results,
+                        row_count = excluded.row_count,
+                        execution_time = excluded.execution_time,
+                        timestamp = excluded.timestamp,
+                        hit_count = excluded.hit_count
+                """, (
+                    entry.query_hash,
+                    entry.natural_language,
+                    entry.generated_sql,
+                    _pack_results(entry.results),
+                    entry.row_count,
+                    entry.execution_time,
+                    entry.timestamp,
+                    entry.hit_count
+                ))
             
         except Exception as e:
             self.logger.error(f"Error writing to cache DB: {e}")
     
     def _update_hit_count(self, query_hash: str, hit_count: int):
-        """Update hit count in database"""
+        """Queue a hit count update; written by the background flush or at exit"""
+        with self._lock:
+            self._pending_hits[query_hash] = hit_count
+    
+    def _flush_hits(self):
+        """Write all pending hit counts in a single transaction"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE query_cache
-                SET hit_count = ?
-                WHERE query_hash = ?
-            """, (hit_count, query_hash))
-            
-            conn.commit()
-            conn.close()
+            with self._lock:
+                if not self._pending_hits:
+                    return
+                updates = [(count, query_hash) for query_hash, count in self._pending_hits.items()]
+                self._pending_hits.clear()
+                
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany("""
+                        UPDATE query_cache
+                        SET hit_count = ?
+                        WHERE query_hash = ?
+                    """, updates)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
             
         except Exception as e:
             self.logger.error(f"Error updating hit count: {e}")
@@ -292,13 +507,11 @@ class QueryCache:
     def _delete_from_db(self, query_hash: str):
         """Delete entry from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM query_cache WHERE query_hash = ?", (query_hash,))
-            
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self._pending_hits.pop(query_hash, None)
+                cursor = self._conn.cursor()
+                
+                cursor.execute("DELETE FROM query_cache WHERE query_hash = ?", (query_hash,))
             
         except Exception as e:
             self.logger.error(f"Error deleting from cache DB: {e}")
@@ -307,45 +520,53 @@ class QueryCache:
         """Remove expired entries from cache"""
         cutoff_time = time.time() - self.ttl_seconds
         
-        # Clean memory cache
-        expired_keys = [
-            k for k, v in self.memory_cache.items()
-            if v.timestamp < cutoff_time
-        ]
-        for key in expired_keys:
-            del self.memory_cache[key]
+        # Clean memory cache: pop only the expired heap entries; skip stale
+        # heap items for entries since re-put or evicted
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] < cutoff_time:
+                timestamp, query_hash = heapq.heappop(self._expiry_heap)
+                entry = self.memory_cache.get(query_hash)
+                if entry is not None and entry.timestamp == timestamp:
+                    del self.memory_cache[query_hash]
         
         # Clean database
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM query_cache WHERE timestamp < ?", (cutoff_time,))
-            deleted = cursor.rowcount
-            
-            conn.commit()
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("DELETE FROM query_cache WHERE timestamp < ?", (cutoff_time,))
+                deleted = cursor.rowcount
+                
+                if deleted:
+                    self._vacuum_if_sparse()
             
             self.logger.info(f"Cleaned up {deleted} expired cache entries")
             
         except Exception as e:
             self.logger.error(f"Error cleaning up cache: {e}")
     
+    def _vacuum_if_sparse(self, threshold: float = 0.1):
+        """VACUUM the cache database once free pages exceed threshold of its size"""
+        cursor = self._conn.cursor()
+        page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+        
+        if page_count and freelist_count > threshold * page_count:
+            cursor.execute("VACUUM")
+            self.logger.info(f"Vacuumed cache database ({freelist_count}/{page_count} pages free)")
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
+        self._flush_hits()
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*), SUM(hit_count) FROM query_cache")
-            row = cursor.fetchone()
-            total_entries = row[0] or 0
-            total_hits = row[1] or 0
-            
-            cursor.execute("SELECT AVG(execution_time) FROM query_cache")
-            avg_exec_time = cursor.fetchone()[0] or 0
-            
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("SELECT COUNT(*), SUM(hit_count), AVG(execution_time) FROM query_cache")
+                row = cursor.fetchone()
+                total_entries = row[0] or 0
+                total_hits = row[1] or 0
+                avg_exec_time = row[2] or 0
             
             return {
                 'total_entries': total_entries,
@@ -361,14 +582,16 @@ class QueryCache:
     
     def clear(self):
         """Clear all cache entries"""
-        self.memory_cache.clear()
-        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM query_cache")
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self.memory_cache.clear()
+                self._expiry_heap.clear()
+                self._pending_hits.clear()
+                cursor = self._conn.cursor()
+                # An unconditional DELETE takes SQLite's truncate path (drops
+                # whole b-tree pages, no per-row work); VACUUM returns the space
+                cursor.execute("DELETE FROM query_cache")
+                self._vacuum_if_sparse()
             
             self.logger.info("Cache cleared")
             
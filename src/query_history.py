@@ -3,15 +3,49 @@ Query History Tracking System
 Tracks all executed queries for learning and analysis
 """
 
+import re
+import atexit
 import sqlite3
+import threading
 import time
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Query-type keywords, in the priority order _extract_pattern applies them
+_PATTERN_KEYWORDS = (
+    ('COUNT_QUERY', ('how many', 'count', 'number of')),
+    ('LIST_QUERY', ('list', 'show', 'display', 'get')),
+    ('AVERAGE_QUERY', ('average', 'avg', 'mean')),
+    ('SUM_QUERY', ('total', 'sum')),
+    ('MAX_QUERY', ('max', 'maximum', 'highest', 'most')),
+    ('MIN_QUERY', ('min', 'minimum', 'lowest', 'least')),
+    ('TREND_QUERY', ('trend', 'over time', 'by month', 'by year')),
+    ('TOP_N_QUERY', ('top', 'best', 'highest ranked')),
+)
+_PATTERN_PRIORITY = {name: rank for rank, (name, _) in enumerate(_PATTERN_KEYWORDS)}
+
+# Zero-width lookahead so matches may overlap and every position is tried once;
+# at each position the alternation reports the highest-priority category
+_PATTERN_RE = re.compile('(?=' + '|'.join(
+    f"(?P<{name}>{'|'.join(map(re.escape, words))})" for name, words in _PATTERN_KEYWORDS
+) + ')')
+
+# pyahocorasick finds every keyword in one automaton pass when installed
+try:
+    import ahocorasick
+    
+    _PATTERN_AUTOMATON = ahocorasick.Automaton()
+    for _name, _words in _PATTERN_KEYWORDS:
+        for _word in _words:
+            _PATTERN_AUTOMATON.add_word(_word, _PATTERN_PRIORITY[_name])
+    _PATTERN_AUTOMATON.make_automaton()
+except ImportError:
+    _PATTERN_AUTOMATON = None
+
 
 @dataclass
 class QueryHistoryEntry:
@@ -33,25 +67,63 @@ class QueryHistory:
     Tracks query execution history for learning and analysis
     """
     
-    def __init__(self, db_path: str = "data/query_history.db"):
+    def __init__(
+        self,
+        db_path: str = "data/query_history.db",
+        flush_size: int = 100,
+        flush_interval: float = 5.0
+    ):
         """
         Initialize query history tracker
         
         Args:
             db_path: Path to SQLite database for history storage
+            flush_size: Pending pattern updates that trigger an immediate flush
+            flush_interval: Seconds between background flushes of pattern updates
         """
         self.db_path = db_path
         self.logger = logging.getLogger(f"{__name__}.QueryHistory")
+        self._lock = threading.RLock()
+        # pattern -> (executions, successes, total execution time) not yet written
+        self._pending_patterns: Dict[str, Tuple[int, int, float]] = {}
+        self._pending_count = 0
+        self._flush_size = flush_size
+        # Last get_statistics result; dropped whenever a new entry is added
+        self._stats_cache: Optional[Dict[str, Any]] = None
         
         # Initialize database
         self._init_db()
         
+        # Pattern statistics are written behind add_entry by a background flusher
+        self._stop_flush = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_periodically, args=(flush_interval,), daemon=True
+        )
+        self._flush_thread.start()
+        atexit.register(self.close)
+        
         self.logger.info("Query history tracker initialized")
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection performance pragmas applied"""
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        # WAL only needs an fsync at checkpoints with synchronous=NORMAL
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-20000")
+        return conn
+    
     def _init_db(self):
         """Initialize SQLite database for history storage"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # One long-lived autocommit connection shared by every history operation
+        self._conn = self._connect()
+        cursor = self._conn.cursor()
+        
+        # WAL persists in the database file; readers no longer block writers
+        cursor.execute("PRAGMA journal_mode=WAL")
         
         # Main history table
         cursor.execute("""
@@ -75,11 +147,65 @@ class QueryHistory:
             ON query_history(timestamp DESC)
         """)
         
+        # Success/failure listings filter and sort in one range scan
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_history_success_ts
+            ON query_history(execution_success, timestamp DESC)
+        """)
+        
+        # Covers every column get_statistics aggregates
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_history_stats
+            ON query_history(execution_success, execution_time, quality_score)
+        """)
+        
+        # Superseded by idx_history_success_ts and idx_history_stats
+        cursor.execute("DROP INDEX IF EXISTS idx_history_success")
+        cursor.execute("DROP INDEX IF EXISTS idx_history_success_time")
+        
+        # Full-text index over the questions for get_similar_queries;
+        # external content keeps the text stored only once in query_history
+        cursor.execute("""
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'table' AND name = 'query_history_fts'
+        """)
+        fts_exists = cursor.fetchone() is not None
+        
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_history_success 
-            ON query_history(execution_success)
+            CREATE VIRTUAL TABLE IF NOT EXISTS query_history_fts
+            USING fts5(natural_language, content='query_history', content_rowid='id')
         """)
         
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS query_history_fts_insert
+            AFTER INSERT ON query_history BEGIN
+                INSERT INTO query_history_fts(rowid, natural_language)
+                VALUES (new.id, new.natural_language);
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS query_history_fts_delete
+            AFTER DELETE ON query_history BEGIN
+                INSERT INTO query_history_fts(query_history_fts, rowid, natural_language)
+                VALUES ('delete', old.id, old.natural_language);
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS query_history_fts_update
+            AFTER UPDATE OF natural_language ON query_history BEGIN
+                INSERT INTO query_history_fts(query_history_fts, rowid, natural_language)
+                VALUES ('delete', old.id, old.natural_language);
+                INSERT INTO query_history_fts(rowid, natural_language)
+                VALUES (new.id, new.natural_language);
+            END
+        """)
+        
+        # Index history recorded before the full-text table existed
+        if not fts_exists:
+            cursor.execute("INSERT INTO query_history_fts(query_history_fts) VALUES ('rebuild')")
+        
         # Learning patterns table (for future ML features)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS query_patterns (
@@ -92,9 +218,20 @@ class QueryHistory:
                 UNIQUE(pattern)
             )
         """)
-        
-        conn.commit()
-        conn.close()
+    
+    def close(self):
+        """Flush pending pattern updates and close the history database connection"""
+        # The exit hook holds a strong reference; drop it once closed explicitly
+        atexit.unregister(self.close)
+        self._stop_flush.set()
+        self._flush_patterns()
+        with self._lock:
+            self._conn.close()
+    
+    def _flush_periodically(self, interval: float):
+        """Background loop flushing pending pattern updates every interval seconds"""
+        while not self._stop_flush.wait(interval):
+            self._flush_patterns()
     
     def add_entry(
         self,
@@ -122,29 +259,27 @@ class QueryHistory:
             ID of the created entry
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO query_history
-                (timestamp, natural_language, generated_sql, execution_success,
-                 row_count, execution_time, error_message, quality_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                time.time(),
-                natural_language,
-                generated_sql,
-                execution_success,
-                row_count,
-                execution_time,
-                error_message,
-                quality_score
-            ))
-            
-            entry_id = cursor.lastrowid
-            
-            conn.commit()
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("""
+                    INSERT INTO query_history
+                    (timestamp, natural_language, generated_sql, execution_success,
+                     row_count, execution_time, error_message, quality_score)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    time.time(),
+                    natural_language,
+                    generated_sql,
+                    execution_success,
+                    row_count,
+                    execution_time,
+                    error_message,
+                    quality_score
+                ))
+                
+                entry_id = cursor.lastrowid
+                self._stats_cache = None
             
             # Update learning patterns
             self._update_pattern(natural_language, execution_success, execution_time)
@@ -156,47 +291,115 @@ class QueryHistory:
             self.logger.error(f"Error adding history entry: {e}")
             return -1
     
-    def _update_pattern(self, natural_language: str, success: bool, exec_time: float):
-        """Update learning patterns based on query execution"""
-        try:
-            # Extract pattern (simplified - could use NLP techniques)
-            pattern = self._extract_pattern(natural_language)
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get existing pattern
-            cursor.execute("""
-                SELECT frequency, success_rate, avg_execution_time
-                FROM query_patterns
-                WHERE pattern = ?
-            """, (pattern,))
+    def add_entries(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Add many query executions to history in one transaction
+        
+        Args:
+            entries: Dicts with the add_entry arguments as keys, plus an optional
+                'timestamp' (defaults to now) for replaying recorded history
             
-            row = cursor.fetchone()
+        Returns:
+            Number of entries added (0 if the batch failed)
+        """
+        now = time.time()
+        rows = [
+            (
+                entry.get('timestamp', now),
+                entry['natural_language'],
+                entry['generated_sql'],
+                entry['execution_success'],
+                entry.get('row_count', 0),
+                entry.get('execution_time', 0.0),
+                entry.get('error_message'),
+                entry.get('quality_score')
+            )
+            for entry in entries
+        ]
+        if not rows:
+            return 0
+        
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany("""
+                        INSERT INTO query_history
+                        (timestamp, natural_language, generated_sql, execution_success,
+                         row_count, execution_time, error_message, quality_score)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, rows)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._stats_cache = None
+            
+            # Update learning patterns, merged in a single flush
+            for row in rows:
+                self._update_pattern(row[1], row[3], row[5])
+            self._flush_patterns()
+            
+            self.logger.info(f"Added {len(rows)} history entries")
+            return len(rows)
             
-            if row:
-                # Update existing pattern
-                freq, success_rate, avg_time = row
-                new_freq = freq + 1
-                new_success_rate = ((success_rate * freq) + (1 if success else 0)) / new_freq
-                new_avg_time = ((avg_time * freq) + exec_time) / new_freq
+        except Exception as e:
+            self.logger.error(f"Error adding history entries: {e}")
+            return 0
+    
+    def _update_pattern(self, natural_language: str, success: bool, exec_time: float):
+        """Queue a learning pattern update; merged in the next batched flush"""
+        # Extract pattern (simplified - could use NLP techniques)
+        pattern = self._extract_pattern(natural_language)
+        
+        with self._lock:
+            count, successes, total_time = self._pending_patterns.get(pattern, (0, 0, 0.0))
+            self._pending_patterns[pattern] = (
+                count + 1,
+                successes + (1 if success else 0),
+                total_time + exec_time
+            )
+            self._pending_count += 1
+            flush_due = self._pending_count >= self._flush_size
+        
+        if flush_due:
+            self._flush_patterns()
+    
+    def _flush_patterns(self):
+        """Merge all pending pattern updates into query_patterns in one transaction"""
+        try:
+            with self._lock:
+                if not self._pending_patterns:
+                    return
+                now = time.time()
+                rows = [
+                    (pattern, count, successes / count, total_time / count, now)
+                    for pattern, (count, successes, total_time) in self._pending_patterns.items()
+                ]
+                self._pending_patterns.clear()
+                self._pending_count = 0
                 
-                cursor.execute("""
-                    UPDATE query_patterns
-                    SET frequency = ?, success_rate = ?, avg_execution_time = ?,
-                        last_updated = ?
-                    WHERE pattern = ?
-                """, (new_freq, new_success_rate, new_avg_time, time.time(), pattern))
-            else:
-                # Insert new pattern
-                cursor.execute("""
-                    INSERT INTO query_patterns
-                    (pattern, frequency, success_rate, avg_execution_time, last_updated)
-                    VALUES (?, 1, ?, ?, ?)
-                """, (pattern, 1.0 if success else 0.0, exec_time, time.time()))
-            
-            conn.commit()
-            conn.close()
+                # UPSERT folds each batch's running averages into the stored ones
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany("""
+                        INSERT INTO query_patterns
+                        (pattern, frequency, success_rate, avg_execution_time, last_updated)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(pattern) DO UPDATE SET
+                            success_rate = (success_rate * frequency
+                                + excluded.success_rate * excluded.frequency)
+                                / (frequency + excluded.frequency),
+                            avg_execution_time = (avg_execution_time * frequency
+                                + excluded.avg_execution_time * excluded.frequency)
+                                / (frequency + excluded.frequency),
+                            frequency = frequency + excluded.frequency,
+                            last_updated = excluded.last_updated
+                    """, rows)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
             
         except Exception as e:
             self.logger.error(f"Error updating pattern: {e}")
@@ -208,59 +411,45 @@ class QueryHistory:
         """
         nl_lower = natural_language.lower()
         
-        # Identify query type
-        if any(word in nl_lower for word in ['how many', 'count', 'number of']):
-            pattern = 'COUNT_QUERY'
-        elif any(word in nl_lower for word in ['list', 'show', 'display', 'get']):
-            pattern = 'LIST_QUERY'
-        elif any(word in nl_lower for word in ['average', 'avg', 'mean']):
-            pattern = 'AVERAGE_QUERY'
-        elif any(word in nl_lower for word in ['total', 'sum']):
-            pattern = 'SUM_QUERY'
-        elif any(word in nl_lower for word in ['max', 'maximum', 'highest', 'most']):
-            pattern = 'MAX_QUERY'
-        elif any(word in nl_lower for word in ['min', 'minimum', 'lowest', 'least']):
-            pattern = 'MIN_QUERY'
-        elif any(word in nl_lower for word in ['trend', 'over time', 'by month', 'by year']):
-            pattern = 'TREND_QUERY'
-        elif any(word in nl_lower for word in ['top', 'best', 'highest ranked']):
-            pattern = 'TOP_N_QUERY'
-        else:
-            pattern = 'GENERAL_QUERY'
+        # Every category present in one pass; the first listed one wins
+        if _PATTERN_AUTOMATON is not None:
+            rank = min((rank for _, rank in _PATTERN_AUTOMATON.iter(nl_lower)), default=None)
+            return 'GENERAL_QUERY' if rank is None else _PATTERN_KEYWORDS[rank][0]
         
-        return pattern
+        found = {match.lastgroup for match in _PATTERN_RE.finditer(nl_lower)}
+        
+        return min(found, key=_PATTERN_PRIORITY.__getitem__, default='GENERAL_QUERY')
     
     def get_recent_queries(self, limit: int = 10) -> List[QueryHistoryEntry]:
         """Get recent query history"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT id, timestamp, natural_language, generated_sql,
-                       execution_success, row_count, execution_time,
-                       error_message, quality_score, user_feedback
-                FROM query_history
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
-            
-            entries = []
-            for row in cursor.fetchall():
-                entries.append(QueryHistoryEntry(
-                    id=row[0],
-                    timestamp=row[1],
-                    natural_language=row[2],
-                    generated_sql=row[3],
-                    execution_success=bool(row[4]),
-                    row_count=row[5],
-                    execution_time=row[6],
-                    error_message=row[7],
-                    quality_score=row[8],
-                    user_feedback=row[9]
-                ))
-            
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("""
+                    SELECT id, timestamp, natural_language, generated_sql,
+                           execution_success, row_count, execution_time,
+                           error_message, quality_score, user_feedback
+                    FROM query_history
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                """, (limit,))
+                
+                entries = []
+                for row in cursor.fetchall():
+                    entries.append(QueryHistoryEntry(
+                        id=row[0],
+                        timestamp=row[1],
+                        natural_language=row[2],
+                        generated_sql=row[3],
+                        execution_success=bool(row[4]),
+                        row_count=row[5],
+                        execution_time=row[6],
+                        error_message=row[7],
+                        quality_score=row[8],
+                        user_feedback=row[9]
+                    ))
+                
             return entries
             
         except Exception as e:
@@ -270,35 +459,34 @@ class QueryHistory:
     def get_successful_queries(self, limit: int = 10) -> List[QueryHistoryEntry]:
         """Get recent successful queries"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT id, timestamp, natural_language, generated_sql,
-                       execution_success, row_count, execution_time,
-                       error_message, quality_score, user_feedback
-                FROM query_history
-                WHERE execution_success = 1
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
-            
-            entries = []
-            for row in cursor.fetchall():
-                entries.append(QueryHistoryEntry(
-                    id=row[0],
-                    timestamp=row[1],
-                    natural_language=row[2],
-                    generated_sql=row[3],
-                    execution_success=True,
-                    row_count=row[5],
-                    execution_time=row[6],
-                    error_message=row[7],
-                    quality_score=row[8],
-                    user_feedback=row[9]
-                ))
-            
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("""
+                    SELECT id, timestamp, natural_language, generated_sql,
+                           execution_success, row_count, execution_time,
+                           error_message, quality_score, user_feedback
+                    FROM query_history
+                    WHERE execution_success = 1
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                """, (limit,))
+                
+                entries = []
+                for row in cursor.fetchall():
+                    entries.append(QueryHistoryEntry(
+                        id=row[0],
+                        timestamp=row[1],
+                        natural_language=row[2],
+                        generated_sql=row[3],
+                        execution_success=True,
+                        row_count=row[5],
+                        execution_time=row[6],
+                        error_message=row[7],
+                        quality_score=row[8],
+                        user_feedback=row[9]
+                    ))
+                
             return entries
             
         except Exception as e:
@@ -308,35 +496,34 @@ class QueryHistory:
     def get_failed_queries(self, limit: int = 10) -> List[QueryHistoryEntry]:
         """Get recent failed queries for debugging"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT id, timestamp, natural_language, generated_sql,
-                       execution_success, row_count, execution_time,
-                       error_message, quality_score, user_feedback
-                FROM query_history
-                WHERE execution_success = 0
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
-            
-            entries = []
-            for row in cursor.fetchall():
-                entries.append(QueryHistoryEntry(
-                    id=row[0],
-                    timestamp=row[1],
-                    natural_language=row[2],
-                    generated_sql=row[3],
-                    execution_success=False,
-                    row_count=row[5],
-                    execution_time=row[6],
-                    error_message=row[7],
-                    quality_score=row[8],
-                    user_feedback=row[9]
-                ))
-            
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("""
+                    SELECT id, timestamp, natural_language, generated_sql,
+                           execution_success, row_count, execution_time,
+                           error_message, quality_score, user_feedback
+                    FROM query_history
+                    WHERE execution_success = 0
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                """, (limit,))
+                
+                entries = []
+                for row in cursor.fetchall():
+                    entries.append(QueryHistoryEntry(
+                        id=row[0],
+                        timestamp=row[1],
+                        natural_language=row[2],
+                        generated_sql=row[3],
+                        execution_success=False,
+                        row_count=row[5],
+                        execution_time=row[6],
+                        error_message=row[7],
+                        quality_score=row[8],
+                        user_feedback=row[9]
+                    ))
+                
             return entries
             
         except Exception as e:
@@ -345,54 +532,56 @@ class QueryHistory:
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get query execution statistics"""
+        cached = self._stats_cache
+        if cached is not None:
+            return dict(cached)
+        
+        self._flush_patterns()
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Total queries
-            cursor.execute("SELECT COUNT(*) FROM query_history")
-            total_queries = cursor.fetchone()[0]
-            
-            # Success rate
-            cursor.execute("SELECT COUNT(*) FROM query_history WHERE execution_success = 1")
-            successful_queries = cursor.fetchone()[0]
-            success_rate = (successful_queries / total_queries * 100) if total_queries > 0 else 0
-            
-            # Average execution time
-            cursor.execute("SELECT AVG(execution_time) FROM query_history WHERE execution_success = 1")
-            avg_exec_time = cursor.fetchone()[0] or 0
-            
-            # Average quality score
-            cursor.execute("SELECT AVG(quality_score) FROM query_history WHERE quality_score IS NOT NULL")
-            avg_quality = cursor.fetchone()[0] or 0
-            
-            # Most common patterns
-            cursor.execute("""
-                SELECT pattern, frequency, success_rate
-                FROM query_patterns
-                ORDER BY frequency DESC
-                LIMIT 5
-            """)
-            common_patterns = [
-                {
-                    'pattern': row[0],
-                    'frequency': row[1],
-                    'success_rate': row[2] * 100
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                # Counts and averages in one pass over idx_history_stats
+                cursor.execute("""
+                    SELECT COUNT(*),
+                           COALESCE(SUM(execution_success), 0),
+                           AVG(CASE WHEN execution_success = 1 THEN execution_time END),
+                           AVG(quality_score)
+                    FROM query_history
+                """)
+                total_queries, successful_queries, avg_exec_time, avg_quality = cursor.fetchone()
+                success_rate = (successful_queries / total_queries * 100) if total_queries > 0 else 0
+                avg_exec_time = avg_exec_time or 0
+                avg_quality = avg_quality or 0
+                
+                # Most common patterns
+                cursor.execute("""
+                    SELECT pattern, frequency, success_rate
+                    FROM query_patterns
+                    ORDER BY frequency DESC
+                    LIMIT 5
+                """)
+                common_patterns = [
+                    {
+                        'pattern': row[0],
+                        'frequency': row[1],
+                        'success_rate': row[2] * 100
+                    }
+                    for row in cursor.fetchall()
+                ]
+                
+                stats = {
+                    'total_queries': total_queries,
+                    'successful_queries': successful_queries,
+                    'failed_queries': total_queries - successful_queries,
+                    'success_rate': success_rate,
+                    'avg_execution_time': avg_exec_time,
+                    'avg_quality_score': avg_quality,
+                    'common_patterns': common_patterns
                 }
-                for row in cursor.fetchall()
-            ]
-            
-            conn.close()
+                self._stats_cache = stats
             
-            return {
-                'total_queries': total_queries,
-                'successful_queries': successful_queries,
-                'failed_queries': total_queries - successful_queries,
-                'success_rate': success_rate,
-                'avg_execution_time': avg_exec_time,
-                'avg_quality_score': avg_quality,
-                'common_patterns': common_patterns
-            }
+            return dict(stats)
             
         except Exception as e:
             self.logger.error(f"Error getting statistics: {e}")
@@ -401,17 +590,14 @@ class QueryHistory:
     def add_user_feedback(self, entry_id: int, feedback: str):
         """Add user feedback to a query entry"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE query_history
-                SET user_feedback = ?
-                WHERE id = ?
-            """, (feedback, entry_id))
-            
-            conn.commit()
-            conn.close()
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("""
+                    UPDATE query_history
+                    SET user_feedback = ?
+                    WHERE id = ?
+                """, (feedback, entry_id))
             
             self.logger.info(f"Added feedback to entry {entry_id}")
             
@@ -420,34 +606,34 @@ class QueryHistory:
     
     def get_similar_queries(self, natural_language: str, limit: int = 5) -> List[QueryHistoryEntry]:
         """
-        Find similar successful queries (simple keyword matching)
+        Find similar successful queries (FTS5 keyword matching ranked by BM25)
         Could be enhanced with embeddings/semantic search
         """
         try:
-            # Extract keywords
+            # Extract keywords, quoted so FTS5 treats each as a plain term
             keywords = set(natural_language.lower().split())
+            if not keywords:
+                return []
+            match = ' OR '.join('"' + word.replace('"', '""') + '"' for word in keywords)
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT id, timestamp, natural_language, generated_sql,
-                       execution_success, row_count, execution_time,
-                       error_message, quality_score, user_feedback
-                FROM query_history
-                WHERE execution_success = 1
-                ORDER BY timestamp DESC
-                LIMIT 100
-            """)
-            
-            # Score by keyword overlap
-            entries_with_scores = []
-            for row in cursor.fetchall():
-                entry_keywords = set(row[2].lower().split())
-                overlap = len(keywords & entry_keywords)
+            with self._lock:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("""
+                    SELECT h.id, h.timestamp, h.natural_language, h.generated_sql,
+                           h.execution_success, h.row_count, h.execution_time,
+                           h.error_message, h.quality_score, h.user_feedback
+                    FROM query_history_fts f
+                    JOIN query_history h ON h.id = f.rowid
+                    WHERE query_history_fts MATCH ?
+                      AND h.execution_success = 1
+                    ORDER BY bm25(query_history_fts), h.timestamp DESC
+                    LIMIT ?
+                """, (match, limit))
                 
-                if overlap > 0:
-                    entry = QueryHistoryEntry(
+                entries = []
+                for row in cursor.fetchall():
+                    entries.append(QueryHistoryEntry(
                         id=row[0],
                         timestamp=row[1],
                         natural_language=row[2],
@@ -458,14 +644,9 @@ class QueryHistory:
                         error_message=row[7],
                         quality_score=row[8],
                         user_feedback=row[9]
-                    )
-                    entries_with_scores.append((overlap, entry))
-            
-            conn.close()
-            
-            # Sort by overlap score and return top entries
-            entries_with_scores.sort(key=lambda x: x[0], reverse=True)
-            return [entry for score, entry in entries_with_scores[:limit]]
+                    ))
+                
+            return entries
             
         except Exception as e:
             self.logger.error(f"Error finding similar queries: {e}")
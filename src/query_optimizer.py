@@ -4,55 +4,243 @@ Query Optimizer - Analyzes and optimizes SQL query performance
 
 import re
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-import psycopg2
+import threading
+import time
+from functools import lru_cache
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Any, Optional, Tuple
+
+# psycopg2 is imported where statements are composed: plan analysis and
+# importing this module need no driver
+if TYPE_CHECKING:
+    from psycopg2.extensions import cursor as PgCursor
+    from psycopg2.pool import AbstractConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# WHERE clause body, and the column operand of each comparison inside it
+_WHERE_RE = re.compile(r'WHERE\s+(.+?)(?:GROUP BY|ORDER BY|LIMIT|$)', re.IGNORECASE | re.DOTALL)
+_COL_RE = re.compile(r'(\w+\.\w+|\w+)\s*[=<>!]')
+
+# EXPLAIN ANALYZE executes its statement: only plain reads may be analyzed
+_READ_ONLY_RE = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+_WRITE_KEYWORD_RE = re.compile(
+    r'\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE|DROP|ALTER|CREATE|GRANT|REVOKE)\b', re.IGNORECASE
+)
+
+# sqlglot parses WHERE predicates structurally when installed; regex otherwise
+try:
+    import sqlglot
+    from sqlglot import exp
+    
+    _COMPARISONS = {
+        exp.EQ: '=', exp.NEQ: '<>', exp.GT: '>', exp.GTE: '>=',
+        exp.LT: '<', exp.LTE: '<=', exp.Like: 'LIKE', exp.ILike: 'ILIKE'
+    }
+except ImportError:
+    sqlglot = None
+
+# Operator seen from the column's side when it is the right-hand operand
+_FLIPPED = {'>': '<', '<': '>', '>=': '<=', '<=': '>='}
+
+# How well a B-tree serves a predicate, best first: equality, then ranges
+# (including LIKE 'abc%'); anything else (<>, substring LIKE, unknown) last
+_INDEX_RANK = {
+    '=': 0,
+    '>': 1, '<': 1, '>=': 1, '<=': 1, 'LIKE_PREFIX': 1
+}
+
+Predicate = Tuple[Optional[str], str, str, Optional[str]]
+
+
+def _classify_like(pattern: str) -> str:
+    """
+    Name the index-relevant shape of a LIKE pattern: no wildcard is an
+    equality (B-tree), 'abc%' a prefix (B-tree with text_pattern_ops),
+    '%abc' a suffix and anything else a substring match (pg_trgm)
+    """
+    body = pattern.rstrip('%')
+    if '%' not in pattern and '_' not in pattern:
+        return '='
+    if body != pattern and '%' not in body and '_' not in body:
+        return 'LIKE_PREFIX'
+    body = pattern.lstrip('%')
+    if body != pattern and '%' not in body and '_' not in body:
+        return 'LIKE_SUFFIX'
+    return 'LIKE'
+
+
+@lru_cache(maxsize=1024)
+def _sql_skeleton(query: str) -> str:
+    """Query text with every literal replaced by a placeholder (plan signature)"""
+    tree = sqlglot.parse_one(query, dialect='postgres')
+    # The number in a $1 parameter is a literal too, but part of the reference
+    skeleton = tree.transform(
+        lambda node: exp.Placeholder()
+        if isinstance(node, exp.Literal) and not isinstance(node.parent, exp.Parameter)
+        else node
+    )
+    return skeleton.sql(dialect='postgres')
+
+
+@lru_cache(maxsize=1024)
+def _parse_where_predicates(query: str) -> Tuple[Predicate, ...]:
+    """(table, column, op, literal) for each column comparison in any WHERE clause"""
+    tree = sqlglot.parse_one(query, dialect='postgres')
+    predicates = []
+    seen = set()
+    
+    for where in tree.find_all(exp.Where):
+        # Nested WHEREs (subqueries) are reached from their parents too
+        for node in where.find_all(*_COMPARISONS):
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            
+            op = _COMPARISONS[type(node)]
+            column, value = node.this, node.expression
+            # Normalize '5 < col' to 'col > 5'
+            if not isinstance(column, exp.Column) and 'LIKE' not in op:
+                column, value = value, column
+                op = _FLIPPED.get(op, op)
+            if not isinstance(column, exp.Column):
+                continue
+            
+            literal = value.name if isinstance(value, exp.Literal) else None
+            if op == 'LIKE' and literal is not None:
+                op = _classify_like(literal)
+            
+            predicates.append((column.table or None, column.name, op, literal))
+    
+    return tuple(predicates)
+
 
 class QueryOptimizer:
     """
     Analyzes query execution plans and provides optimization insights
     """
     
-    def __init__(self, db_connection):
+    def __init__(
+        self,
+        db_connection=None,
+        cache_size: int = 256,
+        min_cache_ms: float = 50.0,
+        pool: Optional["AbstractConnectionPool"] = None,
+        cache_ttl: float = 300.0
+    ):
         """
         Initialize query optimizer
         
         Args:
-            db_connection: PostgreSQL database connection
+            db_connection: PostgreSQL database connection (used when no pool is given)
+            cache_size: Cached analyses and plan-shape suggestions kept (least recently used evicted)
+            min_cache_ms: Only EXPLAIN ANALYZE results at least this slow are cached;
+                re-running faster ones is cheaper than holding them
+            pool: psycopg2 connection pool; each call borrows its own connection,
+                so concurrent analyses run on separate backends
+            cache_ttl: Seconds a cached analysis stays valid (plans drift as data changes)
         """
         self.db_connection = db_connection
+        self.pool = pool
+        self.cache_size = cache_size
+        self.min_cache_ms = min_cache_ms
+        self.cache_ttl = cache_ttl
+        # 'plan:'/'actual:' + query text -> (monotonic time cached, analysis) and
+        # 'shape:' + plan signature -> (time, suggestions), oldest -> most recently used
+        self._analysis_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.logger = logging.getLogger(f"{__name__}.QueryOptimizer")
     
-    def analyze_query(self, sql: str) -> Dict[str, Any]:
+    @contextmanager
+    def _cursor(self) -> Iterator["PgCursor"]:
+        """
+        Yield a cursor on a pooled connection (or the shared one)
+        
+        Rolls back on error so a failed statement never leaves the
+        connection stuck in an aborted transaction.
+        """
+        if self.pool is None:
+            try:
+                with self.db_connection.cursor() as cursor:
+                    yield cursor
+            except Exception:
+                if not self.db_connection.autocommit:
+                    self.db_connection.rollback()
+                raise
+            return
+        
+        conn = self.pool.getconn()
+        try:
+            # Analysis only reads; autocommit keeps EXPLAIN from idling in a transaction
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                yield cursor
+        finally:
+            self.pool.putconn(conn)
+    
+    def analyze_query(self, sql: str, actual: bool = False) -> Dict[str, Any]:
         """
         Analyze query execution plan and provide insights
         
         Args:
             sql: SQL query to analyze
+            actual: Run EXPLAIN ANALYZE, which executes the query to report real
+                timings, row counts and buffer usage; by default only the
+                planner's estimated plan is fetched (nothing is executed)
             
         Returns:
-            Dictionary with analysis results
+            Dictionary with analysis results. An estimated-plan request for a
+            query that differs from an analyzed one only in its literals gets
+            that query's 'suggestions' with 'similar_query': True and no plan
+            metrics (row estimates, costs and scan choices depend on the literals)
         """
+        if actual and (not _READ_ONLY_RE.match(sql) or _WRITE_KEYWORD_RE.search(sql)):
+            self.logger.warning("Refusing EXPLAIN ANALYZE on a statement that may write")
+            return {
+                'error': "EXPLAIN ANALYZE is only allowed for read-only SELECT/WITH queries",
+                'execution_time_ms': 0,
+                'suggestions': []
+            }
+        
         try:
-            cursor = self.db_connection.cursor()
+            # Full analyses belong to the exact query text; queries differing only
+            # in literals share a plan shape, so estimated-plan requests may reuse
+            # its suggestions instead of another EXPLAIN round trip
+            text = ' '.join(sql.split())
+            cache_key = f"{'actual' if actual else 'plan'}:{text}"
+            shape_key = None if actual else f"shape:{self._plan_signature(sql)}"
+            now = time.monotonic()
             
-            # Get execution plan
-            explain_query = f"EXPLAIN (FORMAT JSON, ANALYZE, BUFFERS) {sql}"
-            cursor.execute(explain_query)
-            plan = cursor.fetchone()[0]
-            
-            # Extract key metrics
-            analysis = self._extract_metrics(plan[0])
+            cached = self._cache_get(cache_key, now)
+            if cached is not None:
+                self.logger.info("Query analysis served from cache")
+                return dict(cached)
+            if shape_key is not None:
+                suggestions = self._cache_get(shape_key, now)
+                if suggestions is not None:
+                    self.logger.info("Query suggestions served from a similar query")
+                    return {'suggestions': list(suggestions), 'similar_query': True}
             
-            # Get optimization suggestions
-            suggestions = self._get_suggestions(sql, plan[0])
+            # Get execution plan
+            if actual:
+                explain_query = f"EXPLAIN (FORMAT JSON, ANALYZE, BUFFERS) {sql}"
+            else:
+                explain_query = f"EXPLAIN (FORMAT JSON) {sql}"
+            with self._cursor() as cursor:
+                cursor.execute(explain_query)
+                plan = cursor.fetchone()[0]
             
-            analysis['suggestions'] = suggestions
+            analysis = self.analyze_plan(plan[0], sql)
             
             self.logger.info(f"Query analysis complete: {analysis['execution_time_ms']:.2f}ms")
             
+            if not actual or analysis['execution_time_ms'] >= self.min_cache_ms:
+                self._cache_put(cache_key, now, analysis)
+                if shape_key is not None:
+                    self._cache_put(shape_key, now, analysis['suggestions'])
+                return dict(analysis)
+            
             return analysis
             
         except Exception as e:
@@ -63,105 +251,165 @@ class QueryOptimizer:
                 'suggestions': []
             }
     
-    def _extract_metrics(self, plan: Dict) -> Dict[str, Any]:
+    def _cache_get(self, key: str, now: float) -> Any:
+        """Cached value for key (marked most recently used), or None when absent or expired"""
+        with self._cache_lock:
+            cached = self._analysis_cache.get(key)
+            if cached is None:
+                return None
+            if now - cached[0] > self.cache_ttl:
+                del self._analysis_cache[key]
+                return None
+            self._analysis_cache.move_to_end(key)
+            return cached[1]
+    
+    def _cache_put(self, key: str, now: float, value: Any):
+        """Cache a value as most recently used, evicting the least recently used"""
+        with self._cache_lock:
+            self._analysis_cache[key] = (now, value)
+            self._analysis_cache.move_to_end(key)
+            while len(self._analysis_cache) > self.cache_size:
+                self._analysis_cache.popitem(last=False)
+    
+    def _plan_signature(self, sql: str) -> str:
+        """Plan shape of a query: its literal-free skeleton, or normalized text without sqlglot"""
+        if sqlglot is not None:
+            try:
+                return _sql_skeleton(sql)
+            except sqlglot.errors.SqlglotError:
+                pass
+        return ' '.join(sql.split())
+    
+    @staticmethod
+    def analyze_plan(plan: Dict, sql: str = "") -> Dict[str, Any]:
+        """
+        Extract metrics and optimization suggestions from an EXPLAIN plan
+        
+        Needs no database connection, so saved or cached plans can be
+        analyzed offline.
+        
+        Args:
+            plan: One EXPLAIN (FORMAT JSON) plan, i.e. the dict holding 'Plan'
+            sql: Query the plan belongs to; enables WHERE clause suggestions
+            
+        Returns:
+            Dictionary with plan metrics and a 'suggestions' list
+        """
+        analysis = QueryOptimizer._extract_metrics(plan)
+        analysis['suggestions'] = QueryOptimizer._get_suggestions(sql, analysis)
+        return analysis
+    
+    @staticmethod
+    def _extract_metrics(plan: Dict) -> Dict[str, Any]:
         """Extract key metrics from execution plan"""
+        root = plan['Plan']
+        walk = QueryOptimizer._walk_plan(root)
+        
         metrics = {
             'execution_time_ms': plan.get('Execution Time', 0),
             'planning_time_ms': plan.get('Planning Time', 0),
-            'total_cost': plan['Plan'].get('Total Cost', 0),
-            'actual_rows': plan['Plan'].get('Actual Rows', 0),
-            'plan_rows': plan['Plan'].get('Plan Rows', 0),
-            'node_type': plan['Plan'].get('Node Type', 'Unknown'),
-            'uses_index': self._uses_index(plan['Plan']),
-            'has_sequential_scan': self._has_sequential_scan(plan['Plan']),
-            'join_type': self._get_join_types(plan['Plan']),
-            'buffer_hits': self._get_buffer_stats(plan['Plan'])
+            'total_cost': root.get('Total Cost', 0),
+            'actual_rows': root.get('Actual Rows', 0),
+            'plan_rows': root.get('Plan Rows', 0),
+            'node_type': root.get('Node Type', 'Unknown'),
+            'uses_index': walk['uses_index'],
+            'has_sequential_scan': walk['has_sequential_scan'],
+            'join_type': walk['join_types'],
+            'node_types': sorted(walk['node_types']),
+            'buffer_hits': walk['buffer_stats']
         }
         
         return metrics
     
-    def _uses_index(self, plan: Dict) -> bool:
-        """Check if query uses any indexes"""
-        if plan.get('Node Type') in ['Index Scan', 'Index Only Scan', 'Bitmap Index Scan']:
-            return True
-        
-        if 'Plans' in plan:
-            return any(self._uses_index(child) for child in plan['Plans'])
-        
-        return False
-    
-    def _has_sequential_scan(self, plan: Dict) -> bool:
-        """Check if query performs sequential scans"""
-        if plan.get('Node Type') == 'Seq Scan':
-            return True
+    @staticmethod
+    def _walk_plan(root: Dict) -> Dict[str, Any]:
+        """
+        Collect index/scan/join/buffer facts about a plan tree in one pass
         
-        if 'Plans' in plan:
-            return any(self._has_sequential_scan(child) for child in plan['Plans'])
+        Iterative pre-order walk, so deep plans cost no Python recursion frames
         
-        return False
-    
-    def _get_join_types(self, plan: Dict) -> List[str]:
-        """Extract join types used in query"""
+        Args:
+            root: Top plan node (the 'Plan' entry of EXPLAIN JSON output)
+            
+        Returns:
+            Dictionary with uses_index, has_sequential_scan, join_types,
+            node_types and buffer_stats
+        """
+        uses_index = False
+        has_seq_scan = False
         joins = []
+        node_types = set()
+        shared_hit = shared_read = shared_written = 0
         
-        node_type = plan.get('Node Type', '')
-        if 'Join' in node_type:
-            joins.append(node_type)
-        
-        if 'Plans' in plan:
-            for child in plan['Plans']:
-                joins.extend(self._get_join_types(child))
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            node_type = node.get('Node Type', '')
+            node_types.add(node_type)
+            
+            if node_type in ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan'):
+                uses_index = True
+            elif node_type == 'Seq Scan':
+                has_seq_scan = True
+            elif 'Join' in node_type:
+                joins.append(node_type)
+            
+            shared_hit += node.get('Shared Hit Blocks', 0)
+            shared_read += node.get('Shared Read Blocks', 0)
+            shared_written += node.get('Shared Written Blocks', 0)
+            
+            # Reversed so children are visited left to right
+            stack.extend(reversed(node.get('Plans', ())))
         
-        return joins
-    
-    def _get_buffer_stats(self, plan: Dict) -> Dict[str, int]:
-        """Extract buffer usage statistics"""
-        stats = {
-            'shared_hit': plan.get('Shared Hit Blocks', 0),
-            'shared_read': plan.get('Shared Read Blocks', 0),
-            'shared_written': plan.get('Shared Written Blocks', 0)
+        return {
+            'uses_index': uses_index,
+            'has_sequential_scan': has_seq_scan,
+            'join_types': joins,
+            'node_types': node_types,
+            'buffer_stats': {
+                'shared_hit': shared_hit,
+                'shared_read': shared_read,
+                'shared_written': shared_written
+            }
         }
-        
-        if 'Plans' in plan:
-            for child in plan['Plans']:
-                child_stats = self._get_buffer_stats(child)
-                for key in stats:
-                    stats[key] += child_stats[key]
-        
-        return stats
     
-    def _get_suggestions(self, sql: str, plan: Dict) -> List[str]:
-        """Generate optimization suggestions based on execution plan"""
+    @staticmethod
+    def _get_suggestions(sql: str, metrics: Dict[str, Any]) -> List[str]:
+        """Generate optimization suggestions from the metrics extracted from a plan"""
         suggestions = []
         
         # Check for sequential scans
-        if self._has_sequential_scan(plan):
+        if metrics['has_sequential_scan']:
             suggestions.append(
                 "Sequential scan detected. Consider adding an index on the filtered columns."
             )
         
         # Check for nested loops on large datasets
-        if 'Nested Loop' in str(plan) and plan['Plan'].get('Actual Rows', 0) > 1000:
+        # Estimated plans carry only the planner's row count
+        node_types = metrics['node_types']
+        actual_rows = metrics['actual_rows']
+        plan_rows = metrics['plan_rows']
+        if 'Nested Loop' in node_types and (actual_rows or plan_rows) > 1000:
             suggestions.append(
                 "Nested loop join on large dataset. Consider using hash join or merge join instead."
             )
         
         # Check for missing indexes on WHERE clauses
-        where_columns = self._extract_where_columns(sql)
-        if where_columns and not self._uses_index(plan):
+        where_columns = QueryOptimizer._extract_where_columns(sql) if sql else []
+        if where_columns and not metrics['uses_index']:
             suggestions.append(
                 f"WHERE clause uses columns {where_columns} without indexes. "
                 "Consider adding indexes on these columns."
             )
         
         # Check for sorting without index
-        if 'Sort' in str(plan) and not self._uses_index(plan):
+        if ('Sort' in node_types or 'Incremental Sort' in node_types) and not metrics['uses_index']:
             suggestions.append(
                 "Query performs sort operation. Consider adding index on ORDER BY columns."
             )
         
         # Check execution time
-        exec_time = plan.get('Execution Time', 0)
+        exec_time = metrics['execution_time_ms']
         if exec_time > 1000:
             suggestions.append(
                 f"Query execution time is high ({exec_time:.0f}ms). "
@@ -169,9 +417,7 @@ class QueryOptimizer:
             )
         
         # Check row estimation accuracy
-        actual_rows = plan['Plan'].get('Actual Rows', 0)
-        plan_rows = plan['Plan'].get('Plan Rows', 1)
-        if actual_rows > 0 and plan_rows > 0:
+        if actual_rows and plan_rows:
             ratio = max(actual_rows, plan_rows) / min(actual_rows, plan_rows)
             if ratio > 10:
                 suggestions.append(
@@ -180,7 +426,7 @@ class QueryOptimizer:
                 )
         
         # Check buffer usage
-        buffer_stats = self._get_buffer_stats(plan)
+        buffer_stats = metrics['buffer_hits']
         total_buffers = sum(buffer_stats.values())
         if total_buffers > 10000:
             suggestions.append(
@@ -193,59 +439,107 @@ class QueryOptimizer:
         
         return suggestions
     
-    def _extract_where_columns(self, sql: str) -> List[str]:
-        """Extract column names from WHERE clause (simple regex-based)"""
-        where_match = re.search(r'WHERE\s+(.+?)(?:GROUP BY|ORDER BY|LIMIT|$)', sql, re.IGNORECASE | re.DOTALL)
+    def _extract_where_predicates(self, sql: str) -> List[Predicate]:
+        """
+        Parse WHERE clause predicates (requires sqlglot)
+        
+        Args:
+            sql: SQL query to inspect
+            
+        Returns:
+            (table or None, column, operator, literal or None) tuples; operator is a
+            comparison, ILIKE, or a LIKE shape from _classify_like
+        """
+        if sqlglot is None:
+            return []
+        
+        try:
+            return list(_parse_where_predicates(sql))
+        except sqlglot.errors.SqlglotError as e:
+            self.logger.debug(f"Could not parse WHERE clause: {e}")
+            return []
+    
+    @staticmethod
+    def _extract_where_columns(sql: str) -> List[str]:
+        """Extract column names from WHERE clause (parsed with sqlglot, regex fallback)"""
+        if sqlglot is not None:
+            try:
+                return list({
+                    f"{table}.{column}" if table else column
+                    for table, column, _, _ in _parse_where_predicates(sql)
+                })
+            except sqlglot.errors.SqlglotError:
+                pass
+        
+        where_match = _WHERE_RE.search(sql)
         if not where_match:
             return []
         
         where_clause = where_match.group(1)
         
         # Simple extraction (doesn't handle all cases perfectly)
-        columns = re.findall(r'(\w+\.\w+|\w+)\s*[=<>!]', where_clause)
+        columns = _COL_RE.findall(where_clause)
         return list(set(columns))
     
-    def get_table_statistics(self, table_name: str) -> Dict[str, Any]:
-        """Get table statistics for optimization planning"""
-        try:
-            cursor = self.db_connection.cursor()
-            
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            row_count = cursor.fetchone()[0]
-            
-            # Get table size
-            cursor.execute(f"""
-                SELECT pg_size_pretty(pg_total_relation_size('{table_name}'))
-            """)
-            table_size = cursor.fetchone()[0]
-            
-            # Get index information
-            cursor.execute(f"""
-                SELECT indexname, indexdef
-                FROM pg_indexes
-                WHERE tablename = '{table_name}'
-            """)
-            indexes = [{'name': row[0], 'definition': row[1]} for row in cursor.fetchall()]
+    def get_table_statistics(self, table_name: str, exact: bool = False) -> Dict[str, Any]:
+        """
+        Get table statistics for optimization planning
+        
+        Args:
+            table_name: Table to inspect
+            exact: Count rows with COUNT(*) (a full scan) instead of reading the
+                planner's pg_class.reltuples estimate (or, for a table never
+                analyzed, the row estimate of a plain EXPLAIN)
             
-            # Get column statistics
-            cursor.execute(f"""
-                SELECT attname, n_distinct, correlation
-                FROM pg_stats
-                WHERE tablename = '{table_name}'
-            """)
-            column_stats = [
-                {
-                    'column': row[0],
-                    'n_distinct': row[1],
-                    'correlation': row[2]
-                }
-                for row in cursor.fetchall()
-            ]
+        Returns:
+            Dictionary with row count, size, indexes and column statistics
+        """
+        from psycopg2 import sql
+        
+        try:
+            with self._cursor() as cursor:
+                # Resolved name, size, indexes, column statistics and the planner's row
+                # estimate (-1 until first vacuumed/analyzed) in one round trip. The
+                # name is bound and cast to regclass, which resolves it like SQL text
+                # would ('public.orders', unquoted Orders) without splicing it in
+                cursor.execute("""
+                    SELECT
+                        n.nspname,
+                        c.relname,
+                        NULLIF(c.reltuples, -1)::bigint,
+                        pg_size_pretty(pg_total_relation_size(c.oid)),
+                        (SELECT COALESCE(json_agg(json_build_object(
+                                    'name', i.relname,
+                                    'definition', pg_get_indexdef(i.oid))), '[]'::json)
+                         FROM pg_index x
+                         JOIN pg_class i ON i.oid = x.indexrelid
+                         WHERE x.indrelid = c.oid),
+                        (SELECT COALESCE(json_agg(json_build_object(
+                                    'column', s.attname,
+                                    'n_distinct', s.n_distinct,
+                                    'correlation', s.correlation)), '[]'::json)
+                         FROM pg_stats s
+                         WHERE s.schemaname = n.nspname
+                           AND s.tablename = c.relname)
+                    FROM pg_class c
+                    JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE c.oid = %(table)s::regclass
+                """, {'table': table_name})
+                schema, relname, row_count, table_size, indexes, column_stats = cursor.fetchone()
+                table = sql.Identifier(schema, relname)
+                
+                if exact:
+                    cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(table))
+                    row_count = cursor.fetchone()[0]
+                elif row_count is None:
+                    # Never analyzed: the planner still estimates from the table's page count
+                    cursor.execute(sql.SQL("EXPLAIN (FORMAT JSON) SELECT * FROM {}").format(table))
+                    row_count = cursor.fetchone()[0][0]['Plan']['Plan Rows']
             
             return {
                 'table_name': table_name,
                 'row_count': row_count,
+                'row_count_exact': exact,
                 'table_size': table_size,
                 'indexes': indexes,
                 'column_statistics': column_stats
@@ -268,33 +562,61 @@ class QueryOptimizer:
         """
         suggestions = []
         
-        # Analyze WHERE clauses
-        where_columns = set()
+        # Analyze WHERE clauses; without parsed operators (no sqlglot, or
+        # unparseable SQL) fall back to the bare column names
+        bare_table = table_name.rpartition('.')[2].strip('"')
+        ranks: Dict[str, int] = {}
         for query in common_queries:
-            where_columns.update(self._extract_where_columns(query))
+            predicates = self._extract_where_predicates(query) or [
+                (col.rpartition('.')[0] or None, col.rpartition('.')[2], None, None)
+                for col in self._extract_where_columns(query)
+            ]
+            for table, column, op, _ in predicates:
+                # Filter columns for this table (schema qualification and quotes
+                # are not part of a column reference's table)
+                if table and bare_table not in f"{table}.{column}":
+                    continue
+                rank = _INDEX_RANK.get(op, 2)
+                ranks[column] = min(rank, ranks.get(column, rank))
+        if not ranks:
+            return suggestions
         
-        # Filter columns for this table
-        table_columns = [col for col in where_columns if table_name in col or '.' not in col]
+        # Equality columns first, range columns last
+        table_columns = sorted(ranks, key=lambda column: (ranks[column], column))
+        
+        from psycopg2 import sql
         
-        # Get existing indexes
         try:
-            cursor = self.db_connection.cursor()
-            cursor.execute(f"""
-                SELECT indexname, indexdef
-                FROM pg_indexes
-                WHERE tablename = '{table_name}'
-            """)
-            existing_indexes = [row[1] for row in cursor.fetchall()]
-            existing_str = ' '.join(existing_indexes)
-            
-            # Suggest missing indexes
-            for col in table_columns:
-                col_name = col.split('.')[-1] if '.' in col else col
-                if col_name not in existing_str:
-                    suggestions.append(
-                        f"CREATE INDEX idx_{table_name}_{col_name} "
-                        f"ON {table_name}({col_name});"
+            with self._cursor() as cursor:
+                # Candidates that are real columns of the table and lead no index
+                # (a composite index serves its leading column like a single-column one)
+                # The name is cast to regclass like get_table_statistics does, and
+                # the resolved schema/table names are used in the suggestions
+                cursor.execute("""
+                    SELECT c.col, n.nspname, t.relname
+                    FROM unnest(%(columns)s::text[]) WITH ORDINALITY AS c(col, ord)
+                    JOIN pg_attribute a
+                      ON a.attrelid = %(table)s::regclass
+                     AND a.attname = c.col
+                     AND NOT a.attisdropped
+                    JOIN pg_class t ON t.oid = a.attrelid
+                    JOIN pg_namespace n ON n.oid = t.relnamespace
+                    WHERE NOT EXISTS (
+                        SELECT 1
+                        FROM pg_index i
+                        WHERE i.indrelid = a.attrelid
+                          AND i.indkey[0] = a.attnum
                     )
+                    ORDER BY c.ord
+                """, {'columns': table_columns, 'table': table_name})
+                
+                # Suggest missing indexes, with every name quoted as an identifier
+                for col_name, schema, relname in cursor.fetchall():
+                    suggestions.append(sql.SQL("CREATE INDEX {} ON {} ({});").format(
+                        sql.Identifier(f"idx_{relname}_{col_name}"),
+                        sql.Identifier(schema, relname),
+                        sql.Identifier(col_name)
+                    ).as_string(cursor))
             
         except Exception as e:
             self.logger.error(f"Error suggesting indexes: {e}")
@@ -5,7 +5,7 @@ Allows using SQLite database instead of PostgreSQL for development/testing
 
 import sqlite3
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
@@ -14,22 +14,41 @@ logger = logging.getLogger(__name__)
 class SQLiteAdapter:
     """Adapter to use SQLite database with Text2SQL engine"""
     
-    def __init__(self, db_path: str = "data/northwind/northwind.db"):
+    def __init__(self, db_path: str = "data/northwind/northwind.db", busy_timeout: int = 5):
         """
         Initialize SQLite adapter
         
         Args:
             db_path: Path to SQLite database file
+            busy_timeout: Default seconds to wait on a locked database
         """
         self.db_path = db_path
+        self.busy_timeout = busy_timeout
         self.connection = None
         self.connected = False
+        # busy_timeout (seconds) currently set on the connection
+        self._current_timeout: Optional[int] = None
+        # (PRAGMA schema_version, schema) from the last get_schema() call
+        self._schema_cache: Optional[Tuple[int, Dict[str, Any]]] = None
         
     def connect(self):
         """Connect to SQLite database"""
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            # Autocommit: read queries skip the implicit BEGIN; shared across API threads
+            self.connection = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
             self.connection.row_factory = sqlite3.Row  # Enable column access by name
+            
+            # Read-heavy tuning, applied once per connection: WAL lets readers run
+            # alongside writers, a 64 MB page cache and 256 MB mmap keep hot pages
+            # in memory without read() syscalls
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("PRAGMA cache_size=-65536")
+            self.connection.execute("PRAGMA mmap_size=268435456")
+            self.connection.execute("PRAGMA temp_store=MEMORY")
+            self._set_busy_timeout(self.busy_timeout)
             self.connected = True
             logger.info(f"✅ Connected to SQLite database: {self.db_path}")
         except Exception as e:
@@ -41,6 +60,7 @@ class SQLiteAdapter:
         if self.connection:
             self.connection.close()
             self.connected = False
+            self._current_timeout = None
             logger.info("Disconnected from SQLite database")
     
     @contextmanager
@@ -52,6 +72,35 @@ class SQLiteAdapter:
         finally:
             cursor.close()
     
+    def _set_busy_timeout(self, timeout: int):
+        """Set PRAGMA busy_timeout, skipping the statement when it is unchanged"""
+        if timeout != self._current_timeout:
+            self.connection.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+            self._current_timeout = timeout
+    
+    @contextmanager
+    def _query_cursor(self, sql: str, timeout: int):
+        """Execute a query and yield (cursor, column names) with tuple rows"""
+        if not self.connected:
+            raise RuntimeError("Not connected to database")
+        
+        if not self.connection:
+            raise RuntimeError("Database connection is None")
+        
+        logger.info(f"Executing SQL: {sql}")
+        
+        # Set timeout (only re-issued when it differs from the last one)
+        self._set_busy_timeout(timeout)
+        
+        with self.get_cursor() as cursor:
+            # Plain tuples: rows become dicts right away, so sqlite3.Row objects
+            # would only be an extra allocation per row
+            cursor.row_factory = None
+            cursor.execute(sql)
+            
+            columns = [description[0] for description in cursor.description]
+            yield cursor, columns
+    
     def execute_query(self, sql: str, timeout: int = 5) -> List[Dict[str, Any]]:
         """
         Execute a SQL query and return results
@@ -63,35 +112,48 @@ class SQLiteAdapter:
         Returns:
             List of result rows as dictionaries
         """
-        if not self.connected:
-            raise RuntimeError("Not connected to database")
-        
-        if not self.connection:
-            raise RuntimeError("Database connection is None")
+        with self._query_cursor(sql, timeout) as (cursor, columns):
+            # Convert rows to dictionaries
+            results = [dict(zip(columns, row)) for row in cursor.fetchall()]
         
-        logger.info(f"Executing SQL: {sql}")
+        logger.info(f"Query returned {len(results)} rows")
+        return results
+    
+    def execute_query_iter(
+        self,
+        sql: str,
+        timeout: int = 5,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SQL query and yield result rows one at a time
         
-        # Set timeout
-        self.connection.execute(f"PRAGMA busy_timeout = {timeout * 1000}")
+        Only one batch of rows is materialized at once, so large results can
+        be streamed (e.g. into a response) without holding them all in memory.
         
-        with self.get_cursor() as cursor:
-            cursor.execute(sql)
-            
-            # Convert rows to dictionaries
-            columns = [description[0] for description in cursor.description]
-            results = []
-            for row in cursor.fetchall():
-                results.append(dict(zip(columns, row)))
+        Args:
+            sql: SQL query to execute
+            timeout: Query timeout in seconds
+            batch_size: Rows fetched from SQLite per batch
             
-            logger.info(f"Query returned {len(results)} rows")
-            return results
+        Yields:
+            Result rows as dictionaries
+        """
+        with self._query_cursor(sql, timeout) as (cursor, columns):
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
     
     def get_schema(self) -> Dict[str, Any]:
         """
         Get database schema information
         
         Returns:
-            Dictionary containing schema information
+            Dictionary containing schema information (shared between calls
+            while the schema is unchanged; treat it as read-only)
         """
         if not self.connected:
             raise RuntimeError("Not connected to database")
@@ -99,46 +161,49 @@ class SQLiteAdapter:
         schema = {"tables": {}}
         
         with self.get_cursor() as cursor:
-            # Get all tables
+            # schema_version changes on every DDL statement; reuse the last
+            # result while it is unchanged
+            version = cursor.execute("PRAGMA schema_version").fetchone()[0]
+            if self._schema_cache is not None and self._schema_cache[0] == version:
+                return self._schema_cache[1]
+            
+            # Columns of every table in one statement via table-valued pragmas
             cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name NOT LIKE 'sqlite_%'
-                ORDER BY name
+                SELECT m.name, p.name, p.type, p."notnull", p.pk
+                FROM sqlite_master m
+                JOIN pragma_table_info(m.name) p
+                WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+                ORDER BY m.name, p.cid
             """)
             
-            tables = [row[0] for row in cursor.fetchall()]
+            for table, name, col_type, not_null, pk in cursor.fetchall():
+                table_info = schema["tables"].setdefault(
+                    table, {"columns": [], "foreign_keys": []}
+                )
+                table_info["columns"].append({
+                    "name": name,
+                    "type": col_type,
+                    "not_null": bool(not_null),
+                    "primary_key": bool(pk)
+                })
+            
+            # Foreign keys of every table in a second statement
+            cursor.execute("""
+                SELECT m.name, f."from", f."table", f."to"
+                FROM sqlite_master m
+                JOIN pragma_foreign_key_list(m.name) f
+                WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+                ORDER BY m.name, f.id, f.seq
+            """)
             
-            # Get columns for each table
-            for table in tables:
-                cursor.execute(f"PRAGMA table_info({table})")
-                columns_info = cursor.fetchall()
-                
-                columns = []
-                for col in columns_info:
-                    columns.append({
-                        "name": col[1],  # column name
-                        "type": col[2],  # data type
-                        "not_null": bool(col[3]),
-                        "primary_key": bool(col[5])
-                    })
-                
-                # Get foreign keys
-                cursor.execute(f"PRAGMA foreign_key_list({table})")
-                foreign_keys = cursor.fetchall()
-                
-                fk_info = []
-                for fk in foreign_keys:
-                    fk_info.append({
-                        "column": fk[3],
-                        "references_table": fk[2],
-                        "references_column": fk[4]
-                    })
-                
-                schema["tables"][table] = {
-                    "columns": columns,
-                    "foreign_keys": fk_info
-                }
+            for table, column, ref_table, ref_column in cursor.fetchall():
+                schema["tables"][table]["foreign_keys"].append({
+                    "column": column,
+                    "references_table": ref_table,
+                    "references_column": ref_column
+                })
         
+        self._schema_cache = (version, schema)
         return schema
 
 
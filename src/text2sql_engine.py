@@ -5,14 +5,24 @@ with comprehensive security and validation.
 """
 
 import re
+import sys
 import logging
 import time
-from typing import Dict, List, Optional, Tuple, Any
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 import google.generativeai as genai
 import sqlparse
-from sqlparse.sql import IdentifierList, Identifier, Where
-from sqlparse.tokens import Keyword, DML
+
+if TYPE_CHECKING:
+    from .sqlite_adapter import SQLiteAdapter
 
 # Configure logging
 logging.basicConfig(
@@ -21,18 +31,191 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Model output wrapped in a markdown code fence; group 1 is the SQL inside
+_SQL_FENCE_RE = re.compile(r'```(?:sql\b)?\s*(.*?)\s*```', re.DOTALL | re.IGNORECASE)
+
+# statement_timeout passed as a libpq startup option (options='-c statement_timeout=N')
+_STARTUP_TIMEOUT_RE = re.compile(r"-c\s*statement_timeout\s*=\s*(\d+)(?![\w.])")
+
+# Boolean literals compared against INT flag columns
+_EQ_TRUE_RE = re.compile(r"=\s*TRUE\b", re.IGNORECASE)
+_EQ_FALSE_RE = re.compile(r"=\s*FALSE\b", re.IGNORECASE)
+_IS_TRUE_RE = re.compile(r"IS\s+TRUE\b", re.IGNORECASE)
+_IS_FALSE_RE = re.compile(r"IS\s+FALSE\b", re.IGNORECASE)
+
+# Lexical tokens of a SQL string: quoted literals/identifiers (standard, E'' with
+# backslash escapes, and "") and comments are skipped whole; a quote or comment
+# opener left unmatched means the input is unterminated
+_SQL_TOKEN_RE = re.compile(r"""
+    (?P<string>[Ee]'[^'\\]*(?:(?:\\.|'')[^'\\]*)*'
+      | '[^']*(?:''[^']*)*'
+      | "[^"]*(?:""[^"]*)*")
+  | (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<semicolon>;)
+  | (?P<word>[A-Za-z_]\w*)
+  | (?P<unterminated>['"]|/\*)
+  | (?P<other>\S)
+""", re.VERBOSE | re.DOTALL)
+
+# Quality heuristics, matched on upper-cased SQL; aggregates must be calls so
+# columns such as max_price or joined_date do not count
+_AGGREGATE_RE = re.compile(r'\b(?:COUNT|SUM|AVG|MAX|MIN)\s*\(')
+_COUNT_RE = re.compile(r'\bCOUNT\s*\(')
+_JOIN_RE = re.compile(r'\bJOIN\b')
+_GROUP_BY_RE = re.compile(r'\bGROUP\s+BY\b')
+
+# Suspicious but allowed constructs, logged for monitoring (one scan)
+_INJECTION_RE = re.compile(
+    r';.*(?:DROP|DELETE|UPDATE|INSERT)'
+    r'|UNION.*SELECT.*FROM'
+    r'|--.*\n.*(?:SELECT|FROM)'
+    r'|/\*.*\*/',  # Comment blocks
+    re.IGNORECASE
+)
+
+
+def _scan_sql(sql: str) -> Tuple[Optional[str], int, bool]:
+    """
+    Lex a SQL string in one pass without building a parse tree
+    
+    Args:
+        sql: SQL text to scan
+        
+    Returns:
+        Tuple of (first token upper-cased or None, number of non-empty
+        statements, whether every quote and comment is terminated)
+    """
+    first_token = None
+    statements = 0
+    has_content = False
+    
+    for match in _SQL_TOKEN_RE.finditer(sql):
+        kind = match.lastgroup
+        if kind == 'comment':
+            continue
+        if kind == 'unterminated':
+            return first_token, statements, False
+        if kind == 'semicolon':
+            if has_content:
+                statements += 1
+                has_content = False
+            continue
+        
+        if first_token is None:
+            first_token = match.group().upper()
+        has_content = True
+    
+    if has_content:
+        statements += 1
+    return first_token, statements, True
+
 
-@dataclass
+def _sql_response_end(text: str) -> Optional[int]:
+    """
+    Find where a (possibly partial) model response has finished its query
+    
+    Args:
+        text: Response text received so far
+        
+    Returns:
+        Index just past the closing code fence or, for an unfenced response,
+        past the first semicolon outside strings and comments; None while the
+        query may still be incomplete
+    """
+    fence = text.find('```')
+    if fence != -1 and not text[:fence].strip():
+        closing = text.find('```', fence + 3)
+        return closing + 3 if closing != -1 else None
+    
+    for match in _SQL_TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == 'unterminated':
+            return None
+        if kind == 'semicolon':
+            return match.end()
+    return None
+
+
+class ResultView(Sequence):
+    """
+    Read-only sequence of result rows as dictionaries, stored columnar
+    
+    Keeps the column names once and the rows as the driver's tuples; a row
+    dictionary is only built when that row is accessed, so counting or
+    partially reading a large result never allocates the rest.
+    """
+    
+    __slots__ = ('columns', 'rows')
+    
+    def __init__(self, columns: List[str], rows: List[tuple]):
+        self.columns = columns
+        self.rows = rows
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [dict(zip(self.columns, row)) for row in self.rows[index]]
+        return dict(zip(self.columns, self.rows[index]))
+    
+    def __iter__(self):
+        columns = self.columns
+        for row in self.rows:
+            yield dict(zip(columns, row))
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ResultView):
+            return self.columns == other.columns and self.rows == other.rows
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"ResultView(columns={self.columns!r}, rows={len(self.rows)})"
+
+
+@lru_cache(maxsize=1024)
+def _normalize_boolean_literals(sql: str) -> str:
+    """Rewrite TRUE/FALSE comparisons as 1/0 (memoized: repeated questions repeat their SQL)"""
+    # Replace "= TRUE"/"= FALSE" (case-insensitive, with optional spaces)
+    fixed = _EQ_TRUE_RE.sub("= 1", sql)
+    fixed = _EQ_FALSE_RE.sub("= 0", fixed)
+    # Replace "IS TRUE"/"IS FALSE" which may appear in predicates
+    fixed = _IS_TRUE_RE.sub("= 1", fixed)
+    return _IS_FALSE_RE.sub("= 0", fixed)
+
+
+def _startup_statement_timeout(connection) -> Optional[int]:
+    """statement_timeout (ms) a connection was opened with via libpq options, if any"""
+    options = getattr(getattr(connection, 'info', None), 'options', None)
+    if not isinstance(options, str):
+        return None
+    match = _STARTUP_TIMEOUT_RE.search(options)
+    return int(match.group(1)) if match else None
+
+
+def _is_psycopg3(connection) -> bool:
+    """Whether a connection is a psycopg (v3) one; psycopg is loaded if so"""
+    psycopg = sys.modules.get('psycopg')
+    return psycopg is not None and isinstance(connection, psycopg.Connection)
+
+
+@dataclass(slots=True)
 class QueryResult:
     """Result of a Text2SQL query generation and execution"""
     natural_language: str
     generated_sql: str
     execution_success: bool
-    results: Optional[List[Dict[str, Any]]] = None
+    results: Optional[Sequence] = None
     error_message: Optional[str] = None
     execution_time: float = 0.0
     row_count: int = 0
     quality_metrics: Optional[Dict[str, Any]] = None
+    
+    def formatted_sql(self) -> str:
+        """Generated SQL pretty-printed for display (formatted on each call)"""
+        return SQLSanitizer.format_for_display(self.generated_sql or '')
 
 
 class SQLSanitizer:
@@ -50,6 +233,18 @@ class SQLSanitizer:
         'pg_catalog', 'information_schema', 'pg_', 'mysql', 'sys'
     }
     
+    # Each set as one case-insensitive alternation, so a query is scanned once
+    # per check without upper/lower-cased copies; longest names first so
+    # 'pg_catalog' is reported rather than 'pg_'
+    _BLOCKED_KEYWORDS_RE = re.compile(
+        r'\b(?:' + '|'.join(map(re.escape, sorted(BLOCKED_KEYWORDS, key=len, reverse=True))) + r')\b',
+        re.IGNORECASE
+    )
+    _BLOCKED_SCHEMAS_RE = re.compile(
+        '|'.join(map(re.escape, sorted(BLOCKED_SCHEMAS, key=len, reverse=True))),
+        re.IGNORECASE
+    )
+    
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.SQLSanitizer")
     
@@ -66,72 +261,63 @@ class SQLSanitizer:
         if not sql or not sql.strip():
             return False, "Empty SQL query"
         
-        # Parse the SQL
-        try:
-            parsed = sqlparse.parse(sql)
-            if not parsed:
-                return False, "Unable to parse SQL query"
-        except Exception as e:
-            return False, f"SQL parsing error: {str(e)}"
+        # Lex the SQL (a single regex pass; a full sqlparse parse is far slower)
+        first_token, statements, terminated = _scan_sql(sql)
+        if not terminated:
+            return False, "Unable to parse SQL query: unterminated string or comment"
         
         # Check for multiple statements first (SQL injection attempt)
-        significant_statements = [s for s in parsed if not s.is_whitespace]
-        if len(significant_statements) > 1:
+        if statements > 1:
             return False, "Multiple SQL statements are not allowed"
         
         # Check for blocked keywords
-        sql_upper = sql.upper()
-        for keyword in self.BLOCKED_KEYWORDS:
-            if re.search(r'\b' + keyword + r'\b', sql_upper):
-                return False, f"Blocked operation detected: {keyword}"
+        match = self._BLOCKED_KEYWORDS_RE.search(sql)
+        if match:
+            return False, f"Blocked operation detected: {match.group(0).upper()}"
         
         # Check for system schema access
-        for schema in self.BLOCKED_SCHEMAS:
-            if schema.lower() in sql.lower():
-                return False, f"Access to system schema '{schema}' is not allowed"
+        match = self._BLOCKED_SCHEMAS_RE.search(sql)
+        if match:
+            return False, f"Access to system schema '{match.group(0).lower()}' is not allowed"
         
-        # Check that query starts with SELECT
-        first_statement = parsed[0]
-        if not self._is_select_statement(first_statement):
+        # Check that query starts with SELECT (or a CTE feeding one)
+        if first_token not in ('SELECT', 'WITH'):
             return False, "Only SELECT queries are allowed"
         
-        # Additional SQL injection patterns
-        injection_patterns = [
-            r';.*(?:DROP|DELETE|UPDATE|INSERT)',
-            r'UNION.*SELECT.*FROM',
-            r'--.*\n.*(?:SELECT|FROM)',
-            r'/\*.*\*/',  # Comment blocks
-        ]
-        
-        for pattern in injection_patterns:
-            if re.search(pattern, sql_upper, re.IGNORECASE):
-                self.logger.warning(f"Potential SQL injection pattern detected: {pattern}")
-                # Note: UNION SELECT is actually valid for some queries, so we'll allow it
-                # but log it for monitoring
+        # Additional SQL injection patterns. They enforce nothing (UNION SELECT is
+        # valid for some queries, so it is allowed), so the scan only runs when
+        # debug logging is on for monitoring
+        if self.logger.isEnabledFor(logging.DEBUG):
+            match = _INJECTION_RE.search(sql)
+            if match:
+                self.logger.debug(f"Potential SQL injection pattern detected: {match.group(0)}")
         
         return True, None
     
-    def _is_select_statement(self, statement) -> bool:
-        """Check if a parsed statement is a SELECT query"""
-        for token in statement.tokens:
-            if token.ttype is DML and token.value.upper() == 'SELECT':
-                return True
-        return False
-    
     def sanitize_query(self, sql: str) -> str:
         """
-        Clean and format SQL query
+        Clean SQL query for validation and execution
         
         Args:
             sql: Raw SQL query
             
         Returns:
-            Sanitized and formatted SQL
+            SQL with whitespace collapsed to single spaces
+        """
+        return ' '.join(sql.split())
+    
+    @staticmethod
+    def format_for_display(sql: str) -> str:
         """
-        # Remove extra whitespace
-        sql = ' '.join(sql.split())
+        Format SQL query for readability (full sqlparse pass, so only call
+        it when the query is actually shown)
         
-        # Format for readability
+        Args:
+            sql: SQL query
+            
+        Returns:
+            Reindented SQL with upper-case keywords
+        """
         formatted = sqlparse.format(
             sql,
             reindent=True,
@@ -154,7 +340,9 @@ class Text2SQLEngine:
         database_schema: Dict[str, Any],
         model_name: str = "gemini-2.5-flash",
         timeout_seconds: int = 5,
-        max_results: int = 1000
+        max_results: int = 1000,
+        context_cache_ttl: Optional[int] = None,
+        sql_cache_size: int = 512
     ):
         """
         Initialize Text2SQL Engine
@@ -165,6 +353,13 @@ class Text2SQLEngine:
             model_name: Gemini model to use
             timeout_seconds: Maximum query execution time
             max_results: Maximum number of results to return
+            context_cache_ttl: Seconds to keep the static prompt prefix (schema and
+                rules) in a Gemini context cache, so each request only sends its
+                question; None disables caching. Gemini requires a minimum cached
+                size (a few thousand tokens), so small schemas fall back to full prompts
+            sql_cache_size: Generated queries kept per normalized question (least
+                recently used evicted); repeated questions skip the Gemini call.
+                0 disables the cache
         """
         self.api_key = api_key
         self.database_schema = database_schema
@@ -174,12 +369,35 @@ class Text2SQLEngine:
         self.sanitizer = SQLSanitizer()
         self.logger = logging.getLogger(f"{__name__}.Text2SQLEngine")
         
-        # Configure Gemini
+        # normalized question -> validated SQL, oldest -> most recently used
+        self.sql_cache_size = sql_cache_size
+        self._sql_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._sql_cache_lock = threading.Lock()
+        
+        # Last SQLite adapter that passed process_query_sqlite's interface check
+        self._checked_sqlite_connection = None
+        
+        # PostgreSQL connection -> statement_timeout (ms) already set on its session
+        self._statement_timeouts: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+        
+        # Configure Gemini; deterministic output, capped so a rambling
+        # response cannot run long
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model_name)
+        self.generation_config = genai.GenerationConfig(temperature=0, max_output_tokens=1024)
         
         # Build schema context for prompts
         self.schema_context = self._build_schema_context()
+        # Static part of every prompt, built once; only the question varies
+        self._prompt_prefix = self._build_prompt_prefix()
+        
+        # Gemini context cache holding the prompt prefix (see _create_context_cache)
+        self.context_cache_ttl = context_cache_ttl
+        self.cached_content = None
+        self.cached_model = None
+        self._cache_expires_at = 0.0
+        if context_cache_ttl:
+            self._create_context_cache()
         
         self.logger.info(f"Text2SQL Engine initialized with model: {model_name}")
     
@@ -221,17 +439,41 @@ class Text2SQLEngine:
         
         return "\n".join(context_parts)
     
-    def _build_prompt(self, natural_language_query: str) -> str:
+    def _create_context_cache(self):
         """
-        Build a comprehensive prompt for the LLM
+        Upload the static prompt prefix as Gemini cached content
         
-        Args:
-            natural_language_query: User's natural language question
-            
-        Returns:
-            Complete prompt for LLM
+        On failure (SDK without caching support, prefix below the model's
+        minimum cache size, ...) cached_model stays None and prompts are
+        sent in full.
         """
-        prompt = f"""You are an expert SQL query generator for a PostgreSQL database.
+        self.cached_content = None
+        self.cached_model = None
+        
+        caching = getattr(genai, 'caching', None)
+        if caching is None:
+            self.logger.warning("Installed google-generativeai has no context caching support")
+            return
+        
+        try:
+            self.cached_content = caching.CachedContent.create(
+                model=self.model_name,
+                contents=[self._prompt_prefix],
+                ttl=timedelta(seconds=self.context_cache_ttl)
+            )
+            self.cached_model = genai.GenerativeModel.from_cached_content(
+                cached_content=self.cached_content
+            )
+            # Renewed a little early so no request races Gemini's own expiry
+            self._cache_expires_at = time.monotonic() + self.context_cache_ttl * 0.9
+            self.logger.info(f"Prompt prefix cached for {self.context_cache_ttl}s")
+        except Exception as e:
+            self.cached_content = None
+            self.logger.warning(f"Context caching unavailable, sending full prompts: {e}")
+    
+    def _build_prompt_prefix(self) -> str:
+        """Static part of every prompt: instructions, schema and rules"""
+        return f"""You are an expert SQL query generator for a PostgreSQL database.
 Your task is to convert natural language questions into syntactically correct SQL queries.
 
 {self.schema_context}
@@ -248,12 +490,68 @@ Your task is to convert natural language questions into syntactically correct SQ
 9. Use proper PostgreSQL syntax and functions
 10. Handle NULL values appropriately
 
-## Question:
+"""
+    
+    def _build_prompt_question(self, natural_language_query: str) -> str:
+        """Per-request part of the prompt, following the prefix"""
+        return f"""## Question:
 {natural_language_query}
 
 ## SQL Query:
 """
-        return prompt
+    
+    def _build_prompt(self, natural_language_query: str) -> str:
+        """
+        Build a comprehensive prompt for the LLM
+        
+        Args:
+            natural_language_query: User's natural language question
+            
+        Returns:
+            Complete prompt for LLM
+        """
+        return self._prompt_prefix + self._build_prompt_question(natural_language_query)
+    
+    def _call_llm(self, natural_language_query: str) -> Optional[str]:
+        """
+        Send a question to Gemini
+        
+        Args:
+            natural_language_query: User's natural language question
+            
+        Returns:
+            Response text up to the end of the first complete query (None or
+            empty when Gemini returned nothing)
+        """
+        # Re-create the context cache once Gemini has expired it
+        if self.cached_content is not None and time.monotonic() >= self._cache_expires_at:
+            self._create_context_cache()
+        
+        # Only the question is sent when the prompt prefix is cached
+        if self.cached_model is not None:
+            model = self.cached_model
+            prompt = self._build_prompt_question(natural_language_query)
+        else:
+            model = self.model
+            prompt = self._build_prompt(natural_language_query)
+        
+        response = model.generate_content(
+            prompt, generation_config=self.generation_config, stream=True
+        )
+        if not response:
+            return None
+        
+        # Stop reading once the query is complete; any explanation the model
+        # appends after it is never waited for
+        text = ''
+        for chunk in response:
+            text += chunk.text
+            end = _sql_response_end(text)
+            if end is not None:
+                return text[:end]
+        
+        # Stream fully consumed: its aggregated text
+        return response.text
     
     def generate_sql(self, natural_language_query: str) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -265,23 +563,28 @@ Your task is to convert natural language questions into syntactically correct SQ
         Returns:
             Tuple of (generated_sql, error_message)
         """
+        # Same question (ignoring case and spacing), same prompt: reuse its SQL
+        cache_key = ' '.join(natural_language_query.lower().split())
+        with self._sql_cache_lock:
+            cached_sql = self._sql_cache.get(cache_key)
+            if cached_sql is not None:
+                self._sql_cache.move_to_end(cache_key)
+        if cached_sql is not None:
+            self.logger.info(f"Generated SQL served from cache for: {natural_language_query}")
+            return cached_sql, None
+        
         try:
-            prompt = self._build_prompt(natural_language_query)
-            
             self.logger.info(f"Generating SQL for: {natural_language_query}")
             
-            # Generate SQL with Gemini
-            response = self.model.generate_content(prompt)
-            
-            if not response or not response.text:
+            text = self._call_llm(natural_language_query)
+            if not text:
                 return None, "No response from Gemini API"
             
             # Extract SQL from response (remove markdown code blocks if present)
-            sql = response.text.strip()
-            sql = re.sub(r'^```sql\s*', '', sql, flags=re.MULTILINE)
-            sql = re.sub(r'^```\s*', '', sql, flags=re.MULTILINE)
-            sql = re.sub(r'```\s*$', '', sql, flags=re.MULTILINE)
-            sql = sql.strip()
+            sql = text.strip()
+            match = _SQL_FENCE_RE.fullmatch(sql)
+            if match:
+                sql = match.group(1)
             
             # Sanitize the query
             sql = self.sanitizer.sanitize_query(sql)
@@ -293,6 +596,18 @@ Your task is to convert natural language questions into syntactically correct SQ
                 return None, f"Invalid SQL generated: {error_msg}"
             
             self.logger.info(f"Generated SQL: {sql}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    f"Formatted SQL:\n{self.sanitizer.format_for_display(sql)}"
+                )
+            
+            if self.sql_cache_size > 0:
+                with self._sql_cache_lock:
+                    self._sql_cache[cache_key] = sql
+                    self._sql_cache.move_to_end(cache_key)
+                    while len(self._sql_cache) > self.sql_cache_size:
+                        self._sql_cache.popitem(last=False)
+            
             return sql, None
             
         except Exception as e:
@@ -304,7 +619,7 @@ Your task is to convert natural language questions into syntactically correct SQ
         self,
         sql: str,
         db_connection
-    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str], float]:
+    ) -> Tuple[Optional[ResultView], Optional[str], float]:
         """
         Execute SQL query with timeout and result limiting
         
@@ -313,17 +628,49 @@ Your task is to convert natural language questions into syntactically correct SQ
             db_connection: Database connection object
             
         Returns:
-            Tuple of (results, error_message, execution_time)
+            Tuple of (results, error_message, execution_time); results is a
+            ResultView over the fetched rows (dictionaries built on access)
         """
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
+            
+            # Set statement timeout unless the connection was opened with it
+            # (DatabaseConfig.statement_timeout_ms). Otherwise it is a session
+            # setting, so on autocommit connections it is only sent once (or when
+            # the timeout changes). Inside a transaction any rollback, including
+            # one by another user of the connection, silently undoes it, so it
+            # is sent every time
+            timeout_ms = self.timeout_seconds * 1000
+            set_timeout = f"SET statement_timeout = {timeout_ms}"
+            needs_timeout = _startup_statement_timeout(db_connection) != timeout_ms and (
+                not db_connection.autocommit
+                or self._statement_timeouts.get(db_connection) != timeout_ms
+            )
             
-            # Set statement timeout
-            cursor = db_connection.cursor()
-            cursor.execute(f"SET statement_timeout = {self.timeout_seconds * 1000}")
+            # Inside a transaction, a server-side (named) cursor leaves the result
+            # on the server, so at most max_results + 1 rows are ever transferred;
+            # a plain cursor receives the whole result set on execute. Named
+            # cursors cannot outlive a transaction, so autocommit keeps the plain one
+            if db_connection.autocommit:
+                cursor = db_connection.cursor()
+            else:
+                cursor = db_connection.cursor(name=f"t2sql_{uuid.uuid4().hex}")
             
-            # Execute query
-            cursor.execute(sql)
+            # Execute query. psycopg 3 connections send the SET and the query in
+            # one pipeline (one round trip); server-side cursors cannot be
+            # pipelined, so that needs autocommit
+            if needs_timeout and db_connection.autocommit and _is_psycopg3(db_connection):
+                with db_connection.pipeline():
+                    db_connection.execute(set_timeout)
+                    cursor.execute(sql)
+            else:
+                if needs_timeout:
+                    timeout_cursor = db_connection.cursor()
+                    timeout_cursor.execute(set_timeout)
+                    timeout_cursor.close()
+                cursor.execute(sql)
+            if needs_timeout and db_connection.autocommit:
+                self._statement_timeouts[db_connection] = timeout_ms
             
             # Fetch results with limit
             rows = cursor.fetchmany(self.max_results + 1)
@@ -333,20 +680,30 @@ Your task is to convert natural language questions into syntactically correct SQ
                 self.logger.warning(f"Result set exceeds {self.max_results} rows, truncating")
                 rows = rows[:self.max_results]
             
-            # Convert to list of dictionaries
+            # Rows stay driver tuples; dictionaries are built on access
             column_names = [desc[0] for desc in cursor.description]
-            results = [dict(zip(column_names, row)) for row in rows]
+            results = ResultView(column_names, rows)
+            cursor.close()
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
             self.logger.info(f"Query executed successfully in {execution_time:.3f}s, returned {len(results)} rows")
             
             return results, None, execution_time
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             error_msg = f"Query execution error: {str(e)}"
             self.logger.error(error_msg)
+            
+            # A failed statement aborts the transaction; roll back so the
+            # connection stays usable for the next query
+            try:
+                if not db_connection.autocommit:
+                    db_connection.rollback()
+            except Exception as rollback_error:
+                self.logger.warning(f"Rollback after failed query failed: {rollback_error}")
+            
             return None, error_msg, execution_time
     
     def analyze_query_quality(self, sql: str, execution_time: float) -> Dict[str, Any]:
@@ -370,9 +727,10 @@ Your task is to convert natural language questions into syntactically correct SQ
         
         sql_upper = sql.upper()
         
-        # Check for proper JOINs (not cartesian products)
-        has_join = 'JOIN' in sql_upper
-        has_cartesian = sql_upper.count('FROM') > 1 and 'JOIN' not in sql_upper
+        # Check for proper JOINs (not cartesian products); FROMs are only
+        # counted when there is no JOIN
+        has_join = _JOIN_RE.search(sql_upper) is not None
+        has_cartesian = not has_join and sql_upper.count('FROM') > 1
         metrics['uses_proper_joins'] = 1 if (not has_cartesian or not has_join) else 0
         
         # Check for WHERE clause when filtering is likely needed
@@ -383,12 +741,12 @@ Your task is to convert natural language questions into syntactically correct SQ
             metrics['has_necessary_where'] = 1  # Not applicable
         
         # Check GROUP BY is used correctly with aggregates
-        has_aggregate = any(agg in sql_upper for agg in ['COUNT', 'SUM', 'AVG', 'MAX', 'MIN'])
-        has_group_by = 'GROUP BY' in sql_upper
+        has_aggregate = _AGGREGATE_RE.search(sql_upper) is not None
         
         if has_aggregate:
             # If there's an aggregate, GROUP BY should be present (unless it's a simple count)
-            metrics['correct_group_by'] = 1 if has_group_by or sql_upper.count('COUNT') == 1 else 0
+            has_group_by = _GROUP_BY_RE.search(sql_upper) is not None
+            metrics['correct_group_by'] = 1 if has_group_by or len(_COUNT_RE.findall(sql_upper)) == 1 else 0
         else:
             metrics['correct_group_by'] = 1  # Not applicable
         
@@ -447,7 +805,51 @@ Your task is to convert natural language questions into syntactically correct SQ
         result.quality_metrics = self.analyze_query_quality(sql, exec_time)
         
         return result
-
+    
+    def process_queries(
+        self,
+        natural_language_queries: List[str],
+        db_connection_factory: Callable[[], Any],
+        max_workers: int = 10
+    ) -> List[QueryResult]:
+        """
+        Process several questions concurrently (see process_query)
+        
+        Each question is dominated by waiting on Gemini and the database, so
+        a thread pool overlaps those waits. Connections are not shared between
+        threads: every worker opens its own from the factory, and they are
+        closed once the batch is done.
+        
+        Args:
+            natural_language_queries: User questions
+            db_connection_factory: Callable returning a new database connection
+            max_workers: Maximum number of questions in flight at once
+            
+        Returns:
+            QueryResult objects in the same order as the questions
+        """
+        local = threading.local()
+        connections = []
+        connections_lock = threading.Lock()
+        
+        def worker(question: str) -> QueryResult:
+            connection = getattr(local, 'connection', None)
+            if connection is None:
+                connection = local.connection = db_connection_factory()
+                with connections_lock:
+                    connections.append(connection)
+            return self.process_query(question, connection)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(worker, natural_language_queries))
+        finally:
+            for connection in connections:
+                try:
+                    connection.close()
+                except Exception as e:
+                    self.logger.warning(f"Error closing worker connection: {e}")
+    
     def _normalize_backend_sql(self, sql: str) -> str:
         """
         Apply lightweight post-processing to align generated SQL with the
@@ -458,21 +860,14 @@ Your task is to convert natural language questions into syntactically correct SQ
           comparisons (common in datasets where flags are stored as INT).
         """
         try:
-            fixed = sql
-            # Replace "= TRUE"/"= FALSE" (case-insensitive, with optional spaces)
-            fixed = re.sub(r"=\s*TRUE\b", "= 1", fixed, flags=re.IGNORECASE)
-            fixed = re.sub(r"=\s*FALSE\b", "= 0", fixed, flags=re.IGNORECASE)
-            # Replace "IS TRUE"/"IS FALSE" which may appear in predicates
-            fixed = re.sub(r"IS\s+TRUE\b", "= 1", fixed, flags=re.IGNORECASE)
-            fixed = re.sub(r"IS\s+FALSE\b", "= 0", fixed, flags=re.IGNORECASE)
-            return fixed
+            return _normalize_boolean_literals(sql)
         except Exception:
             return sql
     
     def process_query_sqlite(
         self,
         natural_language_query: str,
-        sqlite_connection
+        sqlite_connection: "SQLiteAdapter"
     ) -> QueryResult:
         """
         Process query using SQLite database (for development/testing)
@@ -495,9 +890,12 @@ Your task is to convert natural language questions into syntactically correct SQ
             result.error_message = "SQLite connection is None"
             return result
         
-        if not hasattr(sqlite_connection, 'execute_query'):
-            result.error_message = f"SQLite connection missing execute_query method. Type: {type(sqlite_connection)}"
-            return result
+        # The adapter is checked once; later calls reuse the same object
+        if sqlite_connection is not self._checked_sqlite_connection:
+            if not hasattr(sqlite_connection, 'execute_query'):
+                result.error_message = f"SQLite connection missing execute_query method. Type: {type(sqlite_connection)}"
+                return result
+            self._checked_sqlite_connection = sqlite_connection
         
         try:
             # Generate SQL
@@ -509,12 +907,11 @@ Your task is to convert natural language questions into syntactically correct SQ
             result.generated_sql = sql
             
             # Execute SQL using SQLite
-            import time
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             try:
                 results = sqlite_connection.execute_query(sql, timeout=self.timeout_seconds)
-                exec_time = time.time() - start_time
+                exec_time = time.perf_counter() - start_time
                 
                 # Success
                 result.execution_success = True
@@ -524,7 +921,7 @@ Your task is to convert natural language questions into syntactically correct SQ
                 result.quality_metrics = self.analyze_query_quality(sql, exec_time)
                 
             except Exception as exec_error:
-                exec_time = time.time() - start_time
+                exec_time = time.perf_counter() - start_time
                 result.execution_time = exec_time
                 result.error_message = f"Query execution error: {str(exec_error)}"
                 
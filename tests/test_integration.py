@@ -4,6 +4,7 @@ Integration tests for the complete Text2SQL pipeline
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+import sqlite3
 import time
 
 from src.query_cache import QueryCache
@@ -76,6 +77,93 @@ class TestQueryCache:
         
         assert 'total_entries' in stats
         assert stats['total_entries'] >= 2
+    
+    def test_memory_cache_evicts_least_recently_used(self, tmp_path):
+        """Test the memory cache drops the least recently used entry when full"""
+        cache = QueryCache(db_path=str(tmp_path / "lru_cache.db"), max_memory_entries=3)
+        for question in ("q1", "q2", "q3"):
+            cache.put(question, "SELECT 1", [], 0.1)
+        
+        cache.get("q1")
+        cache.put("q4", "SELECT 1", [], 0.1)
+        
+        assert list(cache.memory_cache) == [
+            cache._generate_hash(q) for q in ("q3", "q1", "q4")
+        ]
+        # Evicted entries are still served from the database
+        assert cache.get("q2") is not None
+        cache.close()
+    
+    def test_memory_cache_eviction_prefers_fewest_hits(self, tmp_path):
+        """Test eviction keeps a frequently hit entry among the least recent ones"""
+        cache = QueryCache(db_path=str(tmp_path / "vlru_cache.db"), max_memory_entries=20)
+        for i in range(20):
+            cache.put(f"q{i}", "SELECT 1", [], 0.1)
+        cache.memory_cache[cache._generate_hash("q0")].hit_count = 5
+        
+        cache.put("q20", "SELECT 1", [], 0.1)
+        
+        assert cache._generate_hash("q0") in cache.memory_cache
+        assert cache._generate_hash("q1") not in cache.memory_cache
+        cache.close()
+    
+    def test_cleanup_expired(self, cache):
+        """Test cleanup removes only expired entries from memory and database"""
+        with patch('src.query_cache.time.time', return_value=1000.0):
+            cache.put("old question", "SELECT 1", [], 0.1)
+        with patch('src.query_cache.time.time', return_value=1050.0):
+            cache.put("new question", "SELECT 2", [], 0.1)
+        
+        with patch('src.query_cache.time.time', return_value=1070.0):
+            cache.cleanup_expired()
+            
+            assert list(cache.memory_cache) == [cache._generate_hash("new question")]
+            assert cache._expiry_heap == [(1050.0, cache._generate_hash("new question"))]
+            assert cache.get("old question") is None
+            assert cache.get("new question") is not None
+    
+    def test_cleanup_expired_skips_re_put_entries(self, cache):
+        """Test a stale heap item does not expire an entry that was cached again"""
+        with patch('src.query_cache.time.time', return_value=1000.0):
+            cache.put("question", "SELECT 1", [], 0.1)
+        with patch('src.query_cache.time.time', return_value=1050.0):
+            cache.put("question", "SELECT 2", [], 0.1)
+        
+        with patch('src.query_cache.time.time', return_value=1070.0):
+            cache.cleanup_expired()
+            
+            assert cache.get("question").generated_sql == "SELECT 2"
+    
+    def test_results_round_trip_across_reopen(self, tmp_path):
+        """Test packed results read back unchanged by a new cache instance"""
+        db_path = str(tmp_path / "reopen_cache.db")
+        results = [
+            {'name': 'Café Ünïcode', 'price': 18.5, 'stock': 39, 'note': None},
+            {'name': 'x' * 2000, 'price': 0.0, 'stock': -1, 'note': 'y'},
+        ]
+        cache = QueryCache(db_path=db_path)
+        cache.put("Product prices", "SELECT * FROM products", results, 0.2)
+        cache.close()
+        
+        reopened = QueryCache(db_path=db_path)
+        # Preloaded entries decode lazily; entries read on a miss decode eagerly
+        preloaded = reopened.get("Product prices")
+        reopened.memory_cache.clear()
+        from_db = reopened.get("Product prices")
+        
+        assert preloaded.results == results
+        assert from_db.results == results
+        assert from_db.row_count == 2
+        reopened.close()
+    
+    def test_results_stored_compressed(self, cache):
+        """Test large result sets are stored as a zstd frame when zstandard is installed"""
+        pytest.importorskip("zstandard")
+        cache.put("Many rows", "SELECT 1", [{'n': i} for i in range(500)], 0.1)
+        
+        row = cache._conn.execute("SELECT results FROM query_cache").fetchone()
+        
+        assert bytes(row[0]).startswith(b'\x28\xb5\x2f\xfd')
 
 
 class TestQueryHistory:
@@ -138,6 +226,17 @@ class TestQueryHistory:
         assert len(failed) == 1
         assert not failed[0].execution_success
     
+    def test_add_entries(self, history):
+        """Test bulk-adding history entries"""
+        added = history.add_entries([
+            {'natural_language': f"Query {i}", 'generated_sql': f"SELECT {i}",
+             'execution_success': i % 2 == 0, 'execution_time': 0.1}
+            for i in range(4)
+        ])
+        
+        assert added == 4
+        assert history.get_statistics()['successful_queries'] == 2
+    
     def test_statistics(self, history):
         """Test history statistics"""
         # Add some successful and failed queries
@@ -153,6 +252,83 @@ class TestQueryHistory:
         assert stats['successful_queries'] == 7
         assert stats['failed_queries'] == 3
         assert stats['success_rate'] == 70.0
+    
+    def test_get_similar_queries(self, history):
+        """Test similar successful queries are ranked by keyword overlap"""
+        history.add_entry("How many products are in stock?", "SELECT 1", True, 1, 0.1)
+        history.add_entry("Top products by stock value", "SELECT 2", True, 1, 0.1)
+        history.add_entry("List all customers", "SELECT 3", True, 1, 0.1)
+        history.add_entry("Products in stock failing", "SELECT 4", False, 0, 0.1)
+        
+        similar = history.get_similar_queries("products in stock?")
+        
+        assert [e.generated_sql for e in similar] == ["SELECT 1", "SELECT 2"]
+    
+    @pytest.mark.parametrize("question", [
+        "Products?!",
+        "\"products\"",
+        "products*",
+        "NEAR(products stock)",
+        "stock - (products)",
+        "products AND OR NOT",
+    ])
+    def test_get_similar_queries_fts_syntax_is_literal(self, history, question):
+        """Test punctuation and FTS5 operators in questions are matched as plain words"""
+        history.add_entry("How many products are in stock?", "SELECT 1", True, 1, 0.1)
+        
+        similar = history.get_similar_queries(question)
+        
+        assert [e.generated_sql for e in similar] == ["SELECT 1"]
+    
+    def test_get_similar_queries_operator_words(self, history):
+        """Test AND/OR/NOT are searched for as words, not applied as operators"""
+        history.add_entry("Orders and customers", "SELECT 1", True, 1, 0.1)
+        history.add_entry("Products or suppliers", "SELECT 2", True, 1, 0.1)
+        
+        similar = history.get_similar_queries("AND")
+        
+        assert [e.generated_sql for e in similar] == ["SELECT 1"]
+    
+    @pytest.mark.parametrize("question", ["", "   ", "*", "?!"])
+    def test_get_similar_queries_without_terms(self, history, question):
+        """Test questions without searchable words return no matches"""
+        history.add_entry("How many products?", "SELECT 1", True, 1, 0.1)
+        
+        assert history.get_similar_queries(question) == []
+    
+    def test_get_similar_queries_indexes_existing_history(self, tmp_path):
+        """Test history recorded before the full-text index existed is searchable"""
+        db_path = str(tmp_path / "legacy_history.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE query_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp REAL NOT NULL,
+                natural_language TEXT NOT NULL,
+                generated_sql TEXT NOT NULL,
+                execution_success BOOLEAN NOT NULL,
+                row_count INTEGER NOT NULL,
+                execution_time REAL NOT NULL,
+                error_message TEXT,
+                quality_score REAL,
+                user_feedback TEXT
+            )
+        """)
+        conn.execute(
+            "INSERT INTO query_history (timestamp, natural_language, generated_sql, "
+            "execution_success, row_count, execution_time) VALUES (?, ?, ?, 1, 1, 0.1)",
+            (time.time(), "Revenue by category", "SELECT 1")
+        )
+        conn.commit()
+        conn.close()
+        
+        history = QueryHistory(db_path=db_path)
+        history.add_entry("Revenue by country", "SELECT 2", True, 1, 0.1)
+        
+        similar = history.get_similar_queries("category revenue")
+        
+        assert [e.generated_sql for e in similar] == ["SELECT 1", "SELECT 2"]
+        history.close()
 
 
 class TestPerformanceMonitor:
@@ -192,6 +368,16 @@ class TestPerformanceMonitor:
         assert stats['count'] == 10
         assert stats['minimum'] == 0.0
         assert stats['maximum'] == 0.9
+    
+    def test_get_values_ndarray(self, monitor):
+        """Test fetching metric values as an array"""
+        for i in range(5):
+            monitor.record_metric("response_time", float(i))
+        
+        values = monitor.get_values_ndarray("response_time", hours=1)
+        
+        assert values.dtype.name == 'float64'
+        assert sorted(values.tolist()) == [0.0, 1.0, 2.0, 3.0, 4.0]
 
 
 class TestEndToEndIntegration:
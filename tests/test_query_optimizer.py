@@ -0,0 +1,249 @@
+"""
+Test suite for Query Optimizer
+Plan analysis runs on canned EXPLAIN output, so no database is needed
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.query_optimizer import (
+    QueryOptimizer,
+    _classify_like,
+    _parse_where_predicates,
+    _sql_skeleton,
+    sqlglot
+)
+
+# WHERE parsing and plan signatures need the optional sqlglot dependency
+requires_sqlglot = pytest.mark.skipif(sqlglot is None, reason="sqlglot not installed")
+
+
+# EXPLAIN (FORMAT JSON, ANALYZE, BUFFERS) output for a join of two tables
+ANALYZED_PLAN = {
+    'Plan': {
+        'Node Type': 'Sort',
+        'Total Cost': 250.5,
+        'Plan Rows': 20,
+        'Actual Rows': 5000,
+        'Shared Hit Blocks': 10,
+        'Plans': [{
+            'Node Type': 'Nested Loop',
+            'Shared Hit Blocks': 5,
+            'Plans': [
+                {'Node Type': 'Seq Scan', 'Shared Read Blocks': 7},
+                {'Node Type': 'Index Scan', 'Shared Hit Blocks': 3}
+            ]
+        }]
+    },
+    'Planning Time': 0.2,
+    'Execution Time': 1500.0
+}
+
+
+def _plan(node_type: str = 'Seq Scan', rows: int = 10) -> list:
+    """EXPLAIN (FORMAT JSON) result row value for a single-node plan"""
+    return [{'Plan': {'Node Type': node_type, 'Total Cost': 1.0, 'Plan Rows': rows}}]
+
+
+class TestPlanAnalysis:
+    """Tests for plan metrics and suggestions (no database)"""
+    
+    def test_analyze_plan_metrics(self):
+        """Test metrics collected from every node of the plan tree"""
+        analysis = QueryOptimizer.analyze_plan(ANALYZED_PLAN)
+        
+        assert analysis['execution_time_ms'] == 1500.0
+        assert analysis['node_type'] == 'Sort'
+        assert analysis['uses_index'] is True
+        assert analysis['has_sequential_scan'] is True
+        assert analysis['node_types'] == ['Index Scan', 'Nested Loop', 'Seq Scan', 'Sort']
+        assert analysis['buffer_hits'] == {'shared_hit': 18, 'shared_read': 7, 'shared_written': 0}
+    
+    def test_analyze_plan_suggestions(self):
+        """Test suggestions for a slow nested loop with a bad row estimate"""
+        suggestions = ' '.join(QueryOptimizer.analyze_plan(ANALYZED_PLAN)['suggestions'])
+        
+        assert "Sequential scan" in suggestions
+        assert "Nested loop" in suggestions
+        assert "execution time is high" in suggestions
+        assert "Row estimation is inaccurate" in suggestions
+    
+    def test_analyze_plan_where_columns_without_index(self):
+        """Test WHERE columns are reported when the plan uses no index"""
+        plan = {'Plan': {'Node Type': 'Seq Scan', 'Plan Rows': 10}}
+        
+        with_sql = QueryOptimizer.analyze_plan(plan, "SELECT * FROM products WHERE unit_price > 5")
+        without_sql = QueryOptimizer.analyze_plan(plan)
+        
+        assert any("unit_price" in s for s in with_sql['suggestions'])
+        assert not any("WHERE clause" in s for s in without_sql['suggestions'])
+    
+    def test_walk_plan_join_types(self):
+        """Test join node types are collected in plan order"""
+        plan = {
+            'Node Type': 'Hash Join',
+            'Plans': [
+                {'Node Type': 'Merge Join', 'Plans': [{'Node Type': 'Index Only Scan'}]},
+                {'Node Type': 'Hash'}
+            ]
+        }
+        
+        walk = QueryOptimizer._walk_plan(plan)
+        
+        assert walk['join_types'] == ['Hash Join', 'Merge Join']
+        assert walk['uses_index'] is True
+        assert walk['has_sequential_scan'] is False
+    
+    def test_walk_plan_deep_tree(self):
+        """Test deep plans are walked without recursion"""
+        plan = {'Node Type': 'Seq Scan'}
+        for _ in range(5000):
+            plan = {'Node Type': 'Limit', 'Plans': [plan]}
+        
+        assert QueryOptimizer._walk_plan(plan)['has_sequential_scan'] is True
+
+
+class TestWherePredicates:
+    """Tests for WHERE clause parsing"""
+    
+    @pytest.mark.parametrize("pattern, shape", [
+        ("abc", "="),
+        ("abc%", "LIKE_PREFIX"),
+        ("%abc", "LIKE_SUFFIX"),
+        ("%abc%", "LIKE"),
+        ("a_c%", "LIKE"),
+    ])
+    def test_classify_like(self, pattern, shape):
+        """Test LIKE patterns are classified by the index that can serve them"""
+        assert _classify_like(pattern) == shape
+    
+    @requires_sqlglot
+    def test_parse_where_predicates(self):
+        """Test comparisons are normalized to (table, column, op, literal)"""
+        predicates = _parse_where_predicates(
+            "SELECT * FROM products p "
+            "WHERE 5 < p.unit_price AND product_name LIKE 'Ch%' AND discontinued = 0"
+        )
+        
+        assert set(predicates) == {
+            ('p', 'unit_price', '>', '5'),
+            (None, 'product_name', 'LIKE_PREFIX', 'Ch%'),
+            (None, 'discontinued', '=', '0'),
+        }
+    
+    @requires_sqlglot
+    def test_parse_where_predicates_in_subquery(self):
+        """Test predicates of nested WHERE clauses are reported once"""
+        predicates = _parse_where_predicates(
+            "SELECT * FROM orders WHERE customer_id IN "
+            "(SELECT customer_id FROM customers WHERE country = 'Germany')"
+        )
+        
+        assert predicates == ((None, 'country', '=', 'Germany'),)
+    
+    def test_extract_where_columns_unterminated_string(self):
+        """Test SQL the parser cannot tokenize falls back to the regex scan"""
+        assert QueryOptimizer._extract_where_columns("SELECT * FROM t WHERE a = 'abc") == ['a']
+    
+    @requires_sqlglot
+    def test_sql_skeleton(self):
+        """Test literals are replaced while parameters and quoted names are kept"""
+        skeleton = _sql_skeleton('SELECT * FROM "Orders" WHERE status = \'rare\' AND id = $1')
+        
+        assert skeleton == 'SELECT * FROM "Orders" WHERE status = %s AND id = $1'
+        assert skeleton == _sql_skeleton('SELECT * FROM "Orders" WHERE status = \'x\' AND id = $1')
+
+
+class TestAnalysisCache:
+    """Tests for the analyze_query result cache"""
+    
+    @pytest.fixture
+    def connection(self):
+        """Mock autocommit connection returning a one-node plan"""
+        conn = MagicMock()
+        conn.autocommit = True
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = [_plan()]
+        return conn
+    
+    def _cursor(self, conn):
+        """Cursor the optimizer gets from the mock connection"""
+        return conn.cursor.return_value.__enter__.return_value
+    
+    def test_repeated_query_served_from_cache(self, connection):
+        """Test the same query text is explained once"""
+        optimizer = QueryOptimizer(connection)
+        
+        first = optimizer.analyze_query("SELECT * FROM products WHERE unit_price > 5")
+        second = optimizer.analyze_query("SELECT *  FROM products WHERE unit_price > 5")
+        
+        assert first == second
+        assert self._cursor(connection).execute.call_count == 1
+    
+    @requires_sqlglot
+    def test_similar_query_gets_suggestions_only(self, connection):
+        """Test a query differing in literals shares suggestions but not plan metrics"""
+        optimizer = QueryOptimizer(connection)
+        
+        first = optimizer.analyze_query("SELECT * FROM products WHERE unit_price > 5")
+        similar = optimizer.analyze_query("SELECT * FROM products WHERE unit_price > 500")
+        
+        assert similar == {'suggestions': first['suggestions'], 'similar_query': True}
+        assert self._cursor(connection).execute.call_count == 1
+    
+    def test_cache_evicts_least_recently_used(self, connection):
+        """Test the cache keeps at most cache_size entries"""
+        optimizer = QueryOptimizer(connection, cache_size=2)
+        
+        optimizer.analyze_query("SELECT * FROM products")
+        optimizer.analyze_query("SELECT * FROM orders")
+        
+        assert len(optimizer._analysis_cache) == 2
+        assert "plan:SELECT * FROM orders" in optimizer._analysis_cache
+        assert "plan:SELECT * FROM products" not in optimizer._analysis_cache
+    
+    def test_cache_entry_expires(self, connection):
+        """Test entries older than cache_ttl are analyzed again"""
+        optimizer = QueryOptimizer(connection, cache_ttl=60)
+        
+        with patch('src.query_optimizer.time.monotonic', return_value=1000.0):
+            optimizer.analyze_query("SELECT * FROM products")
+        with patch('src.query_optimizer.time.monotonic', return_value=1030.0):
+            optimizer.analyze_query("SELECT * FROM products")
+        assert self._cursor(connection).execute.call_count == 1
+        
+        with patch('src.query_optimizer.time.monotonic', return_value=1061.0):
+            optimizer.analyze_query("SELECT * FROM products")
+        assert self._cursor(connection).execute.call_count == 2
+    
+    def test_fast_actual_runs_not_cached(self, connection):
+        """Test EXPLAIN ANALYZE results below min_cache_ms are not kept"""
+        self._cursor(connection).fetchone.return_value = [[{
+            'Plan': {'Node Type': 'Seq Scan', 'Plan Rows': 1, 'Actual Rows': 1},
+            'Execution Time': 2.0
+        }]]
+        optimizer = QueryOptimizer(connection, min_cache_ms=50.0)
+        
+        optimizer.analyze_query("SELECT * FROM products", actual=True)
+        optimizer.analyze_query("SELECT * FROM products", actual=True)
+        
+        assert self._cursor(connection).execute.call_count == 2
+    
+    def test_actual_refused_for_writes(self, connection):
+        """Test EXPLAIN ANALYZE is never run on a statement that may write"""
+        optimizer = QueryOptimizer(connection)
+        
+        analysis = optimizer.analyze_query("DELETE FROM products", actual=True)
+        
+        assert 'error' in analysis
+        self._cursor(connection).execute.assert_not_called()
+    
+    def test_unparseable_query_returns_error(self, connection):
+        """Test a failing EXPLAIN is reported in the result, not raised"""
+        self._cursor(connection).execute.side_effect = Exception("syntax error")
+        optimizer = QueryOptimizer(connection)
+        
+        analysis = optimizer.analyze_query("SELECT 'abc")
+        
+        assert analysis['error'] == "syntax error"
+        assert analysis['suggestions'] == []
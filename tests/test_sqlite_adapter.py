@@ -0,0 +1,89 @@
+"""
+Test suite for SQLite Adapter
+"""
+
+import pytest
+
+from src.sqlite_adapter import SQLiteAdapter
+
+
+class TestSQLiteAdapter:
+    """Tests for schema introspection and query execution on SQLite"""
+    
+    @pytest.fixture
+    def adapter(self, tmp_path):
+        """Connected adapter on a temporary database with two related tables"""
+        adapter = SQLiteAdapter(db_path=str(tmp_path / "test.db"))
+        adapter.connect()
+        adapter.connection.executescript("""
+            CREATE TABLE categories (
+                category_id INTEGER PRIMARY KEY,
+                category_name TEXT NOT NULL
+            );
+            CREATE TABLE products (
+                product_id INTEGER PRIMARY KEY,
+                product_name TEXT NOT NULL,
+                category_id INTEGER REFERENCES categories(category_id)
+            );
+            INSERT INTO categories VALUES (1, 'Beverages'), (2, 'Condiments');
+        """)
+        yield adapter
+        adapter.disconnect()
+    
+    def test_get_schema_columns_and_foreign_keys(self, adapter):
+        """Test columns and foreign keys of every table are reported"""
+        schema = adapter.get_schema()
+        
+        assert set(schema["tables"]) == {"categories", "products"}
+        products = schema["tables"]["products"]
+        assert [col["name"] for col in products["columns"]] == [
+            "product_id", "product_name", "category_id"
+        ]
+        assert products["columns"][0]["primary_key"] is True
+        assert products["columns"][1]["not_null"] is True
+        assert products["foreign_keys"] == [{
+            "column": "category_id",
+            "references_table": "categories",
+            "references_column": "category_id"
+        }]
+        assert schema["tables"]["categories"]["foreign_keys"] == []
+    
+    def test_get_schema_cached_until_ddl(self, adapter):
+        """Test the schema is reused while unchanged and rebuilt after CREATE TABLE"""
+        first = adapter.get_schema()
+        assert adapter.get_schema() is first
+        
+        adapter.connection.execute("CREATE TABLE suppliers (supplier_id INTEGER PRIMARY KEY)")
+        
+        updated = adapter.get_schema()
+        assert updated is not first
+        assert "suppliers" in updated["tables"]
+    
+    def test_execute_query(self, adapter):
+        """Test rows are returned as dictionaries"""
+        results = adapter.execute_query("SELECT * FROM categories ORDER BY category_id")
+        
+        assert results == [
+            {"category_id": 1, "category_name": "Beverages"},
+            {"category_id": 2, "category_name": "Condiments"}
+        ]
+    
+    def test_execute_query_iter_batches(self, adapter):
+        """Test streamed rows match execute_query across batch boundaries"""
+        adapter.connection.executemany(
+            "INSERT INTO products VALUES (?, ?, 1)",
+            [(i, f"Product {i}") for i in range(1, 8)]
+        )
+        sql = "SELECT product_id, product_name FROM products ORDER BY product_id"
+        
+        rows = list(adapter.execute_query_iter(sql, batch_size=3))
+        
+        assert rows == adapter.execute_query(sql)
+        assert len(rows) == 7
+    
+    def test_execute_query_requires_connection(self, tmp_path):
+        """Test queries fail clearly before connect()"""
+        adapter = SQLiteAdapter(db_path=str(tmp_path / "unused.db"))
+        
+        with pytest.raises(RuntimeError):
+            adapter.execute_query("SELECT 1")
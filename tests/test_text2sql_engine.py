@@ -98,6 +98,13 @@ class TestSQLSanitizer:
         assert "SELECT" in sanitized.upper()
         assert len(sanitized) > 0
     
+    def test_format_for_display(self):
+        """Test display formatting reindents and upper-cases keywords"""
+        sql = "select product_name from products where unit_price > 10"
+        formatted = self.sanitizer.format_for_display(sql)
+        assert formatted.startswith("SELECT product_name")
+        assert "\nWHERE unit_price > 10" in formatted
+    
     def test_allow_joins(self):
         """Test that JOIN queries are allowed"""
         sql = """
@@ -200,6 +207,37 @@ class TestText2SQLEngine:
         assert "```" not in sql
         assert "SELECT" in sql.upper()
     
+    def test_generate_sql_stops_streaming_after_query(self, engine, mock_gemini):
+        """Test the streamed response is cut after the closing code fence"""
+        chunks = []
+        for text in ["```sql\nSELECT * ", "FROM products\n```\nThis query", " lists products"]:
+            chunk = MagicMock()
+            chunk.text = text
+            chunks.append(chunk)
+        mock_response = MagicMock()
+        mock_response.__iter__.return_value = iter(chunks)
+        mock_gemini.generate_content.return_value = mock_response
+        
+        sql, error = engine.generate_sql("List all products")
+        
+        assert error is None
+        assert "This query" not in sql
+        assert "products" in sql.lower()
+        assert mock_gemini.generate_content.call_args.kwargs['stream'] is True
+    
+    def test_generate_sql_cached_for_repeated_question(self, engine, mock_gemini):
+        """Test repeated questions reuse the generated SQL"""
+        mock_response = MagicMock()
+        mock_response.text = "SELECT * FROM products"
+        mock_gemini.generate_content.return_value = mock_response
+        
+        first_sql, _ = engine.generate_sql("List all products")
+        second_sql, error = engine.generate_sql("  list ALL products ")
+        
+        assert error is None
+        assert second_sql == first_sql
+        assert mock_gemini.generate_content.call_count == 1
+    
     def test_generate_sql_invalid_response(self, engine, mock_gemini):
         """Test handling of invalid SQL generation"""
         # Mock Gemini response with invalid SQL
@@ -241,6 +279,15 @@ class TestText2SQLEngine:
         
         assert metrics['correct_group_by'] == 1
     
+    def test_analyze_query_quality_ignores_keyword_like_columns(self, engine):
+        """Test column names containing MAX/JOIN are not taken for aggregates or joins"""
+        sql = "SELECT max_price, joined_date FROM products"
+        
+        metrics = engine.analyze_query_quality(sql, execution_time=0.3)
+        
+        assert metrics['correct_group_by'] == 1
+        assert metrics['has_necessary_where'] == 1
+    
     def test_execute_query_timeout(self, engine):
         """Test query timeout enforcement"""
         mock_conn = MagicMock()
@@ -259,6 +306,41 @@ class TestText2SQLEngine:
         assert error is not None
         assert "timeout" in error.lower() or "error" in error.lower()
     
+    def test_execute_query_timeout_resent_in_transaction(self, engine):
+        """Test the statement timeout is re-sent per query unless autocommit"""
+        mock_conn = MagicMock()
+        mock_conn.autocommit = False
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.return_value = []
+        mock_cursor.description = [('id',)]
+        mock_conn.cursor.return_value = mock_cursor
+        
+        engine.execute_query("SELECT 1", mock_conn)
+        engine.execute_query("SELECT 1", mock_conn)
+        mock_conn.autocommit = True
+        engine.execute_query("SELECT 1", mock_conn)
+        engine.execute_query("SELECT 1", mock_conn)
+        
+        statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+        assert sum(s.startswith("SET statement_timeout") for s in statements) == 3
+    
+    def test_execute_query_timeout_set_at_connect(self, engine):
+        """Test no SET is sent when the connection was opened with the timeout"""
+        mock_conn = MagicMock()
+        mock_conn.autocommit = False
+        mock_conn.info.options = f"-c statement_timeout={engine.timeout_seconds * 1000}"
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.return_value = []
+        mock_cursor.description = [('id',)]
+        mock_conn.cursor.return_value = mock_cursor
+        
+        engine.execute_query("SELECT 1", mock_conn)
+        mock_conn.info.options = "-c statement_timeout=1"
+        engine.execute_query("SELECT 1", mock_conn)
+        
+        statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+        assert statements == ["SELECT 1", f"SET statement_timeout = {engine.timeout_seconds * 1000}", "SELECT 1"]
+    
     def test_execute_query_result_limiting(self, engine):
         """Test result row limiting"""
         mock_conn = MagicMock()
@@ -278,6 +360,52 @@ class TestText2SQLEngine:
         # Should be limited to max_results (1000)
         assert results is not None
         assert len(results) <= engine.max_results
+        assert results[0] == {'id': 0, 'name': "Product 0", 'price': 10.0}
+    
+    def test_execute_query_results_persist_in_cache(self, engine, tmp_path):
+        """Test an executed result can be cached and read back after a restart"""
+        from src.query_cache import QueryCache
+        
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.return_value = [(1, "Chai"), (2, "Chang")]
+        mock_cursor.description = [('id',), ('name',)]
+        mock_conn.cursor.return_value = mock_cursor
+        results, error, exec_time = engine.execute_query("SELECT id, name FROM products", mock_conn)
+        
+        db_path = str(tmp_path / "cache.db")
+        cache = QueryCache(db_path=db_path)
+        cache.put("List products", "SELECT id, name FROM products", results, exec_time)
+        cache.close()
+        
+        reopened = QueryCache(db_path=db_path)
+        cached = reopened.get("List products")
+        reopened.close()
+        assert cached is not None
+        assert cached.results == [{'id': 1, 'name': "Chai"}, {'id': 2, 'name': "Chang"}]
+    
+    def test_process_queries_batch(self, engine, mock_gemini):
+        """Test batch processing keeps question order and closes worker connections"""
+        mock_response = MagicMock()
+        mock_response.text = "SELECT * FROM products"
+        mock_gemini.generate_content.return_value = mock_response
+        
+        connections = []
+        
+        def connection_factory():
+            mock_conn = MagicMock()
+            mock_conn.cursor.return_value.fetchmany.return_value = [(1, "Chai", 18.0)]
+            mock_conn.cursor.return_value.description = [('id',), ('name',), ('price',)]
+            connections.append(mock_conn)
+            return mock_conn
+        
+        questions = [f"Question {i}" for i in range(6)]
+        results = engine.process_queries(questions, connection_factory, max_workers=3)
+        
+        assert [r.natural_language for r in results] == questions
+        assert all(r.execution_success for r in results)
+        assert 1 <= len(connections) <= 3
+        assert all(conn.close.called for conn in connections)
 
 
 class TestText2SQLAccuracy: